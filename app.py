@@ -1,5 +1,6 @@
 import streamlit as st
 from modules.data_access.data_loader import load_user_dataset, load_builtin_dataset
+from modules.data_access.builtin_datasets import prewarm_builtin_datasets
 from modules.utils.logger import get_logger
 from modules.visualization import eda
 from modules.services.preprocessing_service import PreprocessingService
@@ -7,6 +8,9 @@ from modules.services.preprocessing_service import PreprocessingService
 logger = get_logger(__name__)
 
 def main():
+    # Load built-in datasets in the background so switching between them is instant
+    prewarm_builtin_datasets()
+
     st.title("Data Wrangling App")
     st.markdown("""
         This app allows you to:
@@ -0,0 +1,271 @@
+"""
+Benchmark the dataset loaders across formats, sizes and dtypes.
+
+Synthetic datasets with integer, float, categorical, text, datetime and partly missing
+columns are written in each format and loaded without a browser. Every measurement runs
+in a fresh process so wall time and peak RSS are not skewed by earlier cases.
+
+Usage (from the repository root):
+    python -m benchmarks.loader_benchmark
+    python -m benchmarks.loader_benchmark --sizes 10000 10000000 --formats csv parquet
+    python -m benchmarks.loader_benchmark --compare benchmarks/results/baseline.json
+"""
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import queue
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+FORMATS = ['csv', 'xlsx', 'json', 'jsonl', 'parquet']
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+EXCEL_MAX_ROWS = 1_048_575
+BUILTIN_NAMES = ['Iris', 'Wine', 'Breast Cancer', 'Diabetes', 'California Housing']
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Loader paths measured for every generated file
+USER_LOADERS = [
+    'parse',                   # read_partitions only: parsing without optimization or caching
+    'load_user_dataset:cold',  # full upload path with an empty dataset cache
+    'load_user_dataset:warm',  # full upload path served from the dataset cache
+]
+
+def generate_dataset(rows, seed=42):
+    """
+    Generate a synthetic dataset with mixed column types and missing values.
+
+    Parameters:
+    - rows: Number of rows
+    - seed: Seed for the random number generator
+
+    Returns:
+    - df: Generated DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'int_col': rng.integers(0, 1000, rows),
+        'float_col': rng.normal(size=rows),
+        'category_col': rng.choice(['red', 'green', 'blue', 'yellow'], rows),
+        'text_col': 'id_' + pd.Series(rng.integers(0, rows * 10, rows)).astype(str),
+        'datetime_col': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 3 * 365 * 86400, rows), unit='s'),
+        'missing_col': np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows)),
+    })
+
+def write_dataset(df, fmt, path):
+    """
+    Write a dataset to disk in one of the benchmarked formats.
+    """
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+    elif fmt == 'xlsx':
+        df.to_excel(path, index=False)
+    elif fmt == 'json':
+        df.to_json(path, orient='records', date_format='iso')
+    elif fmt == 'jsonl':
+        df.to_json(path, orient='records', lines=True, date_format='iso')
+    elif fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Unsupported benchmark format: {fmt}")
+
+class BenchmarkUpload(io.BytesIO):
+    """
+    In-memory stand-in for a Streamlit UploadedFile.
+    """
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+def _measure(case):
+    import streamlit as st
+    from modules.data_access.data_loader import load_user_dataset, load_builtin_dataset
+    from modules.data_access.partitioned_reader import list_partitions, read_partitions
+
+    if case['loader'] == 'builtin':
+        start = time.perf_counter()
+        df = load_builtin_dataset(case['name'])
+        seconds = time.perf_counter() - start
+    else:
+        with open(case['path'], 'rb') as f:
+            upload = BenchmarkUpload(os.path.basename(case['path']), f.read())
+        start = time.perf_counter()
+        if case['loader'] == 'parse':
+            df, _ = read_partitions(list_partitions(upload.name, upload))
+        else:
+            with mock.patch.object(st.sidebar, 'file_uploader', return_value=[upload]):
+                df = load_user_dataset()
+        seconds = time.perf_counter() - start
+
+    if df is None:
+        raise RuntimeError("Loader returned no dataset; see logs/app.log for the error.")
+    return {
+        'seconds': seconds,
+        'rows_per_sec': len(df) / seconds if seconds > 0 else None,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+def _run_in_child(case, data_dir, results):
+    # Point the app at an isolated data directory before any module reads the config
+    os.environ['DATA_DIRECTORY'] = data_dir
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    try:
+        results.put(_measure(case))
+    except Exception as e:
+        results.put({'error': str(e)})
+
+def run_case(case, data_dir, timeout):
+    """
+    Measure one loader case in a fresh process.
+
+    Parameters:
+    - case: Dictionary describing the loader, dataset and format
+    - data_dir: DATA_DIRECTORY for the child process
+    - timeout: Seconds to wait before giving up on the case
+
+    Returns:
+    - result: The case merged with its measurements or an 'error' entry
+    """
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_run_in_child, args=(case, data_dir, results))
+    process.start()
+    try:
+        measurement = results.get(timeout=timeout)
+    except queue.Empty:
+        measurement = {'error': f"Timed out after {timeout}s"}
+        process.terminate()
+    process.join()
+
+    result = {key: value for key, value in case.items() if key != 'path'}
+    result.update(measurement)
+    status = result.get('error') or f"{result['seconds']:.3f}s"
+    label = case.get('format') or f"{case['name']} ({case['state']})"
+    print(f"{case['loader']:<24} {label:<24} {case.get('rows', ''):>10}  {status}")
+    return result
+
+def _excel_available():
+    try:
+        import openpyxl  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def run_benchmarks(sizes, formats, builtins, timeout):
+    """
+    Run every loader case and collect the results.
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix='loader-benchmark-') as work_dir:
+        for rows in sizes:
+            df = generate_dataset(rows)
+            for fmt in formats:
+                if fmt == 'xlsx' and (rows > EXCEL_MAX_ROWS or not _excel_available()):
+                    print(f"Skipping xlsx at {rows} rows (row limit or openpyxl missing).")
+                    continue
+                path = os.path.join(work_dir, f"synthetic_{rows}.{fmt}")
+                write_dataset(df, fmt, path)
+                file_mb = os.path.getsize(path) / 1024 ** 2
+
+                # Cold and warm runs share a data directory so the warm run finds the cache
+                data_dir = os.path.join(work_dir, f"data_{rows}_{fmt}")
+                for loader in USER_LOADERS:
+                    case = {'loader': loader, 'format': fmt, 'rows': rows, 'file_mb': file_mb, 'path': path}
+                    results.append(run_case(case, data_dir, timeout))
+                os.remove(path)
+
+        for name in builtins:
+            data_dir = os.path.join(work_dir, f"builtin_{name.lower().replace(' ', '_')}")
+            for state in ['cold', 'warm']:
+                case = {'loader': 'builtin', 'name': name, 'state': state}
+                results.append(run_case(case, data_dir, timeout))
+    return results
+
+def _case_key(result):
+    return (result['loader'], result.get('format'), result.get('rows'), result.get('name'), result.get('state'))
+
+def compare_results(results, baseline_path, tolerance):
+    """
+    Compare results with a baseline file and report cases that got slower.
+
+    Parameters:
+    - results: Results from run_benchmarks
+    - baseline_path: Path to an earlier results file
+    - tolerance: Allowed relative slowdown, e.g. 0.2 for 20%
+
+    Returns:
+    - regressions: List of (case_key, baseline_seconds, seconds) tuples
+    """
+    with open(baseline_path) as f:
+        baseline = {_case_key(result): result for result in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(_case_key(result))
+        if not previous or 'seconds' not in previous or 'seconds' not in result:
+            continue
+        if result['seconds'] > previous['seconds'] * (1 + tolerance):
+            regressions.append((_case_key(result), previous['seconds'], result['seconds']))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dataset loaders.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Row counts to generate.")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=FORMATS, help="File formats to benchmark.")
+    parser.add_argument('--builtins', nargs='*', choices=BUILTIN_NAMES, default=BUILTIN_NAMES[:4],
+                        help="Built-in datasets to benchmark.")
+    parser.add_argument('--timeout', type=float, default=1800, help="Seconds allowed per case.")
+    parser.add_argument('--output', help="Results file; defaults to benchmarks/results/loader-<timestamp>.json.")
+    parser.add_argument('--compare', help="Baseline results file to check for regressions.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown against the baseline.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.formats, args.builtins, args.timeout)
+
+    output = args.output or os.path.join(
+        RESULTS_DIRECTORY, f"loader-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'results': results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        regressions = compare_results(results, args.compare, args.tolerance)
+        for key, before, after in regressions:
+            print(f"REGRESSION {key}: {before:.3f}s -> {after:.3f}s")
+        if regressions:
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,10 +2,93 @@ import os
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_DIRECTORY = os.path.join(BASE_DIR, 'data')
+DATA_DIRECTORY = os.getenv('DATA_DIRECTORY', os.path.join(BASE_DIR, 'data'))
 LOGS_DIRECTORY = os.path.join(BASE_DIR, 'logs')
 MODELS_DIRECTORY = os.path.join(BASE_DIR, 'models')
 
 # Other configurations
 DEFAULT_RANDOM_STATE = 42
 DEFAULT_TEST_SIZE = 0.2
+
+# CSV ingestion
+CSV_SAMPLE_ROWS = 10000
+CSV_CHUNK_BYTES = 64 * 1024 * 1024
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Multi-file ingestion
+INGEST_MAX_WORKERS = os.cpu_count() or 1
+SOURCE_COLUMN = 'source'
+
+# Dataset cache
+DATASET_CACHE_DIRECTORY = os.path.join(DATA_DIRECTORY, 'cache')
+DATASET_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Built-in datasets
+BUILTIN_DATASET_DIRECTORY = os.path.join(DATA_DIRECTORY, 'builtin')
+BUILTIN_DATASET_CACHE_SIZE = 5
+
+# Serve cached datasets as memory-mapped handles instead of in-memory frames
+DATASET_MEMORY_MAP = True
+
+# EDA fast preview
+EDA_SAMPLE_THRESHOLD_ROWS = 1_000_000
+EDA_SAMPLE_SIZE = 200_000
+
+# Column profiler
+PROFILE_MAX_WORKERS = min(8, os.cpu_count() or 1)
+PROFILE_CACHE_SIZE = 16
+PROFILE_TOP_VALUES = 1000
+
+# Pre-aggregated charts
+AGGREGATE_CACHE_SIZE = 1024
+BOX_PLOT_MAX_OUTLIERS = 1000
+SCATTER_MAX_POINTS = 50_000
+SCATTER_DENSITY_BINS = 150
+PAIR_PLOT_BINS = 30
+PAIR_PLOT_DEFAULT_COLUMNS = 5
+PAIR_PLOT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+PAIR_PLOT_PARALLEL_MIN_ROWS = 200_000
+GROUP_PLOT_TOP_CATEGORIES = 20
+GROUP_PLOT_KDE_POINTS = 200
+GROUP_PLOT_MAX_OUTLIERS = 200
+
+# Correlation engine
+CORRELATION_BLOCK_ROWS = 500_000
+CORRELATION_MAX_WORKERS = min(8, os.cpu_count() or 1)
+CORRELATION_RANK_CACHE_BYTES = 512 * 1024 ** 2
+CORRELATION_HEATMAP_MAX_COLUMNS = 30
+
+# Data filtering
+FILTER_SAMPLE_ROWS = 10_000
+FILTER_INDEX_MIN_ROWS = 100_000
+FILTER_INDEX_CACHE_BYTES = 1024 ** 3
+NGRAM_INDEX_MAX_UNIQUE = 200_000
+
+# Missing data visualization
+MISSINGNESS_BLOCKS = 200
+
+# Streaming statistics sketches
+SKETCH_QUANTILE_K = 200
+SKETCH_HLL_PRECISION = 14
+SKETCH_FREQUENT_ITEMS = 1000
+SKETCH_CHUNK_ROWS = 1_000_000
+
+# Duplicate detection
+ROW_HASH_CACHE_BYTES = 1024 ** 3
+NEAR_DUPLICATE_CHUNK_ROWS = 1_000_000
+
+# Preprocessing pipeline batch mode
+PIPELINE_CHUNK_ROWS = 100_000
+PIPELINE_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Preprocessing step cache
+STEP_CACHE_DIRECTORY = os.path.join(DATASET_CACHE_DIRECTORY, 'steps')
+STEP_CACHE_MEMORY_BYTES = 1024 ** 3
+STEP_CACHE_DISK_BYTES = 4 * 1024 ** 3
+
+# KNN imputation
+KNN_EXACT_MAX_ROWS = 20_000
+KNN_CHUNK_ROWS = 20_000
+KNN_MAX_WORKERS = min(8, os.cpu_count() or 1)
+KNN_PARALLEL_MIN_ROWS = 50_000
+KNN_TREE_MAX_DIMENSIONS = 15
@@ -0,0 +1,121 @@
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+from sklearn import datasets
+from modules.utils.logger import get_logger
+from modules.utils.exceptions import DataLoaderException
+from configs.config import BUILTIN_DATASET_DIRECTORY, BUILTIN_DATASET_CACHE_SIZE
+
+logger = get_logger(__name__)
+
+BUILTIN_DATASET_LOADERS = {
+    'Iris': datasets.load_iris,
+    'Wine': datasets.load_wine,
+    'Breast Cancer': datasets.load_breast_cancer,
+    'Diabetes': datasets.load_diabetes,
+    'California Housing': datasets.fetch_california_housing
+}
+
+# Most recently used built-in datasets, shared by all sessions of the process
+_dataset_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_dataset_locks = {name: threading.Lock() for name in BUILTIN_DATASET_LOADERS}
+_prewarm_thread = None
+
+def _snapshot_path(name):
+    file_name = name.lower().replace(' ', '_') + '.feather'
+    return os.path.join(BUILTIN_DATASET_DIRECTORY, file_name)
+
+def _build_dataset(name):
+    """
+    Build a built-in dataset from its scikit-learn loader.
+    """
+    data = BUILTIN_DATASET_LOADERS[name]()
+    if hasattr(data, 'data'):
+        X = pd.DataFrame(data.data, columns=data.feature_names)
+    else:
+        X = pd.DataFrame(data['data'], columns=data['feature_names'])
+    y = pd.Series(data.target, name='target')
+    return pd.concat([X, y], axis=1)
+
+def _write_snapshot(name, df):
+    path = _snapshot_path(name)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(BUILTIN_DATASET_DIRECTORY, exist_ok=True)
+        df.to_feather(tmp_path)
+        os.replace(tmp_path, path)
+        logger.info(f"Snapshot of built-in dataset '{name}' written to '{path}'.")
+    except Exception as e:
+        logger.warning(f"Could not write snapshot of built-in dataset '{name}': {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _remember(name, df):
+    with _cache_lock:
+        _dataset_cache[name] = df
+        _dataset_cache.move_to_end(name)
+        while len(_dataset_cache) > BUILTIN_DATASET_CACHE_SIZE:
+            _dataset_cache.popitem(last=False)
+
+def get_builtin_dataset(name):
+    """
+    Get a built-in dataset from the in-process cache, the on-disk snapshot or scikit-learn,
+    in that order.
+
+    Parameters:
+    - name: Name of the built-in dataset
+
+    Returns:
+    - df: Copy of the dataset as a DataFrame
+    """
+    if name not in BUILTIN_DATASET_LOADERS:
+        raise DataLoaderException(f"Dataset '{name}' not found.")
+
+    with _cache_lock:
+        if name in _dataset_cache:
+            _dataset_cache.move_to_end(name)
+            return _dataset_cache[name].copy()
+
+    # Serialize loading per dataset so the pre-warm thread and a session never build it twice
+    with _dataset_locks[name]:
+        with _cache_lock:
+            if name in _dataset_cache:
+                return _dataset_cache[name].copy()
+
+        path = _snapshot_path(name)
+        df = None
+        if os.path.exists(path):
+            try:
+                df = pd.read_feather(path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable snapshot of built-in dataset '{name}': {e}")
+        if df is None:
+            df = _build_dataset(name)
+            _write_snapshot(name, df)
+        _remember(name, df)
+        return df.copy()
+
+def _prewarm(names):
+    for name in names:
+        try:
+            get_builtin_dataset(name)
+        except Exception as e:
+            logger.warning(f"Could not pre-warm built-in dataset '{name}': {e}")
+    logger.info("Built-in dataset cache pre-warmed.")
+
+def prewarm_builtin_datasets(names=None):
+    """
+    Load built-in datasets into the cache in a background thread, once per process.
+
+    Parameters:
+    - names: Names of the datasets to load; all built-in datasets if None
+    """
+    global _prewarm_thread
+    with _cache_lock:
+        if _prewarm_thread is not None:
+            return
+        names = list(names or BUILTIN_DATASET_LOADERS)[:BUILTIN_DATASET_CACHE_SIZE]
+        _prewarm_thread = threading.Thread(target=_prewarm, args=(names,), daemon=True, name='builtin-dataset-prewarm')
+        _prewarm_thread.start()
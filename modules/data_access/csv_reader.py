@@ -0,0 +1,191 @@
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+import pandas as pd
+from pandas import CategoricalDtype
+from pandas.api.types import (
+    union_categoricals,
+    is_bool_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_numeric_dtype,
+)
+from modules.utils.logger import get_logger
+from modules.utils.exceptions import DataLoaderException
+from configs.config import CSV_SAMPLE_ROWS, CSV_CHUNK_BYTES, CATEGORY_MAX_UNIQUE_RATIO
+
+logger = get_logger(__name__)
+
+MIN_CHUNK_ROWS = 1000
+
+@contextmanager
+def open_source(source):
+    """
+    Open a file path, or rewind an in-memory buffer, for binary reading.
+
+    Parameters:
+    - source: Path to a file or a seekable binary buffer such as an uploaded file
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield f
+    else:
+        # Buffers are read in place and left open for the caller
+        source.seek(0)
+        yield source
+
+def source_name(source):
+    """
+    Name of a file path or buffer for log messages.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    return getattr(source, 'name', '<buffer>')
+
+def infer_csv_schema(source, sample_rows=CSV_SAMPLE_ROWS):
+    """
+    Infer column dtypes and the average row size from the head of a CSV file.
+
+    Parameters:
+    - source: Path to the CSV file or a seekable binary buffer
+    - sample_rows: Number of rows to sample
+
+    Returns:
+    - dtypes: Dictionary mapping column names to the dtype to read them with
+    - row_bytes: Estimated average size of one row on disk, in bytes
+    """
+    with open_source(source) as f:
+        sample = pd.read_csv(f, nrows=sample_rows)
+
+    dtypes = {}
+    for col in sample.columns:
+        series = sample[col]
+        if is_bool_dtype(series):
+            continue
+        if is_float_dtype(series):
+            dtypes[col] = 'float64'
+        elif not is_numeric_dtype(series) and len(series) > 0:
+            # Low-cardinality strings are stored as categories
+            if series.nunique(dropna=True) / len(series) <= CATEGORY_MAX_UNIQUE_RATIO:
+                dtypes[col] = 'category'
+
+    with open_source(source) as f:
+        lines = list(islice(f, sample_rows + 1))
+    # Skip the header line when averaging
+    data_lines = lines[1:] or lines
+    row_bytes = max(1, sum(len(line) for line in data_lines) // max(1, len(data_lines)))
+
+    return dtypes, row_bytes
+
+def downcast_numeric_columns(df):
+    """
+    Downcast integer columns of a DataFrame to the smallest type that holds their values.
+
+    Parameters:
+    - df: Pandas DataFrame
+
+    Returns:
+    - df: DataFrame with downcast integer columns
+    """
+    for col in df.columns:
+        if is_integer_dtype(df[col]) and not is_bool_dtype(df[col]):
+            col_min = df[col].min()
+            downcast = 'unsigned' if pd.notna(col_min) and col_min >= 0 else 'integer'
+            df[col] = pd.to_numeric(df[col], downcast=downcast)
+    return df
+
+def combine_chunks(chunks):
+    """
+    Concatenate chunks column by column, merging the categories of categorical columns.
+
+    Parameters:
+    - chunks: List of DataFrames with the same columns; emptied while merging
+
+    Returns:
+    - df: Combined DataFrame
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+
+    columns = {}
+    for col in chunks[0].columns:
+        parts = [chunk[col] for chunk in chunks]
+        if all(isinstance(part.dtype, CategoricalDtype) for part in parts):
+            # A chunk without any value of the column has empty categories of another dtype
+            filled = [part.cat.categories for part in parts if len(part.cat.categories)]
+            if filled:
+                empty = filled[0][:0]
+                parts = [part if len(part.cat.categories) else part.cat.set_categories(empty) for part in parts]
+            columns[col] = pd.Series(union_categoricals(parts), name=col)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+        # Release the chunk columns as soon as they are merged
+        for chunk in chunks:
+            del chunk[col]
+    return pd.DataFrame(columns)
+
+def _read_chunks(source, dtypes, chunk_rows):
+    chunks = []
+    resident_bytes = 0
+    peak_bytes = 0
+    with open_source(source) as f, pd.read_csv(f, dtype=dtypes, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            chunk = downcast_numeric_columns(chunk)
+            chunk_bytes = int(chunk.memory_usage(deep=True).sum())
+            resident_bytes += chunk_bytes
+            peak_bytes = max(peak_bytes, resident_bytes)
+            chunks.append(chunk)
+    return chunks, peak_bytes
+
+def read_csv_chunked(source, chunk_bytes=CSV_CHUNK_BYTES, sample_rows=CSV_SAMPLE_ROWS):
+    """
+    Read a CSV file in bounded-size chunks using dtypes inferred up front.
+
+    Parameters:
+    - source: Path to the CSV file or a seekable binary buffer
+    - chunk_bytes: Approximate number of bytes of the file parsed per chunk
+    - sample_rows: Number of rows sampled to infer the schema
+
+    Returns:
+    - df: Compact DataFrame with the contents of the file
+    - stats: Dictionary with 'rows', 'chunks', 'seconds', 'rows_per_sec' and 'peak_memory_mb'
+    """
+    start = time.perf_counter()
+    try:
+        dtypes, row_bytes = infer_csv_schema(source, sample_rows=sample_rows)
+        chunk_rows = max(MIN_CHUNK_ROWS, chunk_bytes // row_bytes)
+
+        try:
+            chunks, peak_bytes = _read_chunks(source, dtypes, chunk_rows)
+        except ValueError as e:
+            # A value later in the file did not fit the sampled numeric dtype
+            logger.warning(f"Sampled dtypes did not fit '{source_name(source)}', retrying with categories only: {e}")
+            dtypes = {col: dtype for col, dtype in dtypes.items() if dtype == 'category'}
+            chunks, peak_bytes = _read_chunks(source, dtypes, chunk_rows)
+
+        if not chunks:
+            with open_source(source) as f:
+                df = pd.read_csv(f)
+            chunk_count = 0
+        else:
+            chunk_count = len(chunks)
+            df = combine_chunks(chunks)
+            peak_bytes = max(peak_bytes, int(df.memory_usage(deep=True).sum()))
+    except Exception as e:
+        logger.error(f"Error reading CSV '{source_name(source)}' in chunks: {e}")
+        raise DataLoaderException(f"Error reading CSV file: {e}")
+
+    seconds = time.perf_counter() - start
+    stats = {
+        'rows': len(df),
+        'chunks': chunk_count,
+        'seconds': seconds,
+        'rows_per_sec': (len(df) / seconds) if seconds > 0 else float('inf'),
+        'peak_memory_mb': peak_bytes / (1024 ** 2),
+    }
+    logger.info(
+        f"Read '{source_name(source)}': {stats['rows']} rows in {chunk_count} chunks, "
+        f"{stats['rows_per_sec']:.0f} rows/sec, peak memory ~{stats['peak_memory_mb']:.1f} MB."
+    )
+    return df, stats
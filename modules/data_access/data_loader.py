@@ -1,42 +1,124 @@
-import pandas as pd
 import streamlit as st
-from sklearn import datasets
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from ..utils.logger import get_logger
 from ..utils.exceptions import DataLoaderException
-from configs.config import DATA_DIRECTORY
+from ..utils.fingerprint import dataset_fingerprint, register_fingerprint
+from .partitioned_reader import SUPPORTED_EXTENSIONS, list_partitions, read_partitions
+from .memory_optimizer import optimize_memory
+from .builtin_datasets import BUILTIN_DATASET_LOADERS, get_builtin_dataset
+from .dataset_cache import content_hash, load_cached_dataset, open_cached_dataset, store_cached_dataset
+from configs.config import DATA_DIRECTORY, DATASET_MEMORY_MAP
 
 logger = get_logger(__name__)
 
+# Single background writer for raw uploads, and the content hash last saved under each file name
+_upload_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='upload-writer')
+_persisted_uploads = {}
+_persist_lock = threading.Lock()
+# Memory optimization report of each parsed upload by cache key, shown again when it is served from the cache
+_memory_reports = {}
+
+def _fingerprinted(df, source_key):
+    """
+    Register the full fingerprint of a loaded dataset, hashing it only once per source.
+
+    Every rerun loads a new frame, so the fingerprint is kept in the session state next
+    to the key of the source it was computed for, and attached to each new frame.
+
+    Parameters:
+    - df: Loaded DataFrame or DatasetHandle
+    - source_key: Key identifying the loaded source, e.g. the upload's content hash
+
+    Returns:
+    - df: The same object, with its fingerprint registered
+    """
+    cached = st.session_state.get('dataset_fingerprint')
+    if cached is None or cached[0] != source_key:
+        cached = (source_key, dataset_fingerprint(df))
+        st.session_state['dataset_fingerprint'] = cached
+    return register_fingerprint(df, cached[1])
+
 def load_user_dataset():
     """
-    Allows the user to upload a dataset in various formats and returns a DataFrame.
+    Allows the user to upload one or more datasets in various formats and returns a DataFrame,
+    or a memory-mapped DatasetHandle when DATASET_MEMORY_MAP is enabled.
+
+    Multiple files, every sheet of a workbook and every CSV/JSON file in a zip archive are
+    parsed in parallel and combined into one frame with a source column.
     """
-    uploaded_file = st.sidebar.file_uploader("Upload Your Dataset", type=['csv', 'xlsx', 'xls', 'json'])
-    if uploaded_file is not None:
-        file_name = uploaded_file.name
-        file_extension = os.path.splitext(file_name)[1].lower()
+    uploaded_files = st.sidebar.file_uploader(
+        "Upload Your Dataset",
+        type=['csv', 'xlsx', 'xls', 'json', 'jsonl', 'ndjson', 'parquet', 'zip'],
+        accept_multiple_files=True
+    )
+    if uploaded_files:
+        file_names = ', '.join(uploaded_file.name for uploaded_file in uploaded_files)
         try:
-            # Save the uploaded file to the data directory
-            save_uploaded_file(uploaded_file)
-
-            # Read the file into a DataFrame
-            file_path = os.path.join(DATA_DIRECTORY, file_name)
-            if file_extension == '.csv':
-                df = pd.read_csv(file_path)
-            elif file_extension in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_path)
-            elif file_extension == '.json':
-                df = pd.read_json(file_path)
+            # Reuse the parsed frame if these exact bytes were loaded before
+            file_keys = [
+                content_hash(uploaded_file.getbuffer(), suffix=os.path.splitext(uploaded_file.name)[1].lower())
+                for uploaded_file in uploaded_files
+            ]
+            cache_key = file_keys[0] if len(file_keys) == 1 else content_hash(''.join(file_keys).encode())
+            start = time.perf_counter()
+            if DATASET_MEMORY_MAP:
+                df = open_cached_dataset(cache_key)
             else:
-                st.error("Unsupported file type.")
-                raise DataLoaderException(f"Unsupported file type: {file_extension}")
+                df = load_cached_dataset(cache_key)
+            if df is not None:
+                seconds = time.perf_counter() - start
+                st.sidebar.caption(f"Read {len(df):,} rows from the dataset cache in {seconds:.2f}s.")
+                # The report of the session's previous dataset must not be shown for this one
+                memory_report = _memory_reports.get(cache_key)
+                if memory_report is not None:
+                    st.session_state['memory_report'] = memory_report
+                else:
+                    st.session_state.pop('memory_report', None)
+                st.success("Dataset loaded successfully!")
+                logger.info(f"User dataset '{file_names}' loaded from cache.")
+                return _fingerprinted(df, cache_key)
+
+            partitions = []
+            for uploaded_file, file_key in zip(uploaded_files, file_keys):
+                file_extension = os.path.splitext(uploaded_file.name)[1].lower()
+                if file_extension not in SUPPORTED_EXTENSIONS:
+                    st.error("Unsupported file type.")
+                    raise DataLoaderException(f"Unsupported file type: {file_extension}")
+
+                # Save the uploaded file to the data directory off the critical path
+                persist_uploaded_file(uploaded_file, file_key)
+                # Parse straight from the upload buffer instead of reading the saved copy back
+                partitions.extend(list_partitions(uploaded_file.name, uploaded_file))
+
+            # Read the partitions into a single DataFrame
+            df, stats = read_partitions(partitions)
+            caption = (
+                f"Read {stats['rows']:,} rows from {stats['partitions']} partition(s) in {stats['seconds']:.2f}s "
+                f"({stats['rows_per_sec']:,.0f} rows/sec"
+            )
+            if stats['peak_memory_mb'] is not None:
+                caption += f", peak memory ~{stats['peak_memory_mb']:.1f} MB"
+            st.sidebar.caption(caption + ")")
+
+            # Shrink dtypes before caching so every later step works on the compact frame
+            df, memory_report = optimize_memory(df)
+            st.session_state['memory_report'] = memory_report
+            _memory_reports[cache_key] = memory_report
+
+            if store_cached_dataset(cache_key, df) and DATASET_MEMORY_MAP:
+                # Drop the parsed frame and serve columns from the memory-mapped copy
+                handle = open_cached_dataset(cache_key)
+                if handle is not None:
+                    df = handle
             st.success("Dataset loaded successfully!")
-            logger.info(f"User dataset '{file_name}' loaded successfully.")
-            return df
+            logger.info(f"User dataset '{file_names}' loaded successfully.")
+            return _fingerprinted(df, cache_key)
         except Exception as e:
             st.error(f"Error loading dataset: {e}")
-            logger.error(f"Error loading user dataset '{file_name}': {e}")
+            logger.error(f"Error loading user dataset '{file_names}': {e}")
             return None
     else:
         st.info("Awaiting file upload.")
@@ -45,35 +127,51 @@ def load_user_dataset():
 def load_builtin_dataset(name):
     """
     Loads a built-in dataset from scikit-learn by name and returns a DataFrame.
+    Datasets are served from an in-process cache backed by snapshots under DATA_DIRECTORY.
     """
     try:
-        data_loaders = {
-            'Iris': datasets.load_iris,
-            'Wine': datasets.load_wine,
-            'Breast Cancer': datasets.load_breast_cancer,
-            'Diabetes': datasets.load_diabetes,
-            'California Housing': datasets.fetch_california_housing
-        }
-
-        if name not in data_loaders:
+        if name not in BUILTIN_DATASET_LOADERS:
             st.error("Dataset not found.")
             raise DataLoaderException(f"Dataset '{name}' not found.")
 
-        data = data_loaders[name]()
-        if hasattr(data, 'data'):
-            X = pd.DataFrame(data.data, columns=data.feature_names)
-        else:
-            X = pd.DataFrame(data['data'], columns=data['feature_names'])
-        y = pd.Series(data.target, name='target')
-        df = pd.concat([X, y], axis=1)
+        df = get_builtin_dataset(name)
+        # Built-in datasets are not optimized, so there is no before/after report
+        st.session_state.pop('memory_report', None)
         st.success(f"{name} dataset loaded successfully!")
         logger.info(f"Built-in dataset '{name}' loaded successfully.")
-        return df
+        return _fingerprinted(df, ('builtin', name))
     except Exception as e:
         st.error(f"Error loading dataset: {e}")
         logger.error(f"Error loading built-in dataset '{name}': {e}")
         return None
     
+def persist_uploaded_file(uploaded_file, key):
+    """
+    Save the uploaded file to the data directory in a background thread.
+    Files whose content was already saved under the same name are skipped.
+
+    Parameters:
+    - uploaded_file: Streamlit UploadedFile
+    - key: Content hash of the file, from content_hash
+
+    Returns:
+    - future: Future of the background write, or None if the file was already saved
+    """
+    with _persist_lock:
+        if _persisted_uploads.get(uploaded_file.name) == key:
+            return None
+        _persisted_uploads[uploaded_file.name] = key
+    return _upload_writer.submit(_persist_in_background, uploaded_file, key)
+
+def _persist_in_background(uploaded_file, key):
+    try:
+        save_uploaded_file(uploaded_file)
+    except DataLoaderException:
+        # Forget the failed write so the next rerun tries again
+        with _persist_lock:
+            if _persisted_uploads.get(uploaded_file.name) == key:
+                del _persisted_uploads[uploaded_file.name]
+
 def save_uploaded_file(uploaded_file):
     """
     Save the uploaded file to the data directory.
@@ -81,8 +179,11 @@ def save_uploaded_file(uploaded_file):
     try:
         os.makedirs(DATA_DIRECTORY, exist_ok=True)
         file_path = os.path.join(DATA_DIRECTORY, uploaded_file.name)
-        with open(file_path, 'wb') as f:
+        tmp_path = f"{file_path}.tmp"
+        # Write to a temporary file first so readers never see a partial upload
+        with open(tmp_path, 'wb') as f:
             f.write(uploaded_file.getbuffer())
+        os.replace(tmp_path, file_path)
         logger.info(f"Uploaded file '{uploaded_file.name}' saved to '{file_path}'.")
     except Exception as e:
         logger.error(f"Error saving uploaded file '{uploaded_file.name}': {e}")
@@ -0,0 +1,148 @@
+import os
+import hashlib
+import pyarrow.feather as feather
+from modules.utils.logger import get_logger
+from modules.data_access.dataset_handle import DatasetHandle
+from configs.config import DATASET_CACHE_DIRECTORY, DATASET_CACHE_MAX_BYTES
+
+logger = get_logger(__name__)
+
+CACHE_EXTENSION = '.feather'
+
+def content_hash(data, suffix=''):
+    """
+    Compute a cache key from the raw bytes of a file.
+
+    Parameters:
+    - data: Bytes-like object with the file contents
+    - suffix: Extra text mixed into the key, e.g. the file extension
+
+    Returns:
+    - key: Hex digest identifying the contents
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(data)
+    digest.update(suffix.encode())
+    return digest.hexdigest()
+
+def _cache_path(key, cache_dir=DATASET_CACHE_DIRECTORY):
+    return os.path.join(cache_dir, f"{key}{CACHE_EXTENSION}")
+
+def load_cached_dataset(key, cache_dir=DATASET_CACHE_DIRECTORY):
+    """
+    Load a cached dataset by key.
+
+    Parameters:
+    - key: Cache key returned by content_hash
+    - cache_dir: Directory holding the cache files
+
+    Returns:
+    - df: Cached DataFrame, or None if the key is not cached
+    """
+    path = _cache_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        # Uncompressed Feather files are memory-mapped rather than read
+        table = feather.read_table(path, memory_map=True)
+        df = table.to_pandas(split_blocks=True)
+        # Mark the entry as recently used for eviction
+        os.utime(path)
+        logger.info(f"Loaded dataset from cache entry '{key}'.")
+        return df
+    except Exception as e:
+        logger.warning(f"Discarding unreadable cache entry '{key}': {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+def open_cached_dataset(key, cache_dir=DATASET_CACHE_DIRECTORY):
+    """
+    Open a cached dataset as a memory-mapped handle without reading its columns.
+
+    Parameters:
+    - key: Cache key returned by content_hash
+    - cache_dir: Directory holding the cache files
+
+    Returns:
+    - handle: DatasetHandle over the cache entry, or None if the key is not cached
+    """
+    path = _cache_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        handle = DatasetHandle(path)
+        os.utime(path)
+        logger.info(f"Opened memory-mapped dataset from cache entry '{key}'.")
+        return handle
+    except Exception as e:
+        logger.warning(f"Could not open cache entry '{key}': {e}")
+        return None
+
+def store_cached_dataset(key, df, cache_dir=DATASET_CACHE_DIRECTORY, max_bytes=DATASET_CACHE_MAX_BYTES):
+    """
+    Write a dataset to the cache and evict old entries beyond the size budget.
+
+    Parameters:
+    - key: Cache key returned by content_hash
+    - df: Pandas DataFrame to cache
+    - cache_dir: Directory holding the cache files
+    - max_bytes: Maximum total size of the cache directory
+
+    Returns:
+    - stored: True if the dataset was written to the cache
+    """
+    path = _cache_path(key, cache_dir)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+        logger.info(f"Stored dataset in cache entry '{key}'.")
+    except Exception as e:
+        # Frames Feather cannot represent, e.g. non-string column names, are simply not cached
+        logger.warning(f"Could not cache dataset '{key}': {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    evict_cached_datasets(max_bytes, cache_dir=cache_dir, keep=key)
+    return True
+
+def evict_cached_datasets(max_bytes=DATASET_CACHE_MAX_BYTES, cache_dir=DATASET_CACHE_DIRECTORY, keep=None):
+    """
+    Remove least recently used cache entries until the cache fits in the size budget.
+
+    Parameters:
+    - max_bytes: Maximum total size of the cache directory
+    - cache_dir: Directory holding the cache files
+    - keep: Optional key that is never evicted
+
+    Returns:
+    - evicted: List of evicted keys
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(CACHE_EXTENSION):
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, name[:-len(CACHE_EXTENSION)]))
+
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for _, size, key in sorted(entries):
+        if total <= max_bytes:
+            break
+        if key == keep:
+            continue
+        os.remove(_cache_path(key, cache_dir))
+        total -= size
+        evicted.append(key)
+
+    if evicted:
+        logger.info(f"Evicted {len(evicted)} dataset cache entries to stay under {max_bytes} bytes.")
+    return evicted
@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from modules.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class DatasetHandle:
+    """
+    Read-only view of a dataset stored as an uncompressed Feather file.
+
+    The file is memory-mapped and columns are only read into memory when they are
+    accessed, so resident memory follows the columns in use rather than the file size.
+    The handle supports the parts of the DataFrame interface used by the EDA and
+    preprocessing code: columns, dtypes, shape, select_dtypes, head/tail/sample,
+    column selection with [] and row filtering with a boolean mask.
+    """
+
+    def __init__(self, path, rows=None, table=None):
+        """
+        Parameters:
+        - path: Path to an uncompressed Feather file
+        - rows: Optional array of row positions this view is restricted to
+        - table: Already memory-mapped Arrow table for the file (used by derived views)
+        """
+        self.path = path
+        self.rows = rows
+        self._table = table if table is not None else feather.read_table(path, memory_map=True)
+        self._schema_frame = self._table.schema.empty_table().to_pandas()
+
+    @property
+    def columns(self):
+        return self._schema_frame.columns
+
+    @property
+    def dtypes(self):
+        return self._schema_frame.dtypes
+
+    @property
+    def shape(self):
+        return (len(self), len(self.columns))
+
+    def __len__(self):
+        return self._table.num_rows if self.rows is None else len(self.rows)
+
+    def select_dtypes(self, include=None, exclude=None):
+        """
+        Select columns by dtype without reading any data.
+
+        Returns:
+        - schema_frame: Empty DataFrame with the matching columns; use its .columns
+        """
+        return self._schema_frame.select_dtypes(include=include, exclude=exclude)
+
+    def _to_frame(self, table, rows):
+        df = table.to_pandas(split_blocks=True)
+        if rows is not None:
+            df.index = pd.Index(rows)
+        return df
+
+    def _take(self, positions, columns=None):
+        """
+        Read the given row positions of this view into a DataFrame.
+        """
+        table = self._table if columns is None else self._table.select(list(columns))
+        rows = positions if self.rows is None else self.rows[positions]
+        return self._to_frame(table.take(pa.array(rows)), rows)
+
+    def load(self, columns=None):
+        """
+        Read columns of the dataset into memory.
+
+        Parameters:
+        - columns: List of column names to read; all columns if None
+
+        Returns:
+        - df: DataFrame with the requested columns
+        """
+        table = self._table if columns is None else self._table.select(list(columns))
+        if self.rows is None:
+            return self._to_frame(table, None)
+        return self._to_frame(table.take(pa.array(self.rows)), self.rows)
+
+    def to_pandas(self):
+        return self.load()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.load([key])[key]
+        if isinstance(key, (list, tuple, pd.Index)):
+            return self.load(key)
+        return self.filter(key)
+
+    def filter(self, mask):
+        """
+        Restrict the view to the rows where a boolean mask is True.
+
+        Parameters:
+        - mask: Boolean Series or array aligned with the rows of this view
+
+        Returns:
+        - handle: New DatasetHandle over the selected rows
+        """
+        return self.view(np.flatnonzero(np.asarray(mask, dtype=bool)))
+
+    def view(self, positions):
+        """
+        Restrict the view to the given row positions without reading any data.
+
+        Parameters:
+        - positions: Sorted array of row positions within this view
+
+        Returns:
+        - handle: New DatasetHandle over the selected rows
+        """
+        rows = positions if self.rows is None else self.rows[positions]
+        return DatasetHandle(self.path, rows=rows, table=self._table)
+
+    def head(self, n=5):
+        return self._take(np.arange(min(n, len(self))))
+
+    def tail(self, n=5):
+        return self._take(np.arange(max(0, len(self) - n), len(self)))
+
+    def sample(self, n=5, random_state=None):
+        rng = np.random.default_rng(random_state)
+        positions = np.sort(rng.choice(len(self), size=min(n, len(self)), replace=False))
+        return self._take(positions)
+
+    def null_counts(self):
+        """
+        Count missing values per column, reading Arrow metadata when the view is unfiltered.
+
+        Returns:
+        - counts: Series of missing value counts indexed by column name
+        """
+        if self.rows is None:
+            counts = [self._table.column(i).null_count for i in range(self._table.num_columns)]
+            return pd.Series(counts, index=self.columns)
+        return pd.Series({col: int(self[col].isnull().sum()) for col in self.columns})
+
+    def copy(self):
+        # The handle is read-only, so views can be shared safely
+        return self
+
+def as_frame(data, columns=None):
+    """
+    Materialize columns from a DataFrame or DatasetHandle.
+
+    Parameters:
+    - data: Pandas DataFrame or DatasetHandle
+    - columns: List of column names; all columns if None
+
+    Returns:
+    - df: DataFrame with the requested columns
+    """
+    if isinstance(data, DatasetHandle):
+        return data.load(columns)
+    return data if columns is None else data[list(columns)]
+
+def null_counts(data):
+    """
+    Count missing values per column of a DataFrame or DatasetHandle.
+    """
+    if isinstance(data, DatasetHandle):
+        return data.null_counts()
+    return data.isnull().sum()
+
+def take_rows(data, positions, columns=None):
+    """
+    Materialize rows of a DataFrame or DatasetHandle by position.
+
+    Parameters:
+    - data: Pandas DataFrame or DatasetHandle
+    - positions: Array of row positions
+    - columns: List of column names; all columns if None
+
+    Returns:
+    - df: DataFrame with the requested rows and columns
+    """
+    if isinstance(data, DatasetHandle):
+        return data._take(positions, columns)
+    rows = data.iloc[positions]
+    return rows if columns is None else rows[list(columns)]
+
+def filter_rows(data, positions):
+    """
+    Select rows of a DataFrame or DatasetHandle by position.
+
+    Handles return a view that reads no data; DataFrames are copied once.
+    """
+    if isinstance(data, DatasetHandle):
+        return data.view(positions)
+    return data.iloc[positions]
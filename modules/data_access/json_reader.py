@@ -0,0 +1,159 @@
+import os
+import json
+import time
+from itertools import islice
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype, is_numeric_dtype
+from modules.utils.logger import get_logger
+from modules.utils.exceptions import DataLoaderException
+from modules.data_access.csv_reader import combine_chunks, downcast_numeric_columns, open_source, source_name
+from configs.config import CSV_SAMPLE_ROWS, CSV_CHUNK_BYTES, CATEGORY_MAX_UNIQUE_RATIO
+
+logger = get_logger(__name__)
+
+JSON_LINES_EXTENSIONS = ['.jsonl', '.ndjson']
+MIN_CHUNK_ROWS = 1000
+
+def is_json_lines(source, file_name):
+    """
+    Check whether a file holds one JSON object per line rather than a single JSON document.
+
+    Parameters:
+    - source: Path to the JSON file or a seekable binary buffer
+    - file_name: Name of the file, used for its extension
+
+    Returns:
+    - is_lines: True if the file is JSON Lines / NDJSON
+    """
+    if os.path.splitext(file_name)[1].lower() in JSON_LINES_EXTENSIONS:
+        return True
+    # A plain .json file counts as JSON Lines when its first two records each parse on their own
+    with open_source(source) as f:
+        lines = [line for line in islice(f, 10) if line.strip()][:2]
+    if len(lines) < 2:
+        return False
+    try:
+        return all(isinstance(json.loads(line), dict) for line in lines)
+    except ValueError:
+        return False
+
+def _parse_lines(lines):
+    records = [json.loads(line) for line in lines if line.strip()]
+    # Nested objects become dotted columns, e.g. {"user": {"id": 1}} -> user.id
+    return pd.json_normalize(records)
+
+def infer_json_lines_schema(source, sample_rows=CSV_SAMPLE_ROWS):
+    """
+    Infer the flattened columns and their dtypes from the head of a JSON Lines file.
+
+    Parameters:
+    - source: Path to the JSON Lines file or a seekable binary buffer
+    - sample_rows: Number of records to sample
+
+    Returns:
+    - columns: Ordered list of flattened column names
+    - dtypes: Dictionary mapping column names to the dtype to cast them to
+    - row_bytes: Estimated average size of one record on disk, in bytes
+    """
+    with open_source(source) as f:
+        lines = [line for line in islice(f, sample_rows) if line.strip()]
+    sample = _parse_lines(lines)
+
+    dtypes = {}
+    for col in sample.columns:
+        series = sample[col]
+        if is_bool_dtype(series):
+            dtypes[col] = 'boolean'
+        elif is_integer_dtype(series):
+            # Later records may omit the field, so integers use the nullable type
+            dtypes[col] = 'Int64'
+        elif is_float_dtype(series):
+            dtypes[col] = 'float64'
+        elif not is_numeric_dtype(series) and len(series) > 0:
+            values = series.dropna()
+            # Lists and dicts are unhashable and stay as objects
+            if values.map(lambda v: isinstance(v, str)).all():
+                if series.nunique(dropna=True) / len(series) <= CATEGORY_MAX_UNIQUE_RATIO:
+                    dtypes[col] = 'category'
+
+    row_bytes = max(1, sum(len(line) for line in lines) // max(1, len(lines)))
+    return list(sample.columns), dtypes, row_bytes
+
+def _apply_schema(chunk, columns, dtypes):
+    chunk = chunk.reindex(columns=columns)
+    for col, dtype in dtypes.items():
+        try:
+            chunk[col] = chunk[col].astype(dtype)
+        except (TypeError, ValueError):
+            # Leave the column as parsed; chunks are reconciled when combined
+            pass
+    return downcast_numeric_columns(chunk)
+
+def read_json_lines_chunked(source, chunk_bytes=CSV_CHUNK_BYTES, sample_rows=CSV_SAMPLE_ROWS):
+    """
+    Read a JSON Lines / NDJSON file in bounded-size chunks using a schema inferred up front.
+
+    Nested objects are flattened into dotted column names. Fields that first appear after
+    the sampled records are appended to the schema as they are found, and are missing in
+    the records before them.
+
+    Parameters:
+    - source: Path to the JSON Lines file or a seekable binary buffer
+    - chunk_bytes: Approximate number of bytes of the file parsed per chunk
+    - sample_rows: Number of records sampled to infer the schema
+
+    Returns:
+    - df: Compact DataFrame with the contents of the file
+    - stats: Dictionary with 'rows', 'chunks', 'seconds', 'rows_per_sec' and 'peak_memory_mb'
+    """
+    start = time.perf_counter()
+    try:
+        columns, dtypes, row_bytes = infer_json_lines_schema(source, sample_rows=sample_rows)
+        chunk_rows = max(MIN_CHUNK_ROWS, chunk_bytes // row_bytes)
+
+        chunks = []
+        resident_bytes = 0
+        peak_bytes = 0
+        added_columns = []
+        with open_source(source) as f:
+            while True:
+                lines = list(islice(f, chunk_rows))
+                if not lines:
+                    break
+                chunk = _parse_lines(lines)
+                known = set(columns)
+                new_columns = [col for col in chunk.columns if col not in known]
+                if new_columns:
+                    columns = columns + new_columns
+                    added_columns.extend(new_columns)
+                chunk = _apply_schema(chunk, columns, dtypes)
+                resident_bytes += int(chunk.memory_usage(deep=True).sum())
+                peak_bytes = max(peak_bytes, resident_bytes)
+                chunks.append(chunk)
+
+        if added_columns:
+            logger.info(
+                f"Added {len(added_columns)} fields of '{source_name(source)}' missing from the sampled schema: "
+                f"{added_columns[:10]}"
+            )
+            # Earlier chunks get the late fields as missing values
+            chunks = [chunk.reindex(columns=columns) for chunk in chunks]
+        df = combine_chunks(chunks) if chunks else pd.DataFrame(columns=columns)
+        peak_bytes = max(peak_bytes, int(df.memory_usage(deep=True).sum()))
+    except Exception as e:
+        logger.error(f"Error reading JSON Lines '{source_name(source)}' in chunks: {e}")
+        raise DataLoaderException(f"Error reading JSON Lines file: {e}")
+
+    seconds = time.perf_counter() - start
+    stats = {
+        'rows': len(df),
+        'chunks': len(chunks),
+        'seconds': seconds,
+        'rows_per_sec': (len(df) / seconds) if seconds > 0 else float('inf'),
+        'peak_memory_mb': peak_bytes / (1024 ** 2),
+    }
+    logger.info(
+        f"Read '{source_name(source)}': {stats['rows']} records in {stats['chunks']} chunks, "
+        f"{stats['rows_per_sec']:.0f} rows/sec, peak memory ~{stats['peak_memory_mb']:.1f} MB."
+    )
+    return df, stats
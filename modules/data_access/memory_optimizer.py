@@ -0,0 +1,125 @@
+import warnings
+import numpy as np
+import pandas as pd
+from pandas import CategoricalDtype
+from pandas.api.types import (
+    is_bool_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
+from modules.utils.logger import get_logger
+from configs.config import CATEGORY_MAX_UNIQUE_RATIO
+
+logger = get_logger(__name__)
+
+DATETIME_SAMPLE_SIZE = 1000
+BOOLEAN_VALUES = {True: True, False: False, 'true': True, 'false': False}
+
+def _downcast_integer(series):
+    series_min = series.min()
+    downcast = 'unsigned' if pd.notna(series_min) and series_min >= 0 else 'integer'
+    return pd.to_numeric(series, downcast=downcast)
+
+def _downcast_float(series):
+    # Only narrow to float32 when no value changes
+    narrowed = series.astype('float32')
+    if np.array_equal(narrowed.to_numpy(dtype='float64'), series.to_numpy(dtype='float64'), equal_nan=True):
+        return narrowed
+    return series
+
+def _boolean_key(value):
+    # 1 == True and 0 == False, so numbers must not be looked up in BOOLEAN_VALUES
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, str):
+        return value.strip().lower()
+    return None
+
+def _as_boolean(series):
+    values = series.dropna()
+    if values.empty:
+        return None
+    if not values.map(_boolean_key).isin(list(BOOLEAN_VALUES)).all():
+        return None
+    converted = series.map(lambda v: BOOLEAN_VALUES[_boolean_key(v)], na_action='ignore')
+    return converted.astype('boolean' if series.isnull().any() else 'bool')
+
+def _as_datetime(series):
+    values = series.dropna()
+    if values.empty:
+        return None
+    sample = values.iloc[:DATETIME_SAMPLE_SIZE]
+    if not sample.map(lambda v: isinstance(v, str)).all() or not sample.str.contains(r'[-/:]').all():
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        if pd.to_datetime(sample, errors='coerce').isnull().any():
+            return None
+        converted = pd.to_datetime(series, errors='coerce')
+    # Reject the conversion if any value failed to parse
+    if converted.isnull().sum() != series.isnull().sum():
+        return None
+    return converted
+
+def _optimize_text(series):
+    converted = _as_boolean(series)
+    if converted is not None:
+        return converted
+    converted = _as_datetime(series)
+    if converted is not None:
+        return converted
+    if len(series) and series.nunique(dropna=True) / len(series) <= CATEGORY_MAX_UNIQUE_RATIO:
+        return series.astype('category')
+    if is_object_dtype(series) and series.dropna().map(lambda v: isinstance(v, str)).all():
+        return series.astype(pd.StringDtype('pyarrow'))
+    return series
+
+def optimize_memory(df):
+    """
+    Shrink a DataFrame by choosing compact dtypes for each column.
+
+    Integers are downcast to the smallest type that holds them, floats are narrowed to
+    float32 when that is lossless, and text columns are converted to booleans, datetimes,
+    categories or Arrow-backed strings.
+
+    Parameters:
+    - df: Pandas DataFrame
+
+    Returns:
+    - df_optimized: DataFrame with compact dtypes
+    - report: DataFrame with the dtype and memory of each column before and after
+    """
+    memory_before = df.memory_usage(deep=True, index=False)
+    dtypes_before = df.dtypes
+
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        try:
+            if is_bool_dtype(series) or isinstance(series.dtype, CategoricalDtype):
+                pass
+            elif is_integer_dtype(series):
+                series = _downcast_integer(series)
+            elif is_float_dtype(series):
+                series = _downcast_float(series)
+            elif is_object_dtype(series) or is_string_dtype(series):
+                series = _optimize_text(series)
+        except Exception as e:
+            logger.warning(f"Could not optimize column '{col}': {e}")
+        columns[col] = series
+    df_optimized = pd.DataFrame(columns, index=df.index)
+
+    memory_after = df_optimized.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'Dtype Before': dtypes_before.astype(str),
+        'Dtype After': df_optimized.dtypes.astype(str),
+        'Memory Before (MB)': memory_before / 1024 ** 2,
+        'Memory After (MB)': memory_after / 1024 ** 2,
+    })
+    logger.info(
+        f"Memory optimized from {memory_before.sum() / 1024 ** 2:.2f} MB "
+        f"to {memory_after.sum() / 1024 ** 2:.2f} MB."
+    )
+    return df_optimized, report
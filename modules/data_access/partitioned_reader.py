@@ -0,0 +1,241 @@
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from pandas import CategoricalDtype
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_datetime64_any_dtype
+from modules.utils.logger import get_logger
+from modules.utils.exceptions import DataLoaderException
+from modules.data_access.csv_reader import open_source, read_csv_chunked
+from modules.data_access.json_reader import JSON_LINES_EXTENSIONS, is_json_lines, read_json_lines_chunked
+from configs.config import INGEST_MAX_WORKERS, SOURCE_COLUMN
+
+logger = get_logger(__name__)
+
+SUPPORTED_EXTENSIONS = ['.csv', '.xlsx', '.xls', '.json', '.parquet', '.zip'] + JSON_LINES_EXTENSIONS
+ZIP_MEMBER_EXTENSIONS = ['.csv', '.json'] + JSON_LINES_EXTENSIONS
+
+# Bytes of sources shared by several partitions, e.g. the sheets of a workbook, sent once to each worker process
+_worker_sources = {}
+
+def _init_worker(sources):
+    _worker_sources.clear()
+    _worker_sources.update(sources)
+
+class _SharedSource:
+    """
+    Reference to source bytes held in _worker_sources.
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+def list_partitions(file_name, source):
+    """
+    Split an upload into the partitions that can be parsed independently.
+
+    Parameters:
+    - file_name: Name of the uploaded file
+    - source: Path to the file, a seekable binary buffer or the file's bytes
+
+    Returns:
+    - partitions: List of (source_name, kind, source, member) tuples, where member is a
+                  sheet name for workbooks, a member name for zip archives and None otherwise
+    """
+    file_extension = os.path.splitext(file_name)[1].lower()
+
+    if file_extension == '.csv':
+        return [(file_name, 'csv', source, None)]
+    if file_extension in ['.json'] + JSON_LINES_EXTENSIONS:
+        return [(file_name, 'json', source, None)]
+    if file_extension == '.parquet':
+        return [(file_name, 'parquet', source, None)]
+    if file_extension in ['.xlsx', '.xls']:
+        with open_source(_as_buffer(source)) as f, pd.ExcelFile(f) as workbook:
+            sheet_names = workbook.sheet_names
+        if len(sheet_names) == 1:
+            return [(file_name, 'excel', source, sheet_names[0])]
+        return [(f"{file_name}:{sheet}", 'excel', source, sheet) for sheet in sheet_names]
+    if file_extension == '.zip':
+        with open_source(_as_buffer(source)) as f, zipfile.ZipFile(f) as archive:
+            members = [
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and os.path.splitext(info.filename)[1].lower() in ZIP_MEMBER_EXTENSIONS
+            ]
+        if not members:
+            raise DataLoaderException(f"No CSV or JSON files found in '{file_name}'.")
+        return [(f"{file_name}:{member}", 'zip', source, member) for member in sorted(members)]
+
+    raise DataLoaderException(f"Unsupported file type: {file_extension}")
+
+def _as_buffer(source, name=None):
+    # Bytes arrive from the process pool; paths and buffers are read as they are
+    if isinstance(source, _SharedSource):
+        source = _worker_sources[source.key]
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        buffer = io.BytesIO(source)
+        buffer.name = name
+        return buffer
+    return source
+
+def read_partition(partition):
+    """
+    Parse one partition into a DataFrame. Runs inline or inside the worker processes.
+
+    Parameters:
+    - partition: (source_name, kind, source, member) tuple from list_partitions
+
+    Returns:
+    - df: Parsed DataFrame
+    - stats: Read statistics for CSV and JSON Lines partitions, None otherwise
+    """
+    name, kind, source, member = partition
+    source = _as_buffer(source, name)
+    if kind == 'zip':
+        # Archive members are decompressed into memory rather than extracted to disk
+        with open_source(source) as f, zipfile.ZipFile(f) as archive:
+            source = _as_buffer(archive.read(member), member)
+        name = member
+        kind = _member_kind(member)
+
+    if kind == 'csv':
+        return read_csv_chunked(source)
+    with open_source(source) as f:
+        if kind == 'excel':
+            return pd.read_excel(f, sheet_name=member), None
+        if kind == 'parquet':
+            return pd.read_parquet(f), None
+        if kind == 'json':
+            if is_json_lines(f, name):
+                return read_json_lines_chunked(f)
+            f.seek(0)
+            return pd.read_json(f), None
+    raise DataLoaderException(f"Unsupported partition type: {kind}")
+
+def _member_kind(member):
+    return 'csv' if member.lower().endswith('.csv') else 'json'
+
+def _picklable(partitions):
+    """
+    Replace in-memory sources so the partitions can be sent to worker processes without
+    copying a whole upload into every task.
+
+    Zip archives are split into the bytes of each member. A workbook's bytes are needed
+    by each of its sheets, so they are returned separately, to be sent once per worker.
+
+    Returns:
+    - partitions: List of picklable partitions
+    - shared: Dictionary of the source bytes referenced by the partitions, for _init_worker
+    """
+    picklable, shared, archives = [], {}, {}
+    for name, kind, source, member in partitions:
+        if hasattr(source, 'getvalue'):
+            data = source.getvalue()
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            # Paths are opened by the workers themselves
+            picklable.append((name, kind, source, member))
+            continue
+        if kind == 'zip':
+            if id(source) not in archives:
+                archives[id(source)] = zipfile.ZipFile(io.BytesIO(data))
+            picklable.append((name, _member_kind(member), archives[id(source)].read(member), None))
+        elif kind == 'excel':
+            shared.setdefault(id(source), data)
+            picklable.append((name, kind, _SharedSource(id(source)), member))
+        else:
+            picklable.append((name, kind, data, member))
+    for archive in archives.values():
+        archive.close()
+    return picklable, shared
+
+def _reconciled_dtype(dtypes):
+    """
+    Pick a dtype all partitions of a column can be cast to, or None if concat handles it.
+    """
+    if all(isinstance(dtype, CategoricalDtype) for dtype in dtypes):
+        categories = pd.Index([]).append([dtype.categories for dtype in dtypes]).unique()
+        return CategoricalDtype(categories)
+    if len(set(map(str, dtypes))) == 1:
+        return None
+    if all(is_numeric_dtype(dtype) and not is_bool_dtype(dtype) for dtype in dtypes):
+        return None
+    if all(is_datetime64_any_dtype(dtype) for dtype in dtypes):
+        return None
+    # Mixed kinds, e.g. numbers in one file and text in another
+    return object
+
+def combine_partitions(frames, sources):
+    """
+    Concatenate partitions into one frame, reconciling column sets and dtypes.
+
+    Columns missing from a partition are filled with missing values, categorical columns
+    share the union of their categories and columns of conflicting kinds fall back to object.
+    A categorical SOURCE_COLUMN records the partition each row came from.
+
+    Parameters:
+    - frames: List of DataFrames
+    - sources: List of source names, one per frame
+
+    Returns:
+    - df: Combined DataFrame
+    """
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    for col in columns:
+        present = [frame for frame in frames if col in frame.columns]
+        dtype = _reconciled_dtype([frame[col].dtype for frame in present])
+        if dtype is not None:
+            for frame in present:
+                frame[col] = frame[col].astype(dtype)
+
+    for frame, source in zip(frames, sources):
+        frame[SOURCE_COLUMN] = source
+    df = pd.concat(frames, ignore_index=True)
+    # Popping and re-adding keeps the source column last
+    df[SOURCE_COLUMN] = df.pop(SOURCE_COLUMN).astype(CategoricalDtype(list(dict.fromkeys(sources))))
+    return df
+
+def read_partitions(partitions, max_workers=INGEST_MAX_WORKERS):
+    """
+    Parse partitions in parallel with a process pool and combine them.
+
+    Parameters:
+    - partitions: List of (source_name, kind, source, member) tuples from list_partitions
+    - max_workers: Maximum number of worker processes
+
+    Returns:
+    - df: Combined DataFrame; a single partition is returned without a source column
+    - stats: Dictionary with 'rows', 'partitions', 'seconds', 'rows_per_sec' and 'peak_memory_mb'
+    """
+    start = time.perf_counter()
+    workers = max(1, min(len(partitions), max_workers or 1))
+    if workers == 1:
+        results = [read_partition(partition) for partition in partitions]
+    else:
+        picklable, shared = _picklable(partitions)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as executor:
+            results = list(executor.map(read_partition, picklable))
+
+    frames = [df for df, _ in results]
+    if len(frames) == 1:
+        df = frames[0]
+    else:
+        df = combine_partitions(frames, [partition[0] for partition in partitions])
+
+    seconds = time.perf_counter() - start
+    chunked_stats = [stats for _, stats in results if stats is not None]
+    stats = {
+        'rows': len(df),
+        'partitions': len(partitions),
+        'seconds': seconds,
+        'rows_per_sec': (len(df) / seconds) if seconds > 0 else float('inf'),
+        'peak_memory_mb': max((s['peak_memory_mb'] for s in chunked_stats), default=None),
+    }
+    logger.info(
+        f"Read {stats['rows']} rows from {len(partitions)} partitions with {workers} workers "
+        f"in {seconds:.2f}s."
+    )
+    return df, stats
@@ -1,15 +1,20 @@
 import streamlit as st
-from sklearn.impute import SimpleImputer, KNNImputer
+from modules.preprocessing.pipeline import (
+    CATEGORICAL_IMPUTATION,
+    NUMERIC_IMPUTATION,
+    DeduplicateStep,
+    ImputeStep,
+    OutlierStep,
+)
 from modules.utils.logger import get_logger
-import seaborn as sns
-import matplotlib.pyplot as plt
+from modules.visualization.aggregates import compute_box_statistics, finite_values, lookup_aggregate, store_aggregate
+from modules.visualization.figures import box_figure
 
 logger = get_logger(__name__)
 
 class DataCleaner:
     @staticmethod
-    @st.cache_data
-    def handle_missing_values(df, strategy, fill_value):
+    def handle_missing_values(df, strategy, fill_value, donor_sample=None, return_step=False):
         """
         Handle missing values separately for numeric and categorical columns.
 
@@ -18,127 +23,110 @@ class DataCleaner:
         - strategy: Strategy for numeric imputation ('mean', 'median', 'knn', 'iterative') 
                     and categorical imputation ('most_frequent', 'constant').
         - fill_value: Value to replace missing values with when strategy='constant' (for categorical columns).
+        - donor_sample: Number of complete rows sampled as neighbor candidates when strategy='knn' on more than
+                        KNN_EXACT_MAX_ROWS rows; all of them if None
+        - return_step: Also return the fitted ImputeStep, or None if nothing was imputed
 
         Returns:
         - df_cleaned: DataFrame with missing values handled
         """
+        step = None
         try:
             # Separate numeric and categorical columns
-            numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+            numeric_cols = df.select_dtypes(include='number').columns
+            categorical_cols = df.select_dtypes(include=['object', 'category', 'string']).columns
 
             # Handle numerical columns with numeric strategies
-            if not numeric_cols.empty:
-
-                if strategy in ['mean', 'median', 'knn', 'iterative']:
-                    if numeric_cols.empty:
-                        st.error("No numeric columns available for the selected imputation strategy.")
-                        return df
-
-                    if df[numeric_cols].isnull().sum().sum() == 0:
-                        st.error("No missing values found in the selected numeric columns.")
-                        return df
-
-                    if strategy == 'knn':
-                        # Apply KNN Imputation for numeric columns
-                        imputer = KNNImputer()
-                        df[numeric_cols] = imputer.fit_transform(df[numeric_cols])
-
-                    elif strategy == 'iterative':
-                        # Apply Iterative Imputation for numeric columns
-                        imputer = IterativeImputer()
-                        df[numeric_cols] = imputer.fit_transform(df[numeric_cols])
-
-                    else:
-                        # Apply SimpleImputer for 'mean' and 'median' strategies
-                        num_imputer = SimpleImputer(strategy=strategy)
-                        df[numeric_cols] = num_imputer.fit_transform(df[numeric_cols])
+            if not numeric_cols.empty and strategy in NUMERIC_IMPUTATION:
+                if df[numeric_cols].isnull().sum().sum() == 0:
+                    st.error("No missing values found in the selected numeric columns.")
+                    return (df, step) if return_step else df
+                step = ImputeStep(df.columns, strategy, fill_value, donor_sample)
 
             # Handle categorical columns with categorical strategies
-            if not categorical_cols.empty:
-
-                if strategy in ['most_frequent', 'constant']:
-                    if categorical_cols.empty:
-                        st.error("No categorical columns available for the selected imputation strategy.")
-                        return df
-
-                    if df[categorical_cols].isnull().sum().sum() == 0:
-                        st.error("No missing values found in the selected categorical columns.")
-                        return df
-
-                    # Apply 'most_frequent' or 'constant' for categorical columns
-                    cat_imputer = SimpleImputer(strategy=strategy, fill_value=fill_value)
-                    df[categorical_cols] = cat_imputer.fit_transform(df[categorical_cols])
-
+            if not categorical_cols.empty and strategy in CATEGORICAL_IMPUTATION:
+                if df[categorical_cols].isnull().sum().sum() == 0:
+                    st.error("No missing values found in the selected categorical columns.")
+                    return (df, step) if return_step else df
+                step = ImputeStep(df.columns, strategy, fill_value)
+
+            if step is not None:
+                df = step.fit_transform(df)
             logger.info(f"Missing values handled using strategy: {strategy} and fill_value: {fill_value}")
-            return df
+            return (df, step) if return_step else df
 
         except Exception as e:
             logger.error(f"Error in handling missing values: {e}")
             st.error(f"Error in handling missing values: {e}")
-            return df
+            return (df, None) if return_step else df
 
     @staticmethod
-    @st.cache_data
-    def handle_outliers(df, method='zscore', threshold=3):
+    def handle_outliers(df, method='zscore', threshold=3, action='drop', return_step=False):
         """
         Handle outliers in the DataFrame.
 
         Parameters:
         - df: Pandas DataFrame
-        - method: Method to detect outliers ('zscore', 'iqr')
-        - threshold: Threshold for outlier detection
+        - method: Method to detect outliers ('zscore', 'iqr', 'quantile')
+        - threshold: Threshold for outlier detection; a (lower, upper) pair of quantiles for 'quantile'
+        - action: 'drop' to remove rows with outliers, 'mask' to set their values to missing
+        - return_step: Also return the fitted OutlierStep
 
         Returns:
         - df_outliers_handled: DataFrame with outliers handled
         """
         try:
-            numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
-            if method == 'zscore':
-                from scipy import stats
-                z_scores = stats.zscore(df[numeric_cols])
-                abs_z_scores = abs(z_scores)
-                filtered_entries = (abs_z_scores < threshold).all(axis=1)
-                df = df[filtered_entries]
-            elif method == 'iqr':
-                Q1 = df[numeric_cols].quantile(0.25)
-                Q3 = df[numeric_cols].quantile(0.75)
-                IQR = Q3 - Q1
-                df = df[~((df[numeric_cols] < (Q1 - threshold * IQR)) | (df[numeric_cols] > (Q3 + threshold * IQR))).any(axis=1)]
+            step = OutlierStep(df.select_dtypes(include='number').columns, method, threshold, action)
+            df = step.fit_transform(df)
             logger.info(f"Outliers handled using method: {method}")
-            return df
+            return (df, step) if return_step else df
         except Exception as e:
             logger.error(f"Error in handling outliers: {e}")
             st.error(f"Error in handling outliers: {e}")
-            return df
+            return (df, None) if return_step else df
     
     @staticmethod
-    @st.cache_data
-    def remove_duplicates(df):
+    def remove_duplicates(df, subset=None, return_step=False):
         """
-        Remove duplicate rows from the DataFrame.
+        Remove duplicate rows from the DataFrame, using the row hash index shared with the EDA.
 
         Parameters:
         - df: Pandas DataFrame
+        - subset: Columns to compare; all columns if None
+        - return_step: Also return the DeduplicateStep
 
         Returns:
         - df_deduped: DataFrame without duplicate rows
         """
         try:
             initial_shape = df.shape
-            df = df.drop_duplicates()
+            step = DeduplicateStep(df.columns if subset is None else subset)
+            df = step.fit_transform(df)
             final_shape = df.shape
             logger.info(f"Removed duplicates. Shape changed from {initial_shape} to {final_shape}.")
-            return df
+            return (df, step) if return_step else df
         except Exception as e:
             logger.error(f"Error in removing duplicates: {e}")
             st.error(f"Error in removing duplicates: {e}")
-            return df
+            return (df, None) if return_step else df
         
     @staticmethod
-    @st.cache_data
-    def visualize_outliers(df):
+    def visualize_outliers(df, version=None):
+        """
+        Draw a box plot per column from precomputed statistics.
+
+        Parameters:
+        - df: Pandas DataFrame of numeric columns
+        - version: Version id of df from the preprocessing step cache; when given, the
+                   statistics are cached under it instead of being recomputed
+        """
         for col in df.columns:
-            fig, ax = plt.subplots()
-            sns.boxplot(data=df, x=col, ax=ax)
-            st.pyplot(fig)
+            statistics = None if version is None else lookup_aggregate(version, 'box', (col,))
+            if statistics is None:
+                statistics = compute_box_statistics(finite_values(df[col]))
+                if version is not None:
+                    store_aggregate(version, 'box', (col,), statistics)
+            if statistics is None:
+                st.write(f"Column `{col}` has no values to plot.")
+                continue
+            st.plotly_chart(box_figure(statistics, col, title=f'Box Plot of {col}'))
@@ -1,47 +1,39 @@
-import pandas as pd
 import streamlit as st
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder
+from modules.preprocessing.pipeline import ENCODING_METHODS, EncodeStep
 from modules.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 class Encoder:
     @staticmethod
-    def encode_features(df, method='label'):
+    def encode_features(df, columns=None, method='label', return_step=False):
         """
         Encode categorical features in the DataFrame.
 
         Parameters:
         - df: Pandas DataFrame
+        - columns: Columns to encode; all categorical columns if None
         - method: Encoding method ('label', 'onehot')
+        - return_step: Also return the fitted EncodeStep
 
         Returns:
         - df_encoded: DataFrame with encoded features
         """
         try:
+            if method not in ENCODING_METHODS:
+                st.error("Unsupported encoding method.")
+                return (df, None) if return_step else df
+
             # Copy DataFrame to avoid modifying original data
             df_encoded = df.copy()
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-
-            if method == 'label':
-                # Use LabelEncoder from sklearn
-                label_encoder = LabelEncoder()
-                for col in categorical_cols:
-                    # Ensure consistent label encoding across columns
-                    df_encoded[col] = label_encoder.fit_transform(df_encoded[col].astype(str))
-            elif method == 'onehot':
-                # Use OneHotEncoder from sklearn 
-                one_hot_encoder = OneHotEncoder(sparse=False, drop='first')
-                encoded_cols = one_hot_encoder.fit_transform(df_encoded[categorical_cols])
-                encoded_df = pd.DataFrame(encoded_cols, columns=one_hot_encoder.get_feature_names_out(categorical_cols))
-                df_encoded = df_encoded.drop(columns=categorical_cols).join(encoded_df)
-            else:
-                st.error("Unsupported encoding method.")
-                return df
+            if columns is None:
+                columns = df.select_dtypes(include=['object', 'category', 'string']).columns
+            step = EncodeStep(columns, method)
+            df_encoded = step.fit_transform(df_encoded)
 
             logger.info(f"Categorical features encoded using method: {method}")
-            return df_encoded
+            return (df_encoded, step) if return_step else df_encoded
         except Exception as e:
             logger.error(f"Error in encoding features: {e}")
             st.error(f"Error in encoding features: {e}")
-            return df
+            return (df, None) if return_step else df
@@ -0,0 +1,179 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from sklearn.impute import KNNImputer
+from sklearn.neighbors import NearestNeighbors
+from modules.utils.logger import get_logger
+from configs.config import (
+    DEFAULT_RANDOM_STATE,
+    KNN_CHUNK_ROWS,
+    KNN_MAX_WORKERS,
+    KNN_PARALLEL_MIN_ROWS,
+    KNN_TREE_MAX_DIMENSIONS,
+)
+
+logger = get_logger(__name__)
+
+# Donor rows and column means of the imputer in use, sent once to each worker process
+_worker_state = {}
+
+def _init_worker(donors, means, n_neighbors):
+    _worker_state.clear()
+    _worker_state.update({'donors': donors, 'means': means, 'n_neighbors': n_neighbors, 'indexes': {}})
+
+def _neighbor_index(state, pattern):
+    """
+    Nearest neighbor index of the donors over the columns a missingness pattern observes, built once per pattern.
+    """
+    key = pattern.tobytes()
+    if key not in state['indexes']:
+        observed = ~pattern
+        algorithm = 'kd_tree' if observed.sum() <= KNN_TREE_MAX_DIMENSIONS else 'ball_tree'
+        n_neighbors = min(state['n_neighbors'], len(state['donors']))
+        state['indexes'][key] = NearestNeighbors(n_neighbors=n_neighbors, algorithm=algorithm).fit(state['donors'][:, observed])
+    return state['indexes'][key]
+
+def _impute_rows(state, pattern, values):
+    """
+    Impute the missing columns of rows sharing one missingness pattern.
+
+    Parameters:
+    - state: Dictionary with 'donors', 'means', 'n_neighbors' and a cache of 'indexes'
+    - pattern: Boolean array, True for the missing columns
+    - values: Observed values of the rows, one column per False entry of pattern
+
+    Returns:
+    - imputed: Array of the imputed values, one column per True entry of pattern
+    """
+    if pattern.all():
+        # Nothing to measure distances on, as in KNNImputer
+        return np.tile(state['means'][pattern], (len(values), 1))
+    neighbors = _neighbor_index(state, pattern).kneighbors(values, return_distance=False)
+    return state['donors'][:, pattern][neighbors].mean(axis=1)
+
+def _impute_rows_in_worker(task):
+    i, pattern, values = task
+    return i, _impute_rows(_worker_state, pattern, values)
+
+class ScalableKNNImputer:
+    """
+    K-nearest-neighbor imputation for large datasets.
+
+    Neighbors are searched among the complete rows (the donors), optionally a random
+    sample of them. Incomplete rows are grouped by which columns they miss; each group
+    queries a k-d tree or ball tree over the donors' values in the columns it observes,
+    and its missing values become the mean of its neighbors' values, as with
+    KNNImputer's uniform weights. Building and querying the trees costs about
+    O(n log n) instead of the O(n^2) distance matrix of KNNImputer.
+
+    Queries run in chunks, across a process pool on large inputs. Progress is logged
+    per chunk, and the statistics of the last transform are kept in stats_.
+    """
+
+    def __init__(self, n_neighbors=5, donor_sample=None, chunk_rows=KNN_CHUNK_ROWS, max_workers=KNN_MAX_WORKERS,
+                 random_state=DEFAULT_RANDOM_STATE):
+        """
+        Parameters:
+        - n_neighbors: Number of neighbors averaged per missing value
+        - donor_sample: Maximum number of complete rows used as donors; all of them if None
+        - chunk_rows: Incomplete rows queried per task
+        - max_workers: Maximum number of worker processes
+        - random_state: Seed of the donor sample
+        """
+        self.n_neighbors = n_neighbors
+        self.donor_sample = donor_sample
+        self.chunk_rows = chunk_rows
+        self.max_workers = max_workers
+        self.random_state = random_state
+        self.stats_ = None
+
+    def fit(self, X):
+        X = np.asarray(X, dtype='float64')
+        donors = X[~np.isnan(X).any(axis=1)]
+        if self.donor_sample and len(donors) > self.donor_sample:
+            rng = np.random.default_rng(self.random_state)
+            donors = donors[np.sort(rng.choice(len(donors), size=self.donor_sample, replace=False))]
+        self.donors_ = np.ascontiguousarray(donors)
+        self.means_ = np.nanmean(X, axis=0) if len(X) else np.full(X.shape[1], np.nan)
+        self.fallback_ = None
+        if len(self.donors_) < self.n_neighbors:
+            # Too few complete rows to search; KNNImputer can also use partly complete rows
+            logger.warning(f"Only {len(self.donors_)} complete rows, falling back to KNNImputer.")
+            self.fallback_ = KNNImputer(n_neighbors=self.n_neighbors).fit(X)
+        return self
+
+    def transform(self, X):
+        X = np.array(X, dtype='float64')
+        if self.fallback_ is not None:
+            return self.fallback_.transform(X)
+
+        start = time.perf_counter()
+        missing = np.isnan(X)
+        rows = np.flatnonzero(missing.any(axis=1))
+        patterns, inverse = np.unique(missing[rows], axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(patterns) + 1))
+
+        tasks = []
+        for p, pattern in enumerate(patterns):
+            group = rows[order[bounds[p]:bounds[p + 1]]]
+            for chunk_start in range(0, len(group), self.chunk_rows):
+                chunk = group[chunk_start:chunk_start + self.chunk_rows]
+                tasks.append((chunk, pattern))
+
+        def task_values(i):
+            chunk, pattern = tasks[i]
+            return i, pattern, X[np.ix_(chunk, ~pattern)]
+
+        workers = max(1, min(len(tasks), self.max_workers or 1))
+        # Inside a worker process, e.g. of the batch pipeline, the cores are already in use
+        in_worker = multiprocessing.parent_process() is not None
+        done = 0
+        if workers > 1 and len(rows) >= KNN_PARALLEL_MIN_ROWS and not in_worker:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(self.donors_, self.means_, self.n_neighbors)
+            ) as executor:
+                futures = [executor.submit(_impute_rows_in_worker, task_values(i)) for i in range(len(tasks))]
+                for future in as_completed(futures):
+                    i, imputed = future.result()
+                    chunk, pattern = tasks[i]
+                    X[np.ix_(chunk, pattern)] = imputed
+                    done += 1
+                    logger.info(f"KNN imputation: {done} of {len(tasks)} chunks done.")
+        else:
+            workers = 1
+            state = {'donors': self.donors_, 'means': self.means_, 'n_neighbors': self.n_neighbors, 'indexes': {}}
+            for i in range(len(tasks)):
+                _, pattern, values = task_values(i)
+                X[np.ix_(tasks[i][0], pattern)] = _impute_rows(state, pattern, values)
+                done += 1
+                logger.info(f"KNN imputation: {done} of {len(tasks)} chunks done.")
+
+        seconds = time.perf_counter() - start
+        # The input copy, plus per worker the donors, one tree over them and one chunk of queries
+        largest_chunk = max((len(chunk) for chunk, _ in tasks), default=0)
+        peak_bytes = X.nbytes + missing.nbytes + workers * (
+            2 * self.donors_.nbytes + largest_chunk * X.shape[1] * (8 + 8 * self.n_neighbors)
+        )
+        self.stats_ = {
+            'rows': len(X),
+            'imputed_rows': len(rows),
+            'patterns': len(patterns),
+            'donors': len(self.donors_),
+            'chunks': len(tasks),
+            'workers': workers,
+            'seconds': seconds,
+            'rows_per_sec': (len(rows) / seconds) if seconds > 0 else float('inf'),
+            'peak_memory_mb': peak_bytes / (1024 ** 2),
+        }
+        logger.info(
+            f"KNN imputation: {len(rows)} of {len(X)} rows imputed from {len(self.donors_)} donors "
+            f"({len(patterns)} missingness patterns, {workers} workers) in {seconds:.2f}s, "
+            f"peak memory ~{self.stats_['peak_memory_mb']:.1f} MB."
+        )
+        return X
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
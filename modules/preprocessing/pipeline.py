@@ -0,0 +1,548 @@
+import argparse
+import io
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from sklearn.experimental import enable_iterative_imputer  # noqa: F401
+from sklearn.impute import IterativeImputer, KNNImputer, SimpleImputer
+from sklearn.preprocessing import MaxAbsScaler, MinMaxScaler, OneHotEncoder, RobustScaler, StandardScaler
+from modules.data_access.csv_reader import open_source, source_name
+from modules.preprocessing.knn_imputation import ScalableKNNImputer
+from modules.utils.logger import get_logger
+from modules.utils.row_hashes import RowHashIndex, duplicate_mask
+from configs.config import KNN_EXACT_MAX_ROWS, PIPELINE_CHUNK_ROWS, PIPELINE_MAX_WORKERS
+
+logger = get_logger(__name__)
+
+NUMERIC_IMPUTATION = ['mean', 'median', 'knn', 'iterative']
+CATEGORICAL_IMPUTATION = ['most_frequent', 'constant']
+ENCODING_METHODS = ['label', 'onehot']
+SCALERS = {'standard': StandardScaler, 'minmax': MinMaxScaler, 'robust': RobustScaler, 'maxabs': MaxAbsScaler}
+
+def _numeric_columns(df, columns):
+    return [col for col in columns if is_numeric_dtype(df[col].dtype)]
+
+def _categorical_columns(df, columns):
+    categorical = set(df[columns].select_dtypes(include=['object', 'category', 'string']).columns)
+    return [col for col in columns if col in categorical]
+
+class PipelineStep:
+    """
+    A preprocessing step that is fitted once and can then be applied to new data.
+
+    Column steps transform values row by row. Row steps (filters_rows = True) select
+    rows with row_mask() instead; transform() applies that selection.
+    """
+    name = None
+    filters_rows = False
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+
+    def params(self):
+        return {}
+
+    def fit(self, df):
+        return self
+
+    def transform(self, df):
+        return df[self.row_mask(df)] if self.filters_rows else df
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def describe(self):
+        """
+        Step name, columns and parameters for display.
+        """
+        params = ', '.join(f"{key}={value}" for key, value in self.params().items())
+        return {'step': self.name, 'columns': ', '.join(map(str, self.columns)), 'params': params}
+
+class ImputeStep(PipelineStep):
+    """
+    Fill missing values with imputers fitted on the training data.
+
+    Numeric strategies impute the numeric columns and categorical strategies the
+    categorical columns, as in DataCleaner.handle_missing_values. The knn strategy uses
+    KNNImputer up to KNN_EXACT_MAX_ROWS rows. On larger data it searches neighbors among
+    the complete rows only, or a sample of donor_sample of them, which scales but can
+    give different values than KNNImputer.
+    """
+    name = 'impute'
+
+    def __init__(self, columns, strategy, fill_value=None, donor_sample=None):
+        super().__init__(columns)
+        self.strategy = strategy
+        self.fill_value = fill_value
+        self.donor_sample = donor_sample
+        self.imputed_columns = []
+        self.imputer = None
+
+    def params(self):
+        params = {'strategy': self.strategy, 'fill_value': self.fill_value}
+        if self.strategy == 'knn':
+            params['donor_sample'] = self.donor_sample
+        return params
+
+    def fit(self, df):
+        if self.strategy in NUMERIC_IMPUTATION:
+            self.imputed_columns = _numeric_columns(df, self.columns)
+            if self.strategy == 'knn':
+                if len(df) <= KNN_EXACT_MAX_ROWS:
+                    self.imputer = KNNImputer()
+                else:
+                    self.imputer = ScalableKNNImputer(donor_sample=self.donor_sample)
+            elif self.strategy == 'iterative':
+                self.imputer = IterativeImputer()
+            else:
+                self.imputer = SimpleImputer(strategy=self.strategy)
+        elif self.strategy in CATEGORICAL_IMPUTATION:
+            self.imputed_columns = _categorical_columns(df, self.columns)
+            self.imputer = SimpleImputer(strategy=self.strategy, fill_value=self.fill_value)
+        else:
+            raise ValueError(f"Unsupported imputation strategy: {self.strategy}")
+        if self.imputed_columns:
+            self.imputer.fit(df[self.imputed_columns])
+        return self
+
+    def transform(self, df):
+        if self.imputed_columns and len(df):
+            df[self.imputed_columns] = self.imputer.transform(df[self.imputed_columns])
+        return df
+
+class DeduplicateStep(PipelineStep):
+    """
+    Drop rows that repeat an earlier row over the given columns.
+    """
+    name = 'deduplicate'
+    filters_rows = True
+
+    def row_mask(self, df):
+        return ~duplicate_mask(df, self.columns)
+
+class OutlierStep(PipelineStep):
+    """
+    Detect outliers with per-column bounds fitted on the training data.
+
+    - zscore: values at least threshold standard deviations from the mean
+    - iqr: values more than threshold IQRs outside the quartiles
+    - quantile: values outside the (lower, upper) quantiles given as threshold
+
+    Missing values are never outliers. With action 'drop' rows holding an outlier are
+    removed; with 'mask' all selected columns of those rows are set to missing.
+    """
+    name = 'outliers'
+
+    def __init__(self, columns, method, threshold, action='drop'):
+        super().__init__(columns)
+        self.method = method
+        self.threshold = threshold
+        self.action = action
+        self.filters_rows = action == 'drop'
+        self.bounds = None
+
+    def params(self):
+        return {'method': self.method, 'threshold': self.threshold, 'action': self.action}
+
+    def fit(self, df):
+        numeric = df[_numeric_columns(df, self.columns)]
+        if self.method == 'zscore':
+            mean, std = numeric.mean(), numeric.std(ddof=0)
+            low, high = mean - self.threshold * std, mean + self.threshold * std
+        elif self.method in ('iqr', 'quantile'):
+            q = [0.25, 0.75] if self.method == 'iqr' else list(self.threshold)
+            quantiles = numeric.quantile(q)
+            low, high = quantiles.iloc[0], quantiles.iloc[1]
+            if self.method == 'iqr':
+                iqr = high - low
+                low, high = low - self.threshold * iqr, high + self.threshold * iqr
+        else:
+            raise ValueError(f"Unsupported outlier detection method: {self.method}")
+        self.bounds = pd.DataFrame({'low': low, 'high': high})
+        return self
+
+    def outlier_rows(self, df):
+        values = df[list(self.bounds.index)].to_numpy(dtype='float64', na_value=np.nan)
+        low, high = self.bounds['low'].to_numpy(), self.bounds['high'].to_numpy()
+        if self.method == 'zscore':
+            # Matches |z| < threshold being kept
+            outside = (values <= low) | (values >= high)
+        else:
+            outside = (values < low) | (values > high)
+        return outside.any(axis=1)
+
+    def row_mask(self, df):
+        return ~self.outlier_rows(df)
+
+    def transform(self, df):
+        if self.action == 'drop':
+            return df[self.row_mask(df)]
+        df.loc[self.outlier_rows(df), self.columns] = np.nan
+        return df
+
+class ScaleStep(PipelineStep):
+    """
+    Scale numeric columns with a scaler fitted on the training data.
+    """
+    name = 'scale'
+
+    def __init__(self, columns, method):
+        super().__init__(columns)
+        self.method = method
+        self.scaled_columns = []
+        self.scaler = None
+
+    def params(self):
+        return {'method': self.method}
+
+    def fit(self, df):
+        if self.method not in SCALERS:
+            raise ValueError(f"Unsupported scaling method: {self.method}")
+        self.scaled_columns = _numeric_columns(df, self.columns)
+        self.scaler = SCALERS[self.method]()
+        if self.scaled_columns:
+            self.scaler.fit(df[self.scaled_columns])
+        return self
+
+    def transform(self, df):
+        if self.scaled_columns and len(df):
+            df[self.scaled_columns] = self.scaler.transform(df[self.scaled_columns])
+        return df
+
+class EncodeStep(PipelineStep):
+    """
+    Encode categorical columns with categories learned from the training data.
+
+    Label encoding maps values to the position of their text among the sorted
+    training values, like LabelEncoder; unseen values become -1. One-hot encoding
+    drops the first category and ignores unseen values.
+    """
+    name = 'encode'
+
+    def __init__(self, columns, method):
+        super().__init__(columns)
+        self.method = method
+        self.encoded_columns = []
+        self.classes = {}
+        self.encoder = None
+
+    def params(self):
+        return {'method': self.method}
+
+    def fit(self, df):
+        self.encoded_columns = _categorical_columns(df, self.columns)
+        if self.method == 'label':
+            self.classes = {col: np.unique(df[col].astype(str).to_numpy()) for col in self.encoded_columns}
+        elif self.method == 'onehot':
+            self.encoder = OneHotEncoder(sparse_output=False, drop='first', handle_unknown='ignore')
+            if self.encoded_columns:
+                self.encoder.fit(df[self.encoded_columns].astype(str))
+        else:
+            raise ValueError(f"Unsupported encoding method: {self.method}")
+        return self
+
+    def transform(self, df):
+        if not self.encoded_columns:
+            return df
+        if self.method == 'label':
+            for col in self.encoded_columns:
+                df[col] = pd.Categorical(df[col].astype(str), categories=self.classes[col]).codes.astype(np.int64)
+            return df
+        encoded = pd.DataFrame(
+            self.encoder.transform(df[self.encoded_columns].astype(str)),
+            columns=self.encoder.get_feature_names_out(self.encoded_columns),
+            index=df.index,
+        )
+        return df.drop(columns=self.encoded_columns).join(encoded)
+
+# Pipeline used by the batch worker processes, shipped once per worker
+_worker_pipeline = None
+
+def _init_worker(pipeline):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+def _transform_chunk(chunk):
+    return _worker_pipeline.transform_chunk(chunk)
+
+class _SeenHashes:
+    """
+    Set of 64-bit row hashes kept as sorted runs of at least doubling size.
+
+    New hashes form a run that is merged with smaller or equal runs before it, as in a
+    log-structured merge tree, so adding n hashes costs O(n log n) in total and lookups
+    search at most log2(n) runs, at 8 bytes per hash.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes):
+        run = np.sort(hashes)
+        while self.runs and len(self.runs[-1]) <= len(run):
+            # Both runs are sorted, which the stable sort merges in linear time
+            run = np.sort(np.concatenate([self.runs.pop(), run]), kind='stable')
+        if len(run):
+            self.runs.append(run)
+
+def _fitted_numeric_dtype(dtype):
+    """
+    Nullable dtype of the width a numeric column was fitted with, and the widest dtype of its kind to read it as.
+
+    Returns:
+    - dtypes: Tuple (fitted, read), or None for columns read as their fitted dtype
+    """
+    if dtype.kind in 'iu':
+        fitted = dtype.name.replace('uint', 'UInt').replace('int', 'Int')
+        # Int64 holds every narrower unsigned value as well as negative ones
+        read = 'UInt64' if dtype.kind == 'u' and dtype.itemsize == 8 else 'Int64'
+        return fitted, read
+    if dtype.kind == 'f' and dtype.itemsize < 8:
+        return dtype, 'float64' if isinstance(dtype, np.dtype) else 'Float64'
+    return None
+
+def _csv_dtypes(input_dtypes):
+    """
+    Arguments of pd.read_csv that parse every chunk with the dtypes the pipeline was fitted on.
+
+    Integer and boolean columns are read as their nullable counterparts, so a chunk with
+    a missing value keeps the same dtype, categorical columns keep the categories found
+    in each chunk, and datetimes are parsed as dates. Integers and floats are read at
+    64 bits, since narrower dtypes would wrap values out of their range; _fitted_chunk
+    narrows them back.
+
+    Returns:
+    - kwargs: Dictionary with 'dtype' and 'parse_dates'
+    """
+    dtypes, dates = {}, []
+    for col, dtype in input_dtypes.items():
+        dtype = pd.api.types.pandas_dtype(dtype)
+        numeric = _fitted_numeric_dtype(dtype)
+        if dtype.kind == 'M':
+            dates.append(col)
+        elif numeric is not None:
+            dtypes[col] = numeric[1]
+        elif dtype.kind == 'b' and isinstance(dtype, np.dtype):
+            dtypes[col] = 'boolean'
+        elif isinstance(dtype, pd.CategoricalDtype):
+            # Values outside the fitted categories must not turn into missing values
+            dtypes[col] = 'category'
+        else:
+            dtypes[col] = dtype
+    return {'dtype': dtypes, 'parse_dates': dates}
+
+def _fitted_chunk(chunk, input_dtypes):
+    """
+    Narrow the numeric columns of a chunk read with _csv_dtypes to their fitted widths.
+
+    A column holding values outside the range of its fitted dtype keeps the 64-bit dtype
+    it was read as, rather than having them wrapped or overflowed.
+    """
+    for col, dtype in input_dtypes.items():
+        numeric = _fitted_numeric_dtype(pd.api.types.pandas_dtype(dtype))
+        if numeric is None or col not in chunk.columns:
+            continue
+        fitted = pd.api.types.pandas_dtype(numeric[0])
+        numpy_dtype = getattr(fitted, 'numpy_dtype', fitted)
+        limits = np.iinfo(numpy_dtype) if fitted.kind in 'iu' else np.finfo(numpy_dtype)
+        values = chunk[col].dropna()
+        if fitted.kind == 'f':
+            values = values[np.isfinite(values)]
+        if len(values) and (values.min() < limits.min or values.max() > limits.max):
+            logger.warning(f"Column '{col}' has values outside the range of {fitted}; keeping it as {chunk[col].dtype}.")
+            continue
+        chunk[col] = chunk[col].astype(fitted)
+    return chunk
+
+class PreprocessingPipeline:
+    """
+    Ordered preprocessing steps with their fitted parameters.
+
+    A pipeline records the steps chosen in the preprocessing page. It can be saved,
+    loaded without a browser session and applied to new data, in memory or as a
+    chunked batch job across processes, without refitting anything.
+    """
+
+    def __init__(self, steps=None, input_dtypes=None):
+        """
+        Parameters:
+        - steps: Fitted steps in order
+        - input_dtypes: Dtypes of the columns the steps were fitted on, used to parse batch inputs
+        """
+        self.steps = list(steps or [])
+        self.input_dtypes = dict(input_dtypes or {})
+
+    def add(self, step):
+        self.steps.append(step)
+        return self
+
+    def __len__(self):
+        return len(self.steps)
+
+    def describe(self):
+        """
+        Steps as a table for display.
+        """
+        return pd.DataFrame([step.describe() for step in self.steps], columns=['step', 'columns', 'params'])
+
+    def transform(self, df):
+        """
+        Apply all steps to a DataFrame in memory.
+        """
+        df = df.copy()
+        for step in self.steps:
+            df = step.transform(df)
+        return df
+
+    def transform_chunk(self, chunk):
+        """
+        Apply all steps to one chunk of a larger dataset.
+
+        Row selection is deferred so the caller can combine it across chunks: each row
+        step contributes either a row mask or, for duplicate removal, the row hashes
+        over its columns at that point of the pipeline.
+
+        Returns:
+        - chunk: Chunk with all column steps applied to every row
+        - selections: List of ('mask', array) and ('hashes', array) in step order
+        """
+        selections = []
+        for step in self.steps:
+            if isinstance(step, DeduplicateStep):
+                selections.append(('hashes', RowHashIndex.build(chunk[step.columns]).hashes))
+            elif step.filters_rows:
+                selections.append(('mask', step.row_mask(chunk)))
+            else:
+                chunk = step.transform(chunk)
+        return chunk, selections
+
+    def transform_chunks(self, chunks, max_workers=PIPELINE_MAX_WORKERS):
+        """
+        Apply all steps to a stream of chunks, in order, with a pool of worker processes.
+
+        At most two chunks per worker are in flight, so memory stays bounded however
+        long the stream is. Duplicate rows are removed across chunks by their 64-bit
+        row hashes.
+
+        Parameters:
+        - chunks: Iterable of DataFrames, e.g. pd.read_csv(..., chunksize=n)
+        - max_workers: Number of worker processes; chunks are processed in this process if 1
+
+        Yields:
+        - chunk: Transformed chunk
+        """
+        seen = {}
+
+        def select(chunk, selections):
+            keep = np.ones(len(chunk), dtype=bool)
+            for i, (kind, values) in enumerate(selections):
+                if kind == 'mask':
+                    keep &= values
+                    continue
+                # Rows removed by earlier steps never count as first occurrences
+                candidates = np.flatnonzero(keep)
+                hashes = values[candidates]
+                repeated = pd.Series(hashes).duplicated().to_numpy()
+                seen_hashes = seen.setdefault(i, _SeenHashes())
+                repeated = repeated | seen_hashes.contains(hashes)
+                keep[candidates[repeated]] = False
+                seen_hashes.add(hashes[~repeated])
+            return chunk[keep]
+
+        if max_workers <= 1:
+            for chunk in chunks:
+                yield select(*self.transform_chunk(chunk))
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self,)) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_transform_chunk, chunk))
+                if len(pending) >= 2 * max_workers:
+                    yield select(*pending.popleft().result())
+            while pending:
+                yield select(*pending.popleft().result())
+
+    def transform_csv(self, source, destination, chunk_rows=PIPELINE_CHUNK_ROWS, max_workers=PIPELINE_MAX_WORKERS):
+        """
+        Transform a CSV file chunk by chunk into a new CSV file.
+
+        Columns are parsed with the pipeline's input dtypes rather than inferred per chunk,
+        so equal rows hash alike in every chunk.
+
+        Parameters:
+        - source: Path to the input CSV file or a seekable binary buffer
+        - destination: Path of the output CSV file
+        - chunk_rows: Rows read per chunk
+        - max_workers: Number of worker processes
+
+        Returns:
+        - stats: Dictionary with 'rows_in', 'rows_out', 'chunks', 'seconds' and 'rows_per_sec'
+        """
+        start = time.perf_counter()
+        stats = {'rows_in': 0, 'rows_out': 0, 'chunks': 0}
+
+        def counted(reader):
+            for chunk in reader:
+                stats['rows_in'] += len(chunk)
+                yield _fitted_chunk(chunk, self.input_dtypes)
+
+        with open_source(source) as f, pd.read_csv(f, chunksize=chunk_rows, **_csv_dtypes(self.input_dtypes)) as reader:
+            for chunk in self.transform_chunks(counted(reader), max_workers=max_workers):
+                chunk.to_csv(destination, mode='w' if stats['chunks'] == 0 else 'a', header=stats['chunks'] == 0, index=False)
+                stats['rows_out'] += len(chunk)
+                stats['chunks'] += 1
+                logger.info(f"Transformed chunk {stats['chunks']} of '{source_name(source)}' ({stats['rows_in']} rows read).")
+
+        stats['seconds'] = time.perf_counter() - start
+        stats['rows_per_sec'] = stats['rows_in'] / stats['seconds'] if stats['seconds'] > 0 else float('inf')
+        logger.info(
+            f"Transformed '{source_name(source)}': {stats['rows_in']} rows in, {stats['rows_out']} rows out "
+            f"in {stats['chunks']} chunks, {stats['rows_per_sec']:.0f} rows/sec."
+        )
+        return stats
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        joblib.dump(self, buffer)
+        return buffer.getvalue()
+
+    @staticmethod
+    def from_bytes(data):
+        return joblib.load(io.BytesIO(data))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply an exported preprocessing pipeline to a CSV file.")
+    parser.add_argument('pipeline', help="Exported pipeline file.")
+    parser.add_argument('source', help="Input CSV file.")
+    parser.add_argument('destination', help="Output CSV file.")
+    parser.add_argument('--chunk-rows', type=int, default=PIPELINE_CHUNK_ROWS, help="Rows read per chunk.")
+    parser.add_argument('--workers', type=int, default=PIPELINE_MAX_WORKERS, help="Number of worker processes.")
+    args = parser.parse_args(argv)
+
+    pipeline = PreprocessingPipeline.load(args.pipeline)
+    stats = pipeline.transform_csv(args.source, args.destination, chunk_rows=args.chunk_rows, max_workers=args.workers)
+    print(f"Wrote {stats['rows_out']} of {stats['rows_in']} rows to {args.destination} in {stats['seconds']:.1f}s.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,5 @@
 import streamlit as st
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler, MaxAbsScaler
+from modules.preprocessing.pipeline import SCALERS, ScaleStep
 from modules.utils.logger import get_logger
 import seaborn as sns
 import matplotlib.pyplot as plt
@@ -8,41 +8,31 @@ logger = get_logger(__name__)
 
 class Scaler:
     @staticmethod
-    def scale_features(df, method='standard'):
+    def scale_features(df, method='standard', return_step=False):
         """
         Scale numerical features in the DataFrame.
 
         Parameters:
         - df: Pandas DataFrame
-        - method: Scaling method ('standard', 'minmax', 'robust')
+        - method: Scaling method ('standard', 'minmax', 'robust', 'maxabs')
+        - return_step: Also return the fitted ScaleStep
 
         Returns:
         - df_scaled: DataFrame with scaled features
         """
         try:
-            numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
-            scaler = None
-
-            if method == 'maxabs':
-                scaler = MaxAbsScaler()
-
-            if method == 'standard':
-                scaler = StandardScaler()
-            elif method == 'minmax':
-                scaler = MinMaxScaler()
-            elif method == 'robust':
-                scaler = RobustScaler()
-            else:
+            if method not in SCALERS:
                 st.error("Unsupported scaling method.")
-                return df
+                return (df, None) if return_step else df
 
-            df[numeric_cols] = scaler.fit_transform(df[numeric_cols])
+            step = ScaleStep(df.select_dtypes(include='number').columns, method)
+            df = step.fit_transform(df)
             logger.info(f"Features scaled using method: {method}")
-            return df
+            return (df, step) if return_step else df
         except Exception as e:
             logger.error(f"Error in scaling features: {e}")
             st.error(f"Error in scaling features: {e}")
-            return df
+            return (df, None) if return_step else df
         
     @staticmethod
     def visualize_distributions(df):
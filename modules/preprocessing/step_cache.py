@@ -0,0 +1,155 @@
+import os
+import threading
+from collections import OrderedDict
+import joblib
+from modules.utils.fingerprint import register_fingerprint, step_version
+from modules.utils.logger import get_logger
+from configs.config import STEP_CACHE_DIRECTORY, STEP_CACHE_DISK_BYTES, STEP_CACHE_MEMORY_BYTES
+
+logger = get_logger(__name__)
+
+SPILL_EXTENSION = '.joblib'
+
+def _result_bytes(result):
+    df = result[0]
+    try:
+        return int(df.memory_usage(deep=True).sum())
+    except Exception:
+        return 0
+
+class StepCache:
+    """
+    Outputs of preprocessing steps keyed by version id.
+
+    Recently used outputs stay in memory up to a byte budget. Older ones are spilled
+    to disk instead of being dropped, and the spill directory is itself bounded by
+    evicting the least recently used files.
+    """
+
+    def __init__(self, directory=STEP_CACHE_DIRECTORY, memory_bytes=STEP_CACHE_MEMORY_BYTES, disk_bytes=STEP_CACHE_DISK_BYTES):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, version):
+        return os.path.join(self.directory, f"{version}{SPILL_EXTENSION}")
+
+    def get(self, version):
+        """
+        Look up a step output in memory, then on disk.
+
+        Returns:
+        - result: The cached output, or None if the version is not cached
+        """
+        with self._lock:
+            if version in self._entries:
+                self._entries.move_to_end(version)
+                return self._entries[version][0]
+
+        path = self._path(version)
+        if not os.path.exists(path):
+            return None
+        try:
+            result = joblib.load(path)
+            # Mark the file as recently used for eviction
+            os.utime(path)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable step cache entry '{version}': {e}")
+            self._remove(path)
+            return None
+        logger.info(f"Loaded step output '{version}' from disk.")
+        self.put(version, result)
+        return result
+
+    def put(self, version, result):
+        """
+        Cache a step output, spilling the least recently used ones beyond the memory budget.
+        """
+        spilled = []
+        with self._lock:
+            self._entries[version] = (result, _result_bytes(result))
+            self._entries.move_to_end(version)
+            total = sum(size for _, size in self._entries.values())
+            while len(self._entries) > 1 and total > self.memory_bytes:
+                old_version, (old_result, size) = self._entries.popitem(last=False)
+                spilled.append((old_version, old_result))
+                total -= size
+        for old_version, old_result in spilled:
+            self._spill(old_version, old_result)
+        if spilled:
+            self._evict_disk()
+
+    def _spill(self, version, result):
+        path = self._path(version)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            joblib.dump(result, tmp_path)
+            os.replace(tmp_path, path)
+            logger.info(f"Spilled step output '{version}' to disk.")
+        except Exception as e:
+            logger.warning(f"Could not spill step output '{version}': {e}")
+            self._remove(tmp_path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SPILL_EXTENSION):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            self._remove(os.path.join(self.directory, name))
+            total -= size
+
+# Step outputs shared by all sessions
+_step_cache = StepCache()
+
+def run_step(parent_version, parent, name, params, compute):
+    """
+    Run a preprocessing step as a node of a version DAG, reusing its cached output.
+
+    The output is cached under step_version(parent_version, name, params), so the key
+    costs one small hash however large the data is. Re-running a pipeline after a
+    change to a later step finds every earlier output without hashing or computing
+    anything. Outputs for which compute returns no step, i.e. the step changed nothing,
+    are not cached, so the step's messages are shown again on the next run. The output
+    is registered under its version, so fingerprinting it, e.g. for duplicate detection,
+    costs nothing either.
+
+    Parameters:
+    - parent_version: Version id of the input, e.g. a dataset fingerprint or an earlier step's version.
+                      Outputs outlive the process on disk, so it must identify the input data exactly.
+    - parent: Input DataFrame; compute must not modify it
+    - name: Name of the step
+    - params: Step parameters with a stable repr()
+    - compute: Function of the input returning (output DataFrame, fitted step or None)
+
+    Returns:
+    - output: Output DataFrame; treat it as read-only since it is shared through the cache
+    - step: Fitted step, or None if the step changed nothing
+    - version: Version id of the output
+    """
+    version = step_version(parent_version, name, params)
+    cached = _step_cache.get(version)
+    if cached is not None:
+        output, step = cached
+        return register_fingerprint(output, version), step, version
+
+    output, step = compute(parent)
+    if step is None:
+        return register_fingerprint(output, parent_version), None, parent_version
+    _step_cache.put(version, (output, step))
+    return register_fingerprint(output, version), step, version
@@ -3,8 +3,13 @@ import streamlit as st
 from modules.preprocessing.data_cleaning import DataCleaner
 from modules.preprocessing.scaling import Scaler
 from modules.preprocessing.encoding import Encoder
+from modules.preprocessing.pipeline import PreprocessingPipeline
+from modules.preprocessing.step_cache import run_step
+from modules.utils.fingerprint import dataset_fingerprint, register_fingerprint, step_version
 from modules.utils.logger import get_logger
+from modules.utils.row_hashes import update_row_hash_index
 from modules.services.dvc_service import DVCService
+from configs.config import KNN_EXACT_MAX_ROWS
 
 logger = get_logger(__name__)
 
@@ -25,6 +30,10 @@ class PreprocessingService:
         # Initialize session state for df_processed and df_selected if not already set
         if 'df_processed' not in st.session_state:
             st.session_state['df_processed'] = df.copy()
+        if 'df_processed_version' not in st.session_state:
+            # Hash the loaded data in full once; step outputs cached under versions chained
+            # from it are also kept on disk, so the root must identify the data exactly
+            st.session_state['df_processed_version'] = dataset_fingerprint(st.session_state['df_processed'])
 
         df_processed = st.session_state['df_processed']
 
@@ -34,19 +43,22 @@ class PreprocessingService:
         selected_columns = st.multiselect(
             "Select Columns to Include in Preprocessing", 
             all_columns, 
-            default=all_columns,
-            on_change=lambda: st.session_state.update({'df_selected': df_processed[selected_columns]})
+            default=all_columns
         )
 
         if not selected_columns:
             st.warning("Please select at least one column to proceed.")
             return df_processed
 
-        # Work with session state for df_selected
-        if 'df_selected' not in st.session_state:
-            st.session_state['df_selected'] = df_processed[selected_columns]
-
-        df_selected = st.session_state['df_selected']
+        # Every run applies the enabled steps to the selected columns afresh, so the
+        # recorded pipeline always reproduces the data shown
+        df_selected = df_processed[selected_columns].copy()
+        st.session_state['df_selected'] = df_selected
+        pipeline = PreprocessingPipeline(input_dtypes=df_selected.dtypes.to_dict())
+        # Each step's output is cached under a version id chained from the loaded data's
+        # fingerprint, so unchanged earlier steps are reused without hashing their data again
+        version = step_version(st.session_state['df_processed_version'], 'select', tuple(selected_columns))
+        register_fingerprint(df_selected, version)
 
         # Initialize a flag to track if any preprocessing was performed
         preprocessing_performed = False
@@ -88,13 +100,48 @@ class PreprocessingService:
                     if strategy == 'constant':
                         fill_value = st.text_input("Enter the constant value to fill missing values with", value='unknown')
 
-                    # Use handle_missing_values from DataCleaner with caching to avoid re-running heavy logic
-                    df_selected[cols_to_impute] = DataCleaner.handle_missing_values(
-                        df_selected[cols_to_impute],
-                        strategy=strategy,
-                        fill_value=fill_value
+                    donor_sample = None
+                    if strategy == 'knn' and len(df_selected) > KNN_EXACT_MAX_ROWS:
+                        donor_sample = st.number_input(
+                            "Donor Pool Size",
+                            min_value=0,
+                            value=0,
+                            step=10_000,
+                            help=(
+                                f"Above {KNN_EXACT_MAX_ROWS:,} rows, neighbors are searched with trees among the "
+                                "complete rows only, so values can differ from scikit-learn's KNNImputer, which "
+                                "also uses rows missing other columns. Number of complete rows sampled as "
+                                "neighbor candidates; 0 uses all of them."
+                            )
+                        ) or None
+
+                    def impute(parent):
+                        data = parent.copy()
+                        data[cols_to_impute], step = DataCleaner.handle_missing_values(
+                            data[cols_to_impute],
+                            strategy=strategy,
+                            fill_value=fill_value,
+                            donor_sample=donor_sample,
+                            return_step=True
+                        )
+                        return data, step
+
+                    parent_version = version
+                    df_selected, step, version = run_step(
+                        version, df_selected, 'impute', (tuple(cols_to_impute), strategy, fill_value, donor_sample), impute
                     )
+                    # Only the imputed columns need rehashing for duplicate detection
+                    update_row_hash_index(parent_version, df_selected, cols_to_impute, version=version)
+                    if step is not None:
+                        pipeline.add(step)
                     st.success("Missing values imputed successfully.")
+                    stats = getattr(step.imputer, 'stats_', None) if step is not None else None
+                    if stats:
+                        st.caption(
+                            f"KNN imputation: {stats['imputed_rows']:,} of {stats['rows']:,} rows from "
+                            f"{stats['donors']:,} donors in {stats['seconds']:.2f}s "
+                            f"({stats['workers']} workers, peak memory ~{stats['peak_memory_mb']:.1f} MB)."
+                        )
                     preprocessing_performed = True
                     st.session_state['df_selected'] = df_selected
             else:
@@ -104,8 +151,16 @@ class PreprocessingService:
         st.header("Duplicate Rows Handling")
         remove_duplicates = st.checkbox("Remove Duplicate Rows?")
         if remove_duplicates:
+            duplicate_subset = st.multiselect(
+                "Columns to Compare for Duplicates", df_selected.columns.tolist(), default=df_selected.columns.tolist()
+            )
             before_shape = df_selected.shape
-            df_selected = DataCleaner.remove_duplicates(df_selected)
+            df_selected, step, version = run_step(
+                version, df_selected, 'deduplicate', (tuple(duplicate_subset),),
+                lambda parent: DataCleaner.remove_duplicates(parent, subset=duplicate_subset or None, return_step=True)
+            )
+            if step is not None:
+                pipeline.add(step)
             after_shape = df_selected.shape
             st.write(f"Duplicates removed. Data shape changed from {before_shape} to {after_shape}.")
             preprocessing_performed = True
@@ -115,7 +170,7 @@ class PreprocessingService:
         st.header("Outlier Handling")
         outlier_handling = st.checkbox("Handle Outliers?")
         if outlier_handling:
-            numeric_cols = df_selected.select_dtypes(include=['float64', 'int64']).columns.tolist()
+            numeric_cols = df_selected.select_dtypes(include='number').columns.tolist()
             if numeric_cols:
                 cols_to_handle_outliers = st.multiselect(
                     "Select Numerical Columns for Outlier Handling",
@@ -149,17 +204,31 @@ class PreprocessingService:
 
                     # Visualize outliers before handling
                     st.subheader("Outliers Before Handling")
-                    DataCleaner.visualize_outliers(df_selected[cols_to_handle_outliers])
+                    DataCleaner.visualize_outliers(df_selected[cols_to_handle_outliers], version=version)
+
+                    def handle_outliers(parent):
+                        data = parent.copy()
+                        # Outliers are set to missing values rather than dropping their rows
+                        data[cols_to_handle_outliers], step = DataCleaner.handle_outliers(
+                            data[cols_to_handle_outliers],
+                            method=method,
+                            threshold=threshold,
+                            action='mask',
+                            return_step=True
+                        )
+                        return data, step
 
-                    df_selected[cols_to_handle_outliers] = DataCleaner.handle_outliers(
-                        df_selected[cols_to_handle_outliers],
-                        method=method,
-                        threshold=threshold
+                    parent_version = version
+                    df_selected, step, version = run_step(
+                        version, df_selected, 'outliers', (tuple(cols_to_handle_outliers), method, threshold), handle_outliers
                     )
+                    update_row_hash_index(parent_version, df_selected, cols_to_handle_outliers, version=version)
+                    if step is not None:
+                        pipeline.add(step)
 
                     # Visualize outliers after handling
                     st.subheader("Outliers After Handling")
-                    DataCleaner.visualize_outliers(df_selected[cols_to_handle_outliers])
+                    DataCleaner.visualize_outliers(df_selected[cols_to_handle_outliers], version=version)
 
                     preprocessing_performed = True
                     st.session_state['df_selected'] = df_selected
@@ -172,7 +241,7 @@ class PreprocessingService:
         st.header("Feature Scaling")
         scaling = st.checkbox("Scale Features?")
         if scaling:
-            numeric_cols = df_selected.select_dtypes(include=['float64', 'int64']).columns.tolist()
+            numeric_cols = df_selected.select_dtypes(include='number').columns.tolist()
             if numeric_cols:
                 # Select Scaling Method
                 method = st.selectbox("Select Scaling Method", ['standard', 'minmax', 'robust', 'maxabs'])
@@ -185,10 +254,20 @@ class PreprocessingService:
                     Scaler.visualize_distributions(df_selected[cols_to_scale])
 
                     # Perform Scaling
-                    df_selected[cols_to_scale] = Scaler.scale_features(
-                        df_selected[cols_to_scale],
-                        method=method
-                    )
+                    def scale(parent):
+                        data = parent.copy()
+                        data[cols_to_scale], step = Scaler.scale_features(
+                            data[cols_to_scale],
+                            method=method,
+                            return_step=True
+                        )
+                        return data, step
+
+                    parent_version = version
+                    df_selected, step, version = run_step(version, df_selected, 'scale', (tuple(cols_to_scale), method), scale)
+                    update_row_hash_index(parent_version, df_selected, cols_to_scale, version=version)
+                    if step is not None:
+                        pipeline.add(step)
 
                     # Visualize distributions after scaling
                     st.subheader("Distributions After Scaling")
@@ -205,13 +284,18 @@ class PreprocessingService:
         st.header("Encoding Categorical Variables")
         encoding = st.checkbox("Encode Categorical Variables?")
         if encoding:
-            categorical_cols = df_selected.select_dtypes(include=['object', 'category']).columns.tolist()
+            categorical_cols = df_selected.select_dtypes(include=['object', 'category', 'string']).columns.tolist()
             if categorical_cols:
                 cols_to_encode = st.multiselect("Select Categorical Columns to Encode", categorical_cols)
                 if cols_to_encode:
                     encoding_methods = ['label', 'onehot', 'ordinal', 'binary']
                     method = st.selectbox("Select Encoding Method", encoding_methods)
-                    df_selected = Encoder.encode_features(df_selected, cols_to_encode, method=method)
+                    df_selected, step, version = run_step(
+                        version, df_selected, 'encode', (tuple(cols_to_encode), method),
+                        lambda parent: Encoder.encode_features(parent, cols_to_encode, method=method, return_step=True)
+                    )
+                    if step is not None:
+                        pipeline.add(step)
                     preprocessing_performed = True
                     st.session_state['df_selected'] = df_selected
                 else:
@@ -219,6 +303,25 @@ class PreprocessingService:
             else:
                 st.info("No categorical columns available for encoding.")
 
+        # Pipeline Export
+        st.header("Pipeline Export")
+        st.session_state['preprocessing_pipeline'] = pipeline
+        if len(pipeline):
+            st.write(pipeline.describe())
+            # The pipeline is determined by the version of its output, so it is only
+            # serialized again when a step changes
+            cached = st.session_state.get('preprocessing_pipeline_bytes')
+            if cached is None or cached[0] != version:
+                cached = (version, pipeline.to_bytes())
+                st.session_state['preprocessing_pipeline_bytes'] = cached
+            st.download_button("Download Pipeline", cached[1], file_name='preprocessing_pipeline.joblib')
+            st.caption(
+                "Apply an exported pipeline to new CSV files without refitting: "
+                "`python -m modules.preprocessing.pipeline preprocessing_pipeline.joblib input.csv output.csv`"
+            )
+        else:
+            st.info("Enable preprocessing steps to build an exportable pipeline.")
+
         # Add a button for the user to declare that preprocessing is complete
         finish_preprocessing = st.button("Finish Preprocessing")
 
@@ -0,0 +1,122 @@
+import hashlib
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from modules.data_access.dataset_handle import DatasetHandle
+
+# Fingerprints known without hashing, keyed by the id of the frame they belong to
+_registered = {}
+_registry_lock = threading.Lock()
+
+def register_fingerprint(df, fingerprint):
+    """
+    Record the fingerprint of a DataFrame or DatasetHandle so it is never hashed again.
+
+    Use it for loaded datasets, whose full fingerprint is computed once per load, and for
+    frames derived from a fingerprinted one, e.g. samples and filter results, whose
+    fingerprint is the step_version of the parent's. The frame must not be modified
+    afterwards. The record is dropped when the frame is garbage collected.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - fingerprint: Fingerprint identifying its contents
+
+    Returns:
+    - df: The same object
+    """
+    key = id(df)
+
+    def forget(_):
+        with _registry_lock:
+            if _registered.get(key, (None,))[0] is ref:
+                del _registered[key]
+
+    ref = weakref.ref(df, forget)
+    with _registry_lock:
+        _registered[key] = (ref, fingerprint)
+    return df
+
+def _registered_fingerprint(df):
+    with _registry_lock:
+        entry = _registered.get(id(df))
+    # A live reference to this very object rules out a reused id
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    return None
+
+def _hash_values(digest, values):
+    """
+    Feed every value of a Series or Index into a digest.
+    """
+    if isinstance(values, pd.RangeIndex):
+        digest.update(repr((values.start, values.stop, values.step)).encode())
+    elif isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biufcmM':
+        # Fixed-width values are hashed as raw bytes, which is much cheaper than hashing each value
+        digest.update(np.ascontiguousarray(values.to_numpy()).view(np.uint8))
+    elif isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes if isinstance(values, pd.Series) else values.codes
+        digest.update(np.ascontiguousarray(codes).view(np.uint8))
+        _hash_values(digest, values.dtype.categories)
+    else:
+        try:
+            hashed = pd.util.hash_pandas_object(values, index=False)
+        except TypeError:
+            # Unhashable cells such as lists from JSON are hashed by their text
+            hashed = pd.util.hash_pandas_object(values.astype(str), index=False)
+        digest.update(hashed.to_numpy().tobytes())
+
+def dataset_fingerprint(df):
+    """
+    Compute a fingerprint of a DataFrame or DatasetHandle for use as a cache key.
+
+    The shape, column names and dtypes are always hashed. DataFrames are hashed in full,
+    index included, column by column: fixed-width columns as their raw bytes, categorical
+    columns as their codes and categories, and other columns as one 64-bit hash per
+    value. Frames differing in any value or row therefore never share a key. Handles
+    point at immutable, content-addressed files and hash their path and row view.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+
+    Returns:
+    - fingerprint: Hex digest
+    """
+    fingerprint = _registered_fingerprint(df)
+    if fingerprint is not None:
+        return fingerprint
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode())
+
+    if isinstance(df, DatasetHandle):
+        digest.update(df.path.encode())
+        if df.rows is not None:
+            digest.update(np.ascontiguousarray(df.rows).tobytes())
+        return digest.hexdigest()
+
+    if len(df):
+        _hash_values(digest, df.index)
+        for col in range(df.shape[1]):
+            _hash_values(digest, df.iloc[:, col])
+    return digest.hexdigest()
+
+def step_version(parent_version, step, params):
+    """
+    Compute the version id of a processing step's output without reading any data.
+
+    The output of a deterministic step is identified by the version of its input, the
+    step name and its parameters, so versions chain from a dataset fingerprint through
+    every step applied to it.
+
+    Parameters:
+    - parent_version: Fingerprint of the input dataset or version id of the previous step
+    - step: Name of the step
+    - params: Step parameters with a stable repr(), e.g. a tuple of strings and numbers
+
+    Returns:
+    - version: Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((parent_version, step, params)).encode())
+    return digest.hexdigest()
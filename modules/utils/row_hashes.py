@@ -0,0 +1,243 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from pandas import CategoricalDtype
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_string_dtype
+from modules.data_access.dataset_handle import as_frame, take_rows
+from modules.utils.fingerprint import dataset_fingerprint
+from modules.utils.logger import get_logger
+from configs.config import NEAR_DUPLICATE_CHUNK_ROWS, ROW_HASH_CACHE_BYTES
+
+logger = get_logger(__name__)
+
+# Row hash indexes of recent dataset versions, keyed by fingerprint and bounded in bytes
+_index_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _hash_values(series):
+    try:
+        return pd.util.hash_pandas_object(series, index=False).to_numpy()
+    except TypeError:
+        # Unhashable cells such as lists from JSON are hashed by their text
+        return pd.util.hash_pandas_object(series.astype(str), index=False).to_numpy()
+
+def _column_weight(column):
+    """
+    Odd 64-bit multiplier derived from the column name.
+    """
+    return pd.util.hash_array(np.array([str(column)], dtype=object))[0] | np.uint64(1)
+
+def _combine(column_hashes, rows):
+    # A weighted sum modulo 2 ** 64: a column's contribution can be taken out again,
+    # and the result does not depend on the column order
+    hashes = np.zeros(rows, dtype=np.uint64)
+    for column, values in column_hashes.items():
+        hashes += values * _column_weight(column)
+    return hashes
+
+class RowHashIndex:
+    """
+    One 64-bit hash per row, combined from per-column hashes.
+
+    Row hashes answer duplicate queries with a single pass over one integer array
+    instead of hashing every column again. Keeping the column hashes lets duplicate
+    checks on a subset of columns reuse them, and lets a new dataset version that
+    only changed some columns be indexed by rehashing just those columns.
+    """
+
+    def __init__(self, column_hashes, rows, hashes=None):
+        self.column_hashes = column_hashes
+        self.rows = rows
+        self.hashes = _combine(column_hashes, rows) if hashes is None else hashes
+
+    @classmethod
+    def build(cls, df):
+        return cls({col: _hash_values(df[col]) for col in df.columns}, len(df))
+
+    @property
+    def nbytes(self):
+        return self.hashes.nbytes + sum(values.nbytes for values in self.column_hashes.values())
+
+    def updated(self, df, columns):
+        """
+        Index of a new version of the dataset in which only the given columns changed.
+
+        Parameters:
+        - df: New version with the same rows and columns
+        - columns: Columns whose values changed
+
+        Returns:
+        - index: New RowHashIndex; this index is left unchanged
+        """
+        column_hashes = dict(self.column_hashes)
+        hashes = self.hashes.copy()
+        for col in columns:
+            weight = _column_weight(col)
+            hashes -= column_hashes[col] * weight
+            column_hashes[col] = _hash_values(df[col])
+            hashes += column_hashes[col] * weight
+        return RowHashIndex(column_hashes, self.rows, hashes)
+
+    def row_hashes(self, columns=None):
+        """
+        Row hashes over all columns, or over a subset of them.
+        """
+        if columns is None or set(columns) == set(self.column_hashes):
+            return self.hashes
+        return _combine({col: self.column_hashes[col] for col in columns}, self.rows)
+
+def _equal_rows(df, columns, positions, others):
+    """
+    Whether the rows at positions hold the same values as the rows at others.
+    """
+    equal = np.ones(len(positions), dtype=bool)
+    for col in columns:
+        series = df[col]
+        if isinstance(series.dtype, CategoricalDtype):
+            # Equal codes mean equal values, missing ones included
+            codes = series.cat.codes.to_numpy()
+            equal &= codes[positions] == codes[others]
+            continue
+        values = series.to_numpy()
+        left, right = values[positions], values[others]
+        try:
+            same = np.asarray(left == right, dtype=bool)
+        except (TypeError, ValueError):
+            same = left.astype(str) == right.astype(str)
+        equal &= same | (pd.isna(left) & pd.isna(right))
+    return equal
+
+def get_row_hash_index(df, version=None):
+    """
+    Get the row hash index of a dataset, building it on first use.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - version: Fingerprint or version id of the dataset if the caller has one, so it is not recomputed
+
+    Returns:
+    - index: RowHashIndex
+    """
+    fingerprint = version or dataset_fingerprint(df)
+    with _cache_lock:
+        if fingerprint in _index_cache:
+            _index_cache.move_to_end(fingerprint)
+            return _index_cache[fingerprint]
+
+    index = RowHashIndex.build(df)
+    _store_index(fingerprint, index)
+    logger.info(f"Hashed {len(df)} rows over {len(df.columns)} columns.")
+    return index
+
+def _store_index(fingerprint, index):
+    with _cache_lock:
+        _index_cache[fingerprint] = index
+        while len(_index_cache) > 1 and sum(i.nbytes for i in _index_cache.values()) > ROW_HASH_CACHE_BYTES:
+            _index_cache.popitem(last=False)
+
+def update_row_hash_index(previous_version, df, columns, version=None):
+    """
+    Index a new version of a dataset from the index of its previous version.
+
+    Only the changed columns are rehashed. Nothing is done if the new version is already
+    indexed, the previous version was never indexed, or the new version changed its rows
+    or columns.
+
+    Parameters:
+    - previous_version: Fingerprint or version id of the dataset before the change
+    - df: Dataset after the change
+    - columns: Columns whose values changed
+    - version: Fingerprint or version id of the dataset after the change; computed from df if None
+    """
+    version = version or dataset_fingerprint(df)
+    with _cache_lock:
+        if version in _index_cache:
+            return
+        previous = _index_cache.get(previous_version)
+    if previous is None or previous.rows != len(df) or set(previous.column_hashes) != set(df.columns):
+        return
+    _store_index(version, previous.updated(df, columns))
+    logger.info(f"Updated the row hashes of {len(list(columns))} changed columns.")
+
+def duplicate_mask(df, subset=None, keep='first', version=None):
+    """
+    Mark duplicate rows, like DataFrame.duplicated(), from the dataset's row hash index.
+
+    Rows flagged by equal hashes are checked against the first row with the same hash,
+    so hash collisions never drop distinct rows.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - subset: Columns to compare; all columns if None
+    - keep: 'first', 'last' or False, as in DataFrame.duplicated()
+    - version: Fingerprint or version id of the dataset, as in get_row_hash_index
+
+    Returns:
+    - mask: Boolean NumPy array, True for duplicate rows
+    """
+    columns = list(df.columns) if subset is None else list(subset)
+    hashes = get_row_hash_index(df, version).row_hashes(columns)
+    repeated = pd.Series(hashes).duplicated(keep='first').to_numpy()
+    mask = repeated if keep == 'first' else pd.Series(hashes).duplicated(keep=keep).to_numpy()
+
+    positions = np.flatnonzero(mask)
+    if len(positions):
+        codes, _ = pd.factorize(hashes)
+        # Codes follow the order of first appearance, as do the rows not repeated before
+        first = np.flatnonzero(~repeated)
+        if not _equal_rows(df, columns, positions, first[codes[positions]]).all():
+            logger.warning("Row hash collision detected; falling back to an exact duplicate check.")
+            return as_frame(df, columns).duplicated(keep=keep).to_numpy()
+    return mask
+
+def _normalized(series, decimals):
+    """
+    Values of a column rounded or normalized for near-duplicate comparison.
+    """
+    dtype = series.dtype
+    if is_numeric_dtype(dtype) and not is_bool_dtype(dtype):
+        return series.round(decimals)
+    if isinstance(dtype, CategoricalDtype):
+        # Normalize the categories once instead of every value
+        categories = pd.Series(series.cat.categories).astype(str).str.casefold()
+        categories = categories.str.strip().str.replace(r'\s+', ' ', regex=True).to_numpy(dtype=object)
+        codes = series.cat.codes.to_numpy()
+        return pd.Series(np.where(codes >= 0, categories[codes], None), dtype=object)
+    if is_string_dtype(dtype):
+        return series.astype(str).where(series.notna()).str.casefold().str.strip().str.replace(r'\s+', ' ', regex=True)
+    return series
+
+def near_duplicate_groups(df, subset=None, decimals=2, chunk_rows=NEAR_DUPLICATE_CHUNK_ROWS):
+    """
+    Group rows that are equal after normalizing their values.
+
+    Numbers are rounded to the given decimals and text is compared case-insensitively
+    with whitespace collapsed. Rows are normalized and hashed one chunk at a time, so
+    memory stays bounded by a chunk plus one hash per row. Groups are found by hash
+    only and are not verified.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - subset: Columns to compare; all columns if None
+    - decimals: Decimals numbers are rounded to
+    - chunk_rows: Rows normalized at a time
+
+    Returns:
+    - groups: Series with a group number per row position, -1 for rows without a near duplicate
+    """
+    columns = list(df.columns) if subset is None else list(subset)
+    hashes = np.empty(len(df), dtype=np.uint64)
+    for start in range(0, len(df), chunk_rows):
+        positions = np.arange(start, min(start + chunk_rows, len(df)))
+        chunk = take_rows(df, positions, columns)
+        column_hashes = {col: _hash_values(_normalized(chunk[col], decimals)) for col in columns}
+        hashes[start:start + len(positions)] = _combine(column_hashes, len(positions))
+
+    codes, uniques = pd.factorize(hashes)
+    sizes = np.bincount(codes, minlength=len(uniques))
+    shared = sizes > 1
+    # Number the groups with more than one row consecutively
+    numbers = np.where(shared, np.cumsum(shared) - 1, -1)
+    logger.info(f"Found {int(shared.sum())} groups of near-duplicate rows among {len(df)} rows.")
+    return pd.Series(numbers[codes] if len(codes) else codes, name='group')
@@ -0,0 +1,313 @@
+import numpy as np
+import pandas as pd
+from pandas import CategoricalDtype
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from configs.config import (
+    DEFAULT_RANDOM_STATE,
+    SKETCH_CHUNK_ROWS,
+    SKETCH_FREQUENT_ITEMS,
+    SKETCH_HLL_PRECISION,
+    SKETCH_QUANTILE_K,
+)
+
+class QuantileSketch:
+    """
+    KLL quantile sketch.
+
+    Values are kept in levels of compactors; an item at level h stands for 2 ** h values.
+    When a level is over capacity it is sorted and every other item, starting at a random
+    offset, is promoted to the next level. Memory stays O(k) and sketches of any chunks
+    merge into one; at k=200 the normalized rank error is about 1.7%.
+    """
+
+    def __init__(self, k=SKETCH_QUANTILE_K, random_state=DEFAULT_RANDOM_STATE):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(random_state)
+
+    def _capacity(self, level):
+        # Lower levels get geometrically smaller capacities, as in KLL
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item stays behind so the promoted weight matches exactly
+                keep = items[:1] if len(items) % 2 else items[:0]
+                items = items[len(keep):]
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                # Capacities depend on the number of levels, so start over from the bottom
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values):
+        """
+        Add values; missing and infinite values are ignored.
+        """
+        values = np.asarray(values, dtype='float64')
+        values = values[np.isfinite(values)]
+        if len(values):
+            self.count += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one.
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """
+        Estimate quantiles.
+
+        Parameters:
+        - q: Quantile or list of quantiles between 0 and 1
+
+        Returns:
+        - estimate: Float or array of estimates; NaN for an empty sketch
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype='float64'))
+        if not self.count:
+            estimates = np.full(len(qs), np.nan)
+        else:
+            items = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self.levels)])
+            order = np.argsort(items, kind='stable')
+            items, cumulative = items[order], np.cumsum(weights[order])
+            positions = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+            estimates = items[np.minimum(positions, len(items) - 1)]
+        return estimates if np.ndim(q) else float(estimates[0])
+
+class DistinctCountSketch:
+    """
+    HyperLogLog distinct count sketch over 64-bit hashes of the values.
+
+    Uses 2 ** precision one-byte registers; the relative standard error is
+    1.04 / sqrt(2 ** precision), about 0.8% at precision 14.
+    """
+
+    def __init__(self, precision=SKETCH_HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, values):
+        """
+        Add values; missing values are ignored.
+        """
+        values = pd.Series(values).dropna()
+        if values.empty:
+            return self
+        try:
+            hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        except TypeError:
+            # Unhashable cells such as lists from JSON are hashed by their text
+            hashes = pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy()
+        suffix_bits = 64 - self.precision
+        buckets = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        # Position of the leftmost 1 bit in the suffix; the suffix fits a float64 exactly
+        bit_length = np.frexp(suffix.astype('float64'))[1]
+        ranks = (suffix_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+        return self
+
+    def merge(self, other):
+        """
+        Fold another sketch with the same precision into this one.
+        """
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        """
+        Estimate the number of distinct values.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype('float64'))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and empty:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / empty)
+        return int(round(estimate))
+
+class FrequentItemsSketch:
+    """
+    Misra-Gries summary of the most frequent values.
+
+    Each chunk is counted exactly and folded into at most `capacity` counters; when
+    there are more, the (capacity + 1)-th largest count is subtracted from all of them.
+    Counts are underestimated by at most total / (capacity + 1), and any value more
+    frequent than that is guaranteed to be kept.
+    """
+
+    def __init__(self, capacity=SKETCH_FREQUENT_ITEMS):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='float64')
+        self.total = 0
+        self.offset = 0.0
+
+    def _reduce(self):
+        if len(self.counts) > self.capacity:
+            threshold = self.counts.nlargest(self.capacity + 1).iloc[-1]
+            self.counts = self.counts - threshold
+            self.counts = self.counts[self.counts > 0]
+            self.offset += threshold
+
+    def update(self, values):
+        """
+        Add values; missing values are ignored.
+        """
+        counts = pd.Series(values).value_counts(dropna=True)
+        counts = counts[counts > 0]
+        self.total += int(counts.sum())
+        self.counts = self.counts.add(counts.astype('float64'), fill_value=0)
+        self._reduce()
+        return self
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one.
+        """
+        self.counts = self.counts.add(other.counts, fill_value=0)
+        self.total += other.total
+        self.offset += other.offset
+        self._reduce()
+        return self
+
+    @property
+    def max_error(self):
+        """
+        Upper bound on how much any count is underestimated.
+        """
+        return self.offset
+
+    def most_common(self, n=None):
+        """
+        Values with the largest estimated counts.
+
+        Returns:
+        - counts: Series of lower-bound counts, largest first
+        """
+        counts = self.counts.sort_values(ascending=False, kind='stable')
+        return (counts if n is None else counts.head(n)).round().astype(np.int64)
+
+class ColumnSketch:
+    """
+    Mergeable summary of one column: exact count, missing values and moments, plus
+    quantile, distinct count and frequent item sketches depending on the column kind.
+    """
+
+    def __init__(self, numeric):
+        self.numeric = numeric
+        self.rows = 0
+        self.missing = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.quantiles = QuantileSketch() if numeric else None
+        self.distinct = DistinctCountSketch()
+        self.frequent = None if numeric else FrequentItemsSketch()
+
+    def _merge_moments(self, count, mean, m2):
+        # Chan et al.'s parallel update of count, mean and sum of squared deviations
+        total = self.count + count
+        if total:
+            delta = mean - self.mean
+            self.m2 += m2 + delta ** 2 * self.count * count / total
+            self.mean += delta * count / total
+        self.count = total
+
+    def update(self, series):
+        """
+        Add a chunk of the column.
+        """
+        self.rows += len(series)
+        if self.numeric:
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+            valid = values[np.isfinite(values)]
+            self.missing += int(np.isnan(values).sum())
+            if len(valid):
+                self._merge_moments(len(valid), valid.mean(), ((valid - valid.mean()) ** 2).sum())
+                self.min, self.max = min(self.min, valid.min()), max(self.max, valid.max())
+            self.quantiles.update(valid)
+            self.distinct.update(valid)
+        else:
+            missing = int(series.isnull().sum())
+            self.missing += missing
+            self.count += len(series) - missing
+            self.distinct.update(series)
+            self.frequent.update(series)
+        return self
+
+    def merge(self, other):
+        """
+        Fold the sketch of another chunk of the same column into this one.
+        """
+        self.rows += other.rows
+        self.missing += other.missing
+        if self.numeric:
+            self._merge_moments(other.count, other.mean, other.m2)
+            self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+            self.quantiles.merge(other.quantiles)
+        else:
+            self.count += other.count
+            self.frequent.merge(other.frequent)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def describe(self):
+        """
+        Summary in the layout of DataFrame.describe(), with an approximate distinct count.
+        """
+        summary = {'count': self.count, 'missing': self.missing, 'unique (approx.)': self.distinct.estimate()}
+        if self.numeric:
+            quartiles = self.quantiles.quantile([0.25, 0.5, 0.75])
+            summary.update({
+                'mean': self.mean if self.count else np.nan,
+                'std': np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan,
+                'min': self.min if self.count else np.nan,
+                '25%': quartiles[0], '50%': quartiles[1], '75%': quartiles[2],
+                'max': self.max if self.count else np.nan,
+            })
+        return summary
+
+def _is_numeric(dtype):
+    return is_numeric_dtype(dtype) and not is_bool_dtype(dtype) and not isinstance(dtype, CategoricalDtype)
+
+def sketch_dataset(df, columns=None, chunk_rows=SKETCH_CHUNK_ROWS):
+    """
+    Build column sketches of a DataFrame or DatasetHandle, one column and row chunk at a time.
+
+    Only one column is held in memory at a time, and each of its chunks is sketched
+    separately, so memory stays bounded by the column plus the sketches.
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    sketches = {}
+    for col in columns:
+        series = df[col]
+        sketch = ColumnSketch(_is_numeric(series.dtype))
+        for start in range(0, len(series), chunk_rows):
+            sketch.update(series.iloc[start:start + chunk_rows])
+        sketches[col] = sketch
+    return sketches
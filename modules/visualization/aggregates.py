@@ -0,0 +1,335 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from modules.data_access.dataset_handle import as_frame
+from modules.visualization.sampling import stratified_sample
+from modules.utils.fingerprint import dataset_fingerprint
+from modules.utils.logger import get_logger
+from configs.config import (
+    AGGREGATE_CACHE_SIZE,
+    BOX_PLOT_MAX_OUTLIERS,
+    DEFAULT_RANDOM_STATE,
+    GROUP_PLOT_KDE_POINTS,
+    GROUP_PLOT_MAX_OUTLIERS,
+)
+
+logger = get_logger(__name__)
+
+WHISKER_IQR = 1.5
+
+# Chart aggregates of recently seen datasets, shared by all sessions
+_aggregate_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+_MISSING = object()
+
+def lookup_aggregate(fingerprint, name, params, default=None):
+    """
+    Look up a cached aggregate by dataset fingerprint, name and parameters.
+    """
+    with _cache_lock:
+        key = (fingerprint, name, params)
+        if key not in _aggregate_cache:
+            return default
+        _aggregate_cache.move_to_end(key)
+        return _aggregate_cache[key]
+
+def store_aggregate(fingerprint, name, params, aggregate):
+    """
+    Cache an aggregate, evicting the least recently used ones beyond AGGREGATE_CACHE_SIZE.
+    """
+    with _cache_lock:
+        _aggregate_cache[(fingerprint, name, params)] = aggregate
+        while len(_aggregate_cache) > AGGREGATE_CACHE_SIZE:
+            _aggregate_cache.popitem(last=False)
+
+def cached_aggregate(df, name, params, compute):
+    """
+    Return an aggregate of a dataset, computing it only if it is not cached yet.
+
+    The key combines the dataset fingerprint, so a filtered view or a sample gets
+    its own entries, with the aggregate name and its parameters.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - name: Name of the aggregate, e.g. 'histogram'
+    - params: Hashable tuple of the aggregate's parameters, e.g. (column, bins)
+    - compute: Function computing the aggregate from df
+
+    Returns:
+    - aggregate: The cached or newly computed aggregate
+    """
+    fingerprint = dataset_fingerprint(df)
+    aggregate = lookup_aggregate(fingerprint, name, params, default=_MISSING)
+    if aggregate is _MISSING:
+        aggregate = compute(df)
+        store_aggregate(fingerprint, name, params, aggregate)
+    return aggregate
+
+def float_values(series):
+    """
+    Values of a numeric column as a float64 array with missing values as NaN.
+    """
+    return series.to_numpy(dtype='float64', na_value=np.nan)
+
+def finite_values(series):
+    """
+    Values of a numeric column as float64, without missing or infinite values.
+    """
+    values = float_values(series)
+    return values[np.isfinite(values)]
+
+def compute_histogram(values, bins):
+    """
+    Bin values into equal-width bins.
+
+    Parameters:
+    - values: 1D float array without missing values
+    - bins: Number of bins
+
+    Returns:
+    - histogram: Dictionary with 'counts', 'edges' (bins + 1 values) and 'count'
+    """
+    if len(values):
+        counts, edges = np.histogram(values, bins=bins)
+    else:
+        counts, edges = np.zeros(bins, dtype=np.int64), np.linspace(0.0, 1.0, bins + 1)
+    return {'counts': counts, 'edges': edges, 'count': len(values)}
+
+def compute_box_statistics(values, max_outliers=BOX_PLOT_MAX_OUTLIERS):
+    """
+    Compute the statistics a box plot draws.
+
+    Whiskers reach the most extreme values within 1.5 IQR of the quartiles. Values
+    beyond them are outliers; when there are more than max_outliers, a random sample
+    is kept that always includes the smallest and largest value.
+
+    Parameters:
+    - values: 1D float array without missing values
+    - max_outliers: Maximum number of outliers returned
+
+    Returns:
+    - statistics: Dictionary with 'q1', 'median', 'q3', 'mean', 'lower_fence', 'upper_fence',
+                  'outliers' (array), 'outlier_count' and 'count', or None without values
+    """
+    if not len(values):
+        return None
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = (values >= q1 - WHISKER_IQR * iqr) & (values <= q3 + WHISKER_IQR * iqr)
+    outliers = values[~inside]
+    outlier_count = len(outliers)
+
+    if outlier_count > max_outliers:
+        rng = np.random.default_rng(DEFAULT_RANDOM_STATE)
+        extremes = [outliers.argmin(), outliers.argmax()]
+        positions = rng.choice(outlier_count, size=max(max_outliers - 2, 0), replace=False)
+        outliers = outliers[np.union1d(extremes, positions)]
+
+    return {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'mean': values.mean(),
+        'lower_fence': values[inside].min(),
+        'upper_fence': values[inside].max(),
+        'outliers': outliers,
+        'outlier_count': outlier_count,
+        'count': len(values),
+    }
+
+def get_histogram(df, column, bins):
+    """
+    Get the bin counts of a numeric column, cached per dataset, column and bin count.
+    """
+    return cached_aggregate(df, 'histogram', (column, bins), lambda data: compute_histogram(finite_values(data[column]), bins))
+
+def get_box_statistics(df, column):
+    """
+    Get the box plot statistics of a numeric column, cached per dataset and column.
+    """
+    return cached_aggregate(df, 'box', (column,), lambda data: compute_box_statistics(finite_values(data[column])))
+
+def compute_density_grid(x, y, bins):
+    """
+    Count points on a regular 2D grid.
+
+    Parameters:
+    - x, y: 1D float arrays of equal length; pairs with a missing or infinite value are skipped
+    - bins: Number of bins along each axis, or a pair of edge arrays
+
+    Returns:
+    - grid: Dictionary with 'counts' (bins x bins, indexed [x, y]), 'x_edges', 'y_edges' and 'count'
+    """
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y = x[valid], y[valid]
+    if len(x):
+        counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    elif isinstance(bins, int):
+        counts = np.zeros((bins, bins))
+        x_edges = y_edges = np.linspace(0.0, 1.0, bins + 1)
+    else:
+        x_edges, y_edges = bins
+        counts = np.zeros((len(x_edges) - 1, len(y_edges) - 1))
+    return {'counts': counts.astype(np.int64), 'x_edges': x_edges, 'y_edges': y_edges, 'count': len(x)}
+
+def sample_points(df, x, y, n, color=None):
+    """
+    Sample rows for a scatter plot, keeping the extremes of both axes.
+
+    With a categorical color column the sample is stratified by it, so every category
+    keeps its share of the points and rare categories still appear.
+
+    Parameters:
+    - df: Pandas DataFrame with the plotted columns
+    - x, y: Axis columns; rows missing either value are dropped
+    - n: Target number of points
+    - color: Optional color column
+
+    Returns:
+    - sample: DataFrame with at most about n rows
+    """
+    df = df.dropna(subset=[x, y])
+    if len(df) <= n:
+        return df
+    # Continuous or high-cardinality color columns would give every row its own stratum
+    strata_col = color if color is not None and df[color].nunique(dropna=False) <= n // 10 else None
+    sample = stratified_sample(df, n, strata_col=strata_col)
+    # The rows at the edges of the point cloud define its shape, so they are always kept
+    extremes = {df[col].idxmin() for col in (x, y)} | {df[col].idxmax() for col in (x, y)}
+    missing = sorted(extremes - set(sample.index))
+    return pd.concat([sample, df.loc[missing]]) if missing else sample
+
+def get_density_grid(df, x, y, bins):
+    """
+    Get the 2D point counts of two numeric columns, cached per dataset, axis pair and bin count.
+    """
+    return cached_aggregate(
+        df, 'density', (x, y, bins),
+        lambda data: compute_density_grid(float_values(data[x]), float_values(data[y]), bins),
+    )
+
+def get_point_sample(df, x, y, n, color=None):
+    """
+    Get a scatter plot sample of two columns, cached per dataset, axis pair, color column and size.
+    """
+    columns = list(dict.fromkeys(col for col in [x, y, color] if col is not None))
+    return cached_aggregate(
+        df, 'points', (x, y, color, n),
+        lambda data: sample_points(as_frame(data, columns), x, y, n, color=color),
+    )
+
+OTHER_CATEGORY = 'Other'
+
+def _sorted_quantile(values, q):
+    # Linear interpolation on already sorted values, as np.quantile does
+    position = q * (len(values) - 1)
+    low = int(np.floor(position))
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+def _binned_kde(values, grid):
+    """
+    Gaussian kernel density on a regular grid, from a histogram of the values on that grid.
+    """
+    step = grid[1] - grid[0] if len(grid) > 1 else 1.0
+    if step == 0:
+        # Every value equals the single value of the grid: all mass in one spike
+        density = np.zeros(len(grid))
+        density[0] = 1.0
+        return density
+    counts = np.bincount(
+        np.clip(np.rint((values - grid[0]) / step).astype(np.int64), 0, len(grid) - 1), minlength=len(grid)
+    ).astype('float64')
+    # Scott's rule, as in scipy.stats.gaussian_kde
+    std = values.std(ddof=1) if len(values) > 1 else 0.0
+    if std == 0:
+        # A constant group has no bandwidth; leave its spike unsmoothed
+        return counts / (counts.sum() * step)
+    sigma = max(std * len(values) ** (-1 / 5) / step, 1.0)
+    half = int(min(np.ceil(4 * sigma), len(grid) - 1))
+    offsets = np.arange(-half, half + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    density = np.convolve(counts, kernel)[half:half + len(grid)]
+    return density / (density.sum() * step)
+
+def compute_group_statistics(categories, values, top_n, grid_points=GROUP_PLOT_KDE_POINTS,
+                             max_outliers=GROUP_PLOT_MAX_OUTLIERS):
+    """
+    Compute box plot statistics and density curves of a numeric column per category.
+
+    Rows are sorted once by category and value, so every group's quantiles, whiskers and
+    outliers are read from its slice of the sorted values. Categories beyond the top_n
+    most frequent are merged into an 'Other' group. Densities are evaluated on one grid
+    shared by all groups.
+
+    Parameters:
+    - categories: Series of category labels; missing labels are left out
+    - values: Series of numeric values; missing values are left out
+    - top_n: Maximum number of categories shown on their own
+    - grid_points: Number of points of the density grid
+    - max_outliers: Maximum number of outliers kept per group, always including the extremes
+
+    Returns:
+    - groups: DataFrame indexed by category with 'count', 'mean', 'q1', 'median', 'q3',
+              'lower_fence', 'upper_fence' and 'outliers', ordered by count
+    - grid: Values at which the densities are evaluated
+    - densities: Array of shape (groups, grid_points)
+    - merged: Number of categories merged into 'Other'
+    """
+    codes, uniques = pd.factorize(categories)
+    numbers = float_values(values)
+    valid = (codes >= 0) & np.isfinite(numbers)
+    codes, numbers = codes[valid], numbers[valid]
+
+    counts = np.bincount(codes, minlength=len(uniques))
+    ranked = np.argsort(-counts, kind='stable')
+    ranked = ranked[counts[ranked] > 0]
+    kept, merged = ranked[:top_n], ranked[top_n:]
+    labels = [uniques[code] for code in kept] + ([OTHER_CATEGORY] if len(merged) else [])
+    # Map every category code to its position among the groups; merged ones share the last
+    group_of = np.full(len(uniques), len(kept), dtype=np.int64)
+    group_of[kept] = np.arange(len(kept))
+    groups = group_of[codes]
+
+    order = np.lexsort((numbers, groups))
+    sorted_values = numbers[order]
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(groups, minlength=len(labels)))])
+
+    grid = np.linspace(numbers.min(), numbers.max(), grid_points) if len(numbers) else np.zeros(grid_points)
+    rows, densities = [], []
+    for label, start, stop in zip(labels, bounds[:-1], bounds[1:]):
+        group = sorted_values[start:stop]
+        q1, median, q3 = (_sorted_quantile(group, q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        low = np.searchsorted(group, q1 - WHISKER_IQR * iqr, side='left')
+        high = np.searchsorted(group, q3 + WHISKER_IQR * iqr, side='right')
+        outliers = np.concatenate([group[:low], group[high:]])
+        if len(outliers) > max_outliers:
+            outliers = outliers[np.unique(np.linspace(0, len(outliers) - 1, num=max_outliers).astype(np.int64))]
+        rows.append({
+            'category': label,
+            'count': len(group),
+            'mean': group.mean(),
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'lower_fence': group[low],
+            'upper_fence': group[high - 1],
+            'outliers': outliers,
+        })
+        densities.append(_binned_kde(group, grid))
+
+    columns = ['count', 'mean', 'q1', 'median', 'q3', 'lower_fence', 'upper_fence', 'outliers']
+    table = pd.DataFrame(rows, columns=['category'] + columns).set_index('category')
+    return table, grid, np.array(densities).reshape(len(rows), grid_points), len(merged)
+
+def get_group_statistics(df, category_column, value_column, top_n):
+    """
+    Get per-category statistics of a numeric column, cached per dataset, column pair and top_n.
+    """
+    return cached_aggregate(
+        df, 'groups', (category_column, value_column, top_n),
+        lambda data: compute_group_statistics(data[category_column], data[value_column], top_n),
+    )
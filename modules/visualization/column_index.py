@@ -0,0 +1,252 @@
+import re
+import threading
+from collections import OrderedDict, defaultdict
+import numpy as np
+import pandas as pd
+from pandas import CategoricalDtype
+from pandas.api.types import is_bool_dtype, is_datetime64_dtype, is_numeric_dtype, is_string_dtype
+from modules.utils.logger import get_logger
+from configs.config import FILTER_INDEX_CACHE_BYTES, NGRAM_INDEX_MAX_UNIQUE
+
+logger = get_logger(__name__)
+
+NGRAM = 3
+REGEX_SPECIAL = re.compile(r'[.^$*+?{}\[\]\\|()]')
+# Below this share of rows and number of values, lookups return sorted row positions;
+# above it, a boolean mask over all rows is cheaper to build and to combine
+SPARSE_ROWS_RATIO = 1 / 16
+SPARSE_MAX_CODES = 1024
+
+# Column indexes of recently filtered datasets, keyed by (fingerprint, column) and bounded in bytes
+_index_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _scatter_mask(positions, rows):
+    mask = np.zeros(rows, dtype=bool)
+    mask[positions] = True
+    return mask
+
+class SortedIndex:
+    """
+    Row positions of a numeric or datetime column sorted by value.
+
+    Range queries are two binary searches; the selected positions are then sorted, or
+    scattered into a mask when the range is wide. Missing values are left out, so they
+    never match.
+    """
+
+    def __init__(self, series):
+        self.rows = len(series)
+        if is_datetime64_dtype(series.dtype):
+            values = series.to_numpy(dtype='datetime64[ns]')
+            valid = ~np.isnat(values)
+        else:
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+            valid = ~np.isnan(values)
+        positions = np.flatnonzero(valid)
+        # Datetimes sort faster as their integer representation
+        keys = values[positions].view('int64') if values.dtype.kind == 'M' else values[positions]
+        order = np.argsort(keys)
+        self.values = values[positions][order]
+        self.positions = positions[order]
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.positions.nbytes
+
+    def bounds(self):
+        """
+        Smallest and largest value, or None for a column without values.
+        """
+        if not len(self.values):
+            return None
+        return self.values[0], self.values[-1]
+
+    def between(self, low, high):
+        if is_datetime64_dtype(self.values.dtype):
+            low, high = np.datetime64(pd.Timestamp(low), 'ns'), np.datetime64(pd.Timestamp(high), 'ns')
+        start = np.searchsorted(self.values, low, side='left')
+        stop = np.searchsorted(self.values, high, side='right')
+        if stop - start < self.rows * SPARSE_ROWS_RATIO:
+            return np.sort(self.positions[start:stop])
+        return _scatter_mask(self.positions[start:stop], self.rows)
+
+class CodeIndex:
+    """
+    Inverted index from the distinct values of a column to the rows holding them.
+
+    Rows are grouped by value code, so the rows of any set of values are found by
+    gathering their groups, or by one lookup per row when most rows match.
+    """
+
+    def __init__(self, series):
+        if isinstance(series.dtype, CategoricalDtype):
+            self.codes = series.cat.codes.to_numpy()
+            self.uniques = pd.Index(series.cat.categories)
+        else:
+            codes, uniques = pd.factorize(series)
+            self.codes, self.uniques = codes, pd.Index(uniques)
+        self.order = np.argsort(self.codes, kind='stable')
+        # Missing values have code -1 and sort first; offsets skip them
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.uniques))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]) + int((self.codes < 0).sum())
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.order.nbytes + self.offsets.nbytes + self.uniques.memory_usage(deep=True)
+
+    def present_values(self):
+        """
+        Distinct values that occur in at least one row.
+        """
+        return self.uniques[np.diff(self.offsets) > 0]
+
+    def rows_for_codes(self, codes):
+        """
+        Rows whose value code is in codes, as sorted positions or as a boolean mask.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        codes = codes[(codes >= 0) & (codes < len(self.uniques))]
+        matched = int((self.offsets[codes + 1] - self.offsets[codes]).sum())
+        if matched < len(self.codes) * SPARSE_ROWS_RATIO and len(codes) <= SPARSE_MAX_CODES:
+            return np.sort(np.concatenate(
+                [self.order[self.offsets[code]:self.offsets[code + 1]] for code in codes] or [np.array([], dtype=np.int64)]
+            ))
+        hit = np.zeros(len(self.uniques) + 1, dtype=bool)
+        hit[codes] = True
+        # Code -1 (missing) maps to the last, always False slot
+        return hit[self.codes]
+
+    def isin(self, values):
+        return self.rows_for_codes(self.uniques.get_indexer(list(values)))
+
+class StringIndex(CodeIndex):
+    """
+    CodeIndex of a text column with lookups by prefix and by substring.
+
+    Prefix queries binary-search the sorted distinct values. Substring queries narrow the
+    distinct values down with a trigram index before verifying the candidates, so the
+    cost follows the number of distinct values rather than the number of rows.
+    """
+
+    def __init__(self, series):
+        super().__init__(series)
+        self.texts = self.uniques.astype(str).to_numpy(dtype=object)
+        self.sorted_codes = np.argsort(self.texts, kind='stable')
+        self.sorted_texts = self.texts[self.sorted_codes]
+        self._trigrams = None
+
+    def startswith(self, prefix):
+        start = np.searchsorted(self.sorted_texts, prefix, side='left')
+        # Every string with the prefix sorts before the prefix followed by the largest code point
+        stop = np.searchsorted(self.sorted_texts, prefix + '\U0010ffff', side='left')
+        return self.rows_for_codes(self.sorted_codes[start:stop])
+
+    def equals(self, value):
+        return self.isin([value])
+
+    def _trigram_index(self):
+        if self._trigrams is None:
+            postings = defaultdict(list)
+            for code, text in enumerate(self.texts):
+                lowered = text.lower()
+                for gram in {lowered[i:i + NGRAM] for i in range(len(lowered) - NGRAM + 1)}:
+                    postings[gram].append(code)
+            self._trigrams = {gram: np.array(codes, dtype=np.int64) for gram, codes in postings.items()}
+        return self._trigrams
+
+    def _matching_codes(self, candidates, matches):
+        texts = pd.Series(self.texts[candidates], dtype=object)
+        return candidates[np.asarray(matches(texts.str), dtype=bool)]
+
+    def contains(self, pattern):
+        """
+        Rows containing a pattern, case-insensitively, with the semantics of str.contains.
+        """
+        candidates = np.arange(len(self.texts))
+        # Trigrams can only prune for literal ASCII patterns, where lowercasing matches IGNORECASE
+        literal = REGEX_SPECIAL.search(pattern) is None and pattern.isascii()
+        if literal and len(pattern) >= NGRAM and len(self.texts) <= NGRAM_INDEX_MAX_UNIQUE:
+            trigrams = self._trigram_index()
+            lowered = pattern.lower()
+            for gram in {lowered[i:i + NGRAM] for i in range(len(lowered) - NGRAM + 1)}:
+                candidates = np.intersect1d(candidates, trigrams.get(gram, candidates[:0]), assume_unique=True)
+                if not len(candidates):
+                    break
+        codes = self._matching_codes(candidates, lambda values: values.contains(pattern, case=False, na=False))
+        return self.rows_for_codes(codes)
+
+    def match(self, pattern):
+        codes = self._matching_codes(np.arange(len(self.texts)), lambda values: values.match(pattern, na=False))
+        return self.rows_for_codes(codes)
+
+def build_index(series):
+    """
+    Build the index that suits a column, or None if the column cannot be indexed.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, CategoricalDtype):
+        return CodeIndex(series)
+    if is_datetime64_dtype(dtype) or (is_numeric_dtype(dtype) and not is_bool_dtype(dtype)):
+        return SortedIndex(series)
+    if is_string_dtype(dtype):
+        try:
+            return StringIndex(series)
+        except TypeError:
+            # Unhashable cells such as dicts from JSON
+            return None
+    return None
+
+def get_column_index(df, fingerprint, column):
+    """
+    Get the index of a column, building it on first use.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - fingerprint: Fingerprint of df
+    - column: Column name
+
+    Returns:
+    - index: SortedIndex, CodeIndex or StringIndex, or None if the column cannot be indexed
+    """
+    key = (fingerprint, column)
+    with _cache_lock:
+        if key in _index_cache:
+            _index_cache.move_to_end(key)
+            return _index_cache[key]
+
+    index = build_index(df[column])
+    with _cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > 1 and sum(i.nbytes for i in _index_cache.values() if i is not None) > FILTER_INDEX_CACHE_BYTES:
+            _index_cache.popitem(last=False)
+    logger.info(f"Built a {type(index).__name__} for column '{column}'.")
+    return index
+
+def index_lookup(index, cond):
+    """
+    Answer a filter condition from a column index.
+
+    Parameters:
+    - index: Index from get_column_index
+    - cond: Condition from modules.visualization.filters.condition()
+
+    Returns:
+    - rows: Sorted array of matching row positions or a boolean mask over all rows,
+            or None if the index cannot answer the condition
+    """
+    op, value = cond['op'], cond['value']
+    if isinstance(index, SortedIndex) and op == 'between':
+        return index.between(*value)
+    if isinstance(index, CodeIndex) and op == 'isin':
+        return index.isin(value)
+    if isinstance(index, StringIndex):
+        if op == 'contains':
+            return index.contains(value)
+        if op == 'startswith':
+            return index.startswith(value)
+        if op == 'equals':
+            return index.equals(value)
+        if op == 'regex':
+            return index.match(value)
+    return None
@@ -0,0 +1,172 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from modules.data_access.dataset_handle import as_frame
+from modules.utils.fingerprint import dataset_fingerprint
+from modules.utils.logger import get_logger
+from modules.visualization.aggregates import cached_aggregate, lookup_aggregate, store_aggregate
+from configs.config import CORRELATION_BLOCK_ROWS, CORRELATION_MAX_WORKERS, CORRELATION_RANK_CACHE_BYTES
+
+logger = get_logger(__name__)
+
+CORRELATION_METHODS = ['pearson', 'spearman', 'kendall']
+
+# Column ranks for the rank-based methods, keyed by (fingerprint, column) and bounded in bytes
+_rank_cache = OrderedDict()
+_rank_lock = threading.Lock()
+
+def pairwise_pearson(df, block_rows=CORRELATION_BLOCK_ROWS):
+    """
+    Pearson correlation of all columns over pairwise-complete rows, like DataFrame.corr().
+
+    Rows are processed in blocks. For each block, the pairwise counts, sums and cross
+    products are accumulated with matrix products, which NumPy runs on all cores, so
+    memory stays proportional to the block size.
+
+    Parameters:
+    - df: Pandas DataFrame of numeric columns
+    - block_rows: Number of rows converted to float64 at a time
+
+    Returns:
+    - corr: Correlation matrix as a DataFrame
+    """
+    columns = df.columns
+    k = len(columns)
+    # Centering on the column means avoids cancellation in the one-pass sums
+    means = np.nan_to_num(df.mean().to_numpy(dtype='float64', na_value=np.nan), nan=0.0, posinf=0.0, neginf=0.0)
+    n = np.zeros((k, k))
+    sx = np.zeros((k, k))
+    sxx = np.zeros((k, k))
+    sxy = np.zeros((k, k))
+
+    for start in range(0, len(df), block_rows):
+        block = df.iloc[start:start + block_rows].to_numpy(dtype='float64', na_value=np.nan) - means
+        valid = np.isfinite(block)
+        mask = valid.astype('float64')
+        values = np.where(valid, block, 0.0)
+        n += mask.T @ mask
+        # sx[i, j]: sum of column i over rows where both i and j are present
+        sx += values.T @ mask
+        sxx += (values ** 2).T @ mask
+        sxy += values.T @ values
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sxy - sx * sx.T
+        var = (n * sxx - sx ** 2) * (n * sxx.T - sx.T ** 2)
+        corr = cov / np.sqrt(var)
+    corr[(n < 2) | ~np.isfinite(corr)] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+    # Rounding can leave the diagonal just below 1; constant columns stay NaN as in pandas
+    np.fill_diagonal(corr, np.where(np.isfinite(np.diag(corr)), 1.0, np.nan))
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+def _column_ranks(df, fingerprint, columns):
+    """
+    Average ranks of columns, missing values kept as NaN, reusing cached ranks.
+    """
+    ranks = {}
+    with _rank_lock:
+        for col in columns:
+            if (fingerprint, col) in _rank_cache:
+                _rank_cache.move_to_end((fingerprint, col))
+                ranks[col] = _rank_cache[(fingerprint, col)]
+
+    missing = [col for col in columns if col not in ranks]
+    if missing:
+        data = as_frame(df, missing)
+        with ThreadPoolExecutor(max_workers=max(1, min(len(missing), CORRELATION_MAX_WORKERS))) as executor:
+            computed = executor.map(
+                lambda col: data[col].rank(method='average').to_numpy(dtype='float64', na_value=np.nan), missing
+            )
+            ranks.update(zip(missing, computed))
+        with _rank_lock:
+            for col in missing:
+                _rank_cache[(fingerprint, col)] = ranks[col]
+            while len(_rank_cache) > 1 and sum(r.nbytes for r in _rank_cache.values()) > CORRELATION_RANK_CACHE_BYTES:
+                _rank_cache.popitem(last=False)
+    return pd.DataFrame({col: ranks[col] for col in columns})
+
+def _kendall_pair(x, y):
+    from scipy import stats
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if valid.sum() < 2:
+        return np.nan
+    return stats.kendalltau(x[valid], y[valid]).statistic
+
+def _kendall_matrix(df, fingerprint, columns):
+    """
+    Kendall's tau-b of the selected columns, computing and caching each pair separately.
+    """
+    pairs = list(combinations(columns, 2))
+    taus = {pair: lookup_aggregate(fingerprint, 'kendall', tuple(sorted(pair))) for pair in pairs}
+    missing = [pair for pair, tau in taus.items() if tau is None]
+    if missing:
+        ranks = _column_ranks(df, fingerprint, list(dict.fromkeys(col for pair in missing for col in pair)))
+        with ThreadPoolExecutor(max_workers=max(1, min(len(missing), CORRELATION_MAX_WORKERS))) as executor:
+            computed = executor.map(lambda pair: _kendall_pair(ranks[pair[0]].to_numpy(), ranks[pair[1]].to_numpy()), missing)
+            for pair, tau in zip(missing, computed):
+                taus[pair] = tau
+                store_aggregate(fingerprint, 'kendall', tuple(sorted(pair)), tau)
+        logger.info(f"Computed Kendall's tau for {len(missing)} column pairs.")
+
+    corr = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+    for (a, b), tau in taus.items():
+        corr.loc[a, b] = corr.loc[b, a] = tau
+    return corr
+
+def get_correlation_matrix(df, columns, method='pearson'):
+    """
+    Get the correlation matrix of the selected numeric columns.
+
+    Pearson and Spearman matrices are computed once per dataset for all numeric columns,
+    so changing the selection only slices the cached matrix. Spearman correlates cached
+    column ranks; ranks are taken over each column's own non-missing values. Kendall's
+    tau is computed per selected pair, since its cost grows with every pair.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - columns: Numeric columns to correlate
+    - method: 'pearson', 'spearman' or 'kendall'
+
+    Returns:
+    - corr: Correlation matrix of the selected columns
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unsupported correlation method: {method}")
+    fingerprint = dataset_fingerprint(df)
+    columns = list(columns)
+    if method == 'kendall':
+        return _kendall_matrix(df, fingerprint, columns)
+
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+
+    def compute(data):
+        if method == 'spearman':
+            values = _column_ranks(data, fingerprint, numeric_cols)
+        else:
+            values = as_frame(data, numeric_cols)
+        corr = pairwise_pearson(values)
+        logger.info(f"Computed the {method} correlation matrix of {len(numeric_cols)} columns.")
+        return corr
+
+    return cached_aggregate(df, 'correlation', (method,), compute).loc[columns, columns]
+
+def top_correlated_pairs(corr, k):
+    """
+    List the k column pairs with the strongest correlation.
+
+    Parameters:
+    - corr: Correlation matrix
+    - k: Number of pairs
+
+    Returns:
+    - pairs: DataFrame with 'Feature 1', 'Feature 2' and 'Correlation', strongest first
+    """
+    upper = np.triu(np.ones(corr.shape, dtype=bool), k=1)
+    pairs = corr.where(upper).stack().rename('Correlation').reset_index()
+    pairs.columns = ['Feature 1', 'Feature 2', 'Correlation']
+    order = pairs['Correlation'].abs().sort_values(ascending=False, kind='stable').index
+    return pairs.loc[order].head(k).reset_index(drop=True)
@@ -10,11 +10,70 @@ from pandas.api.types import (
 from pandas import CategoricalDtype
 import plotly.express as px
 import streamlit as st
-import time
+from modules.utils.fingerprint import dataset_fingerprint, register_fingerprint, step_version
 from modules.utils.logger import get_logger
+from modules.utils.row_hashes import near_duplicate_groups
+from modules.data_access.dataset_handle import as_frame, null_counts, take_rows
+from modules.visualization.aggregates import (
+    cached_aggregate,
+    get_box_statistics,
+    get_density_grid,
+    get_group_statistics,
+    get_histogram,
+    get_point_sample,
+)
+from modules.visualization.correlation import CORRELATION_METHODS, get_correlation_matrix, top_correlated_pairs
+from modules.visualization.column_index import CodeIndex, SortedIndex
+from modules.visualization.filters import apply_filter, condition, get_filter_index
+from modules.visualization.figures import (
+    box_figure,
+    co_missingness_figure,
+    density_figure,
+    grouped_box_figure,
+    grouped_violin_figure,
+    histogram_figure,
+    missingness_figure,
+    pair_plot_figure,
+)
+from modules.visualization.missingness import get_missingness
+from modules.visualization.pair_plot import get_pair_panels
+from modules.visualization.profiler import (
+    duplicate_row_count,
+    get_column_sketches,
+    get_profile,
+    missing_counts,
+    numeric_summary,
+    sketch_summary,
+)
+from modules.visualization.sampling import (
+    approximate_describe,
+    approximate_value_counts,
+    exact_toggle,
+    get_eda_sample,
+)
+from configs.config import (
+    CORRELATION_HEATMAP_MAX_COLUMNS,
+    EDA_SAMPLE_THRESHOLD_ROWS,
+    EDA_SAMPLE_SIZE,
+    GROUP_PLOT_TOP_CATEGORIES,
+    PAIR_PLOT_BINS,
+    PAIR_PLOT_DEFAULT_COLUMNS,
+    SCATTER_DENSITY_BINS,
+    SCATTER_MAX_POINTS,
+    SOURCE_COLUMN,
+)
 
 logger = get_logger(__name__)
 
+STRING_FILTERS = {
+    "Contains": 'contains',
+    "Starts with": 'startswith',
+    "Ends with": 'endswith',
+    "Exact match": 'equals',
+    "Regex": 'regex',
+}
+
+@st.fragment
 def data_overview(df):
     st.subheader("Data Overview")
     st.write(f"**Number of rows:** {df.shape[0]}")
@@ -24,125 +83,253 @@ def data_overview(df):
         st.write(df.dtypes)
 
     if st.checkbox("Show Missing Values"):
-        missing_values = df.isnull().sum()
+        missing_values = missing_counts(get_profile(df))
         st.write(missing_values[missing_values > 0])
 
-    if st.checkbox("Show Duplicate Rows"):
-        duplicate_rows = df.duplicated().sum()
-        st.write(f"Number of duplicate rows: {duplicate_rows}")
-
-def plot_histograms(df):
-    st.subheader("Histograms of Numerical Features")
-    numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
-    selected_cols = st.multiselect("Select Numerical Columns for Histograms", numeric_cols)
-    bins = st.slider("Number of Bins", min_value=5, max_value=100, value=30)
+    if st.checkbox("Show Memory Usage"):
+        memory_report = st.session_state.get('memory_report')
+        if memory_report is not None and list(memory_report.index) == list(df.columns):
+            before = memory_report['Memory Before (MB)'].sum()
+            after = memory_report['Memory After (MB)'].sum()
+            st.write(f"**Memory usage:** {after:.2f} MB (down from {before:.2f} MB at load time)")
+            st.write(memory_report)
+        else:
+            memory_usage = as_frame(df).memory_usage(deep=True, index=False) / 1024 ** 2
+            st.write(f"**Memory usage:** {memory_usage.sum():.2f} MB")
+            st.write(pd.DataFrame({'Dtype': df.dtypes.astype(str), 'Memory (MB)': memory_usage}))
 
-    for col in selected_cols:
-        fig = px.histogram(df, x=col, nbins=bins, title=f'Histogram of {col}')
-        st.plotly_chart(fig)
+    if st.checkbox("Show Duplicate Rows"):
+        subset = st.multiselect("Columns to Compare", df.columns.tolist(), default=df.columns.tolist(), key='duplicate_columns')
+        if subset:
+            duplicate_rows = duplicate_row_count(df, subset)
+            st.write(f"Number of duplicate rows: {duplicate_rows}")
+            if st.checkbox("Find Near Duplicates"):
+                decimals = st.number_input("Round Numbers to Decimals", min_value=0, max_value=10, value=2)
+                groups = cached_aggregate(
+                    df, 'near_duplicates', (tuple(subset), decimals),
+                    lambda data: near_duplicate_groups(data, subset, decimals),
+                )
+                grouped = groups[groups >= 0]
+                st.write(f"{grouped.nunique()} groups cover {len(grouped)} rows that match after rounding numbers and normalizing text.")
+                if len(grouped):
+                    positions = grouped.sort_values(kind='stable').index.to_numpy()[:100]
+                    st.write(take_rows(df, positions, subset).assign(group=grouped.loc[positions].to_numpy()))
+        else:
+            st.write("Select at least one column to compare.")
 
-def statistical_summaries(df):
+@st.fragment
+def statistical_summaries(df, full_df=None):
     st.subheader("Statistical Summaries")
+    df = exact_toggle(df, full_df, 'summaries')
+    approximate = full_df is not None and df is not full_df
+    sketched = approximate and st.radio(
+        "Estimate From", ["Sample", "Sketches of all rows"], horizontal=True, key='summaries_estimator'
+    ) == "Sketches of all rows"
+    if sketched:
+        st.caption("Quartiles within about 2% in rank, distinct counts within about 2%, value counts as lower bounds.")
 
     # Select columns
     columns = st.multiselect("Select Columns", df.columns.tolist(), default=df.columns.tolist())
 
     # Numerical features
-    numeric_cols = [col for col in columns if is_numeric_dtype(df[col])]
+    numeric_cols = [col for col in columns if is_numeric_dtype(df.dtypes[col])]
     if numeric_cols:
         if st.checkbox("Show Numerical Features Summary"):
-            st.write(df[numeric_cols].describe().T)
+            if sketched:
+                st.write(sketch_summary(get_column_sketches(full_df, numeric_cols)))
+            elif approximate:
+                st.write(approximate_describe(df[numeric_cols], len(full_df)))
+            else:
+                st.write(numeric_summary(get_profile(df, numeric_cols)))
     else:
         st.write("No numerical features selected.")
 
     # Categorical features
-    categorical_cols = [col for col in columns if isinstance(df[col].dtype, CategoricalDtype) or df[col].dtype == 'object']
+    categorical_cols = [col for col in columns if isinstance(df.dtypes[col], CategoricalDtype) or is_string_dtype(df.dtypes[col])]
     if categorical_cols:
         if st.checkbox("Show Categorical Features Summary"):
+            profiles = {} if approximate else get_profile(df, categorical_cols)
+            sketches = get_column_sketches(full_df, categorical_cols) if sketched else {}
             for col in categorical_cols:
                 st.write(f"**{col}**")
-                st.write(df[col].value_counts())
+                if sketched:
+                    sketch = sketches[col]
+                    st.caption(
+                        f"About {sketch.distinct.estimate():,} distinct values; "
+                        f"counts may be low by up to {sketch.frequent.max_error:,.0f}."
+                    )
+                    st.write(sketch.frequent.most_common())
+                elif approximate:
+                    st.write(approximate_value_counts(df[col], len(full_df)))
+                elif 'value_counts' in profiles[col]:
+                    profile = profiles[col]
+                    if profile['unique'] > len(profile['value_counts']):
+                        st.caption(f"Showing the {len(profile['value_counts'])} most frequent of {profile['unique']} values.")
+                    st.write(profile['value_counts'])
+                else:
+                    st.write("Values of this column cannot be counted.")
     else:
         st.write("No categorical features selected.")
 
-def plot_histograms(df):
+@st.fragment
+def plot_histograms(df, full_df=None):
     st.subheader("Histograms of Numerical Features")
+    df = exact_toggle(df, full_df, 'histograms')
     numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
     selected_cols = st.multiselect("Select Numerical Columns for Histograms", numeric_cols)
     bins = st.slider("Number of Bins", min_value=5, max_value=100, value=30)
 
     for col in selected_cols:
-        fig = px.histogram(df, x=col, nbins=bins, title=f'Histogram of {col}')
+        # Only the bin counts are sent to the browser
+        histogram = get_histogram(df, col, bins)
+        fig = histogram_figure(histogram, col, title=f'Histogram of {col}')
         st.plotly_chart(fig)
 
-def plot_box_plots(df):
+@st.fragment
+def plot_box_plots(df, full_df=None):
     st.subheader("Box Plots of Numerical Features")
+    df = exact_toggle(df, full_df, 'box_plots')
     numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
     selected_cols = st.multiselect("Select Numerical Columns for Box Plots", numeric_cols)
 
     for col in selected_cols:
-        fig = px.box(df, y=col, title=f'Box Plot of {col}')
+        statistics = get_box_statistics(df, col)
+        if statistics is None:
+            st.write(f"Column `{col}` has no values to plot.")
+            continue
+        fig = box_figure(statistics, col, title=f'Box Plot of {col}')
         st.plotly_chart(fig)
+        if statistics['outlier_count'] > len(statistics['outliers']):
+            st.caption(f"Showing {len(statistics['outliers']):,} of {statistics['outlier_count']:,} outliers.")
 
-def plot_correlation_matrix(df):
+@st.fragment
+def plot_correlation_matrix(df, full_df=None):
     st.subheader("Correlation Matrix Heatmap")
+    df = exact_toggle(df, full_df, 'correlation')
     numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
     if numeric_cols:
         selected_cols = st.multiselect("Select Numerical Columns for Correlation Matrix", numeric_cols, default=numeric_cols)
+        method = st.selectbox(
+            "Correlation Method",
+            CORRELATION_METHODS,
+            format_func=str.capitalize,
+            help="Spearman and Kendall are rank-based and capture monotonic relationships.",
+        )
         if len(selected_cols) >= 2:
-            corr_matrix = df[selected_cols].corr()
-            fig = plt.figure(figsize=(10, 8))
-            sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt='.2f')
-            st.pyplot(fig)
+            corr_matrix = get_correlation_matrix(df, selected_cols, method=method)
+            # A heatmap of a wide table is unreadable, so list the strongest pairs instead
+            if len(selected_cols) > CORRELATION_HEATMAP_MAX_COLUMNS:
+                top_k = st.slider("Number of Pairs", min_value=5, max_value=100, value=20)
+                st.write(top_correlated_pairs(corr_matrix, top_k))
+            else:
+                fig = plt.figure(figsize=(10, 8))
+                sns.heatmap(corr_matrix, annot=len(selected_cols) <= 15, cmap='coolwarm', fmt='.2f', vmin=-1, vmax=1)
+                st.pyplot(fig)
         else:
             st.write("Select at least two numerical columns.")
     else:
         st.write("No numerical features available for correlation matrix.")
 
-def plot_scatter_plots(df):
+@st.fragment
+def plot_scatter_plots(df, full_df=None):
     st.subheader("Scatter Plots")
+    df = exact_toggle(df, full_df, 'scatter')
     numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
     if len(numeric_cols) >= 2:
         x_axis = st.selectbox("Select X-axis", numeric_cols)
         y_axis = st.selectbox("Select Y-axis", numeric_cols, index=1)
         color_col = st.selectbox("Select Color Column (Optional)", [None] + df.columns.tolist())
-        fig = px.scatter(df, x=x_axis, y=y_axis, color=color_col, title=f'Scatter Plot of {y_axis} vs {x_axis}')
+        title = f'Scatter Plot of {y_axis} vs {x_axis}'
+
+        # Above the threshold, draw a density grid or a sample instead of every point
+        modes = ['Density', 'Sample', 'All points']
+        mode = st.radio(
+            "Rendering Mode",
+            modes,
+            index=0 if len(df) > SCATTER_MAX_POINTS else 2,
+            horizontal=True,
+            help=f"Density and Sample keep the chart responsive above {SCATTER_MAX_POINTS:,} rows.",
+        )
+        if mode == 'Density':
+            fig = density_figure(get_density_grid(df, x_axis, y_axis, SCATTER_DENSITY_BINS), x_axis, y_axis, title=title)
+            if color_col is not None:
+                st.caption("The color column is not shown in density mode.")
+        else:
+            if mode == 'Sample':
+                plot_df = get_point_sample(df, x_axis, y_axis, SCATTER_MAX_POINTS, color=color_col)
+                st.caption(f"Showing {len(plot_df):,} of {len(df):,} points, including the extremes of both axes.")
+            else:
+                plot_cols = list(dict.fromkeys(col for col in [x_axis, y_axis, color_col] if col is not None))
+                plot_df = as_frame(df, plot_cols)
+            fig = px.scatter(plot_df, x=x_axis, y=y_axis, color=color_col, title=title)
         st.plotly_chart(fig)
     else:
         st.write("Not enough numerical features to create scatter plots.")
 
-def plot_pair_plots(df):
+@st.fragment
+def plot_pair_plots(df, full_df=None):
     st.subheader("Pair Plot")
+    df = exact_toggle(df, full_df, 'pair_plot')
     numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
-    selected_cols = st.multiselect("Select Numerical Columns for Pair Plot", numeric_cols, default=numeric_cols)
+    selected_cols = st.multiselect(
+        "Select Numerical Columns for Pair Plot",
+        numeric_cols,
+        default=numeric_cols[:PAIR_PLOT_DEFAULT_COLUMNS],
+        help="Each added column adds a row and a column of panels; panels already drawn are reused.",
+    )
     if len(selected_cols) >= 2:
-        fig = sns.pairplot(df[selected_cols])
-        st.pyplot(fig)
+        histograms, grids = get_pair_panels(df, selected_cols, PAIR_PLOT_BINS)
+        fig = pair_plot_figure(selected_cols, histograms, grids, title='Pair Plot')
+        st.plotly_chart(fig)
     else:
         st.write("Select at least two numerical columns.")
 
-def categorical_vs_numerical(df):
+@st.fragment
+def categorical_vs_numerical(df, full_df=None):
     st.subheader("Categorical vs Numerical Analysis")
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    df = exact_toggle(df, full_df, 'cat_vs_num')
+    categorical_cols = df.select_dtypes(include=['object', 'category', 'string']).columns.tolist()
     numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
     if categorical_cols and numeric_cols:
         cat_col = st.selectbox("Select Categorical Feature", categorical_cols)
         num_col = st.selectbox("Select Numerical Feature", numeric_cols)
         plot_type = st.selectbox("Select Plot Type", ['Box Plot', 'Violin Plot'])
+        top_n = st.slider(
+            "Maximum Categories",
+            min_value=2,
+            max_value=100,
+            value=GROUP_PLOT_TOP_CATEGORIES,
+            help="Less frequent categories are grouped into 'Other'.",
+        )
+        # Statistics are computed per category on the server; only they are sent to the browser
+        groups, grid, densities, merged = get_group_statistics(df, cat_col, num_col, top_n)
+        if groups.empty:
+            st.write("No rows with both values present.")
+            return
+        title = f'{num_col} Distribution across {cat_col}'
         if plot_type == 'Box Plot':
-            fig = px.box(df, x=cat_col, y=num_col, title=f'{num_col} Distribution across {cat_col}')
+            fig = grouped_box_figure(groups, cat_col, num_col, title=title)
         else:
-            fig = px.violin(df, x=cat_col, y=num_col, box=True, title=f'{num_col} Distribution across {cat_col}')
+            fig = grouped_violin_figure(groups, grid, densities, cat_col, num_col, title=title)
         st.plotly_chart(fig)
+        if merged:
+            st.caption(f"{merged:,} less frequent categories are grouped into 'Other'.")
     else:
         st.write("Insufficient categorical or numerical features for this analysis.")
 
-def plot_missing_values(df):
+@st.fragment
+def plot_missing_values(df, full_df=None):
     st.subheader("Missing Data Heatmap")
-    if df.isnull().sum().sum() > 0:
-        fig = plt.figure(figsize=(10, 6))
-        sns.heatmap(df.isnull(), cbar=False, cmap='viridis')
-        st.pyplot(fig)
+    df = exact_toggle(df, full_df, 'missing')
+    if null_counts(df).sum() > 0:
+        missingness = get_missingness(df)
+        st.plotly_chart(missingness_figure(missingness, title='Share of Missing Values per Row Block'))
+        st.caption(
+            f"Each row summarizes about {int(missingness['block_rows'].max()):,} consecutive rows. "
+            "Columns that tend to be missing together are placed next to each other."
+        )
+        if len(missingness['correlation']) >= 2:
+            st.plotly_chart(co_missingness_figure(missingness['correlation'], title='Co-missingness (Nullity Correlation)'))
     else:
         st.write("No missing values in the dataset.")
 
@@ -158,14 +345,22 @@ def data_filtering(df):
         st.info("Please select at least one column to filter.")
         return df
 
-    # Initialize a dictionary to hold filter conditions
-    filter_conditions = {}
+    # Conditions are collected first and evaluated together by the filter engine
+    filter_conditions = []
 
     for col in filter_columns:
-        if is_numeric_dtype(df[col]):
+        # Only the columns being filtered are read into memory, and large ones are indexed
+        dtype = df.dtypes[col]
+        index = get_filter_index(df, col)
+        series = df[col] if index is None else None
+        if is_numeric_dtype(dtype):
             st.write(f"**Filtering options for numeric column:** `{col}`")
-            min_val = float(df[col].min())
-            max_val = float(df[col].max())
+            bounds = index.bounds() if isinstance(index, SortedIndex) else (series.min(), series.max())
+            if bounds is None or pd.isna(bounds[0]):
+                st.warning(f"Column `{col}` has no values to filter on.")
+                continue
+            min_val = float(bounds[0])
+            max_val = float(bounds[1])
             step = (max_val - min_val) / 100 if max_val != min_val else 1.0
             # Add slider for numeric columns
             values = st.slider(
@@ -175,12 +370,15 @@ def data_filtering(df):
                 value=(min_val, max_val),
                 step=step,
             )
-            filter_conditions[col] = df[col].between(values[0], values[1])
+            filter_conditions.append(condition(col, 'between', values))
 
-        elif is_datetime64_any_dtype(df[col]):
+        elif is_datetime64_any_dtype(dtype):
             st.write(f"**Filtering options for datetime column:** `{col}`")
-            min_date = df[col].min()
-            max_date = df[col].max()
+            bounds = index.bounds() if isinstance(index, SortedIndex) else (series.min(), series.max())
+            if bounds is None or pd.isna(bounds[0]):
+                st.warning(f"Column `{col}` has no values to filter on.")
+                continue
+            min_date, max_date = pd.Timestamp(bounds[0]), pd.Timestamp(bounds[1])
             # Add date input for datetime columns
             values = st.date_input(
                 f"Select date range for `{col}`",
@@ -191,42 +389,42 @@ def data_filtering(df):
             if len(values) == 2:
                 start_date = pd.to_datetime(values[0])
                 end_date = pd.to_datetime(values[1])
-                filter_conditions[col] = df[col].between(start_date, end_date)
+                filter_conditions.append(condition(col, 'between', (start_date, end_date)))
 
-        elif isinstance(df[col].dtype, CategoricalDtype):
+        elif isinstance(dtype, CategoricalDtype):
             st.write(f"**Filtering options for categorical column:** `{col}`")
             # Add multiselect for categorical columns
-            options = st.multiselect(f"Select values for `{col}`", df[col].unique())
+            values = index.present_values() if isinstance(index, CodeIndex) else series.unique()
+            options = st.multiselect(f"Select values for `{col}`", values)
             if options:
-                filter_conditions[col] = df[col].isin(options)
+                filter_conditions.append(condition(col, 'isin', options))
 
-        elif is_string_dtype(df[col]):
+        elif is_string_dtype(dtype):
             st.write(f"**Filtering options for string column:** `{col}`")
             filter_option = st.selectbox(
                 f"Select filter type for `{col}`",
-                ["Contains", "Starts with", "Ends with", "Exact match", "Regex"],
+                list(STRING_FILTERS),
             )
             filter_value = st.text_input(f"Enter text to filter `{col}`")
 
             if filter_value:
-                if filter_option == "Contains":
-                    filter_conditions[col] = df[col].str.contains(filter_value, na=False, case=False)
-                elif filter_option == "Starts with":
-                    filter_conditions[col] = df[col].str.startswith(filter_value, na=False)
-                elif filter_option == "Ends with":
-                    filter_conditions[col] = df[col].str.endswith(filter_value, na=False)
-                elif filter_option == "Exact match":
-                    filter_conditions[col] = df[col] == filter_value
-                elif filter_option == "Regex":
-                    filter_conditions[col] = df[col].str.match(filter_value, na=False)
+                filter_conditions.append(condition(col, STRING_FILTERS[filter_option], filter_value))
         else:
             st.warning(f"Column `{col}` has an unsupported data type and will be ignored.")
 
     # Apply all filter conditions
     if filter_conditions:
-        filtered_df = df.copy()
-        for col, condition in filter_conditions.items():
-            filtered_df = filtered_df[condition]
+        # Reruns triggered elsewhere on the page reuse the last result for the same filter
+        filter_key = (dataset_fingerprint(df), repr(filter_conditions))
+        cached = st.session_state.get('eda_filter')
+        if cached is not None and cached[0] == filter_key:
+            filtered_df = cached[1]
+        else:
+            filtered_df = apply_filter(df, filter_conditions)
+            if filtered_df is not df:
+                # Identify the result by its parent and conditions instead of hashing it
+                register_fingerprint(filtered_df, step_version(filter_key[0], 'filter', filter_key[1]))
+            st.session_state['eda_filter'] = (filter_key, filtered_df)
         st.write(f"Total rows after filtering: {len(filtered_df)}")
         return filtered_df
     else:
@@ -235,14 +433,49 @@ def data_filtering(df):
 
 
 
+@st.fragment
+def data_summary_tab(df, full_df=None):
+    st.subheader("Statistical Summaries")
+    statistical_summaries(df, full_df)
+
+    # Missing Data Visualization
+    if st.checkbox("Show Missing Data Visualization"):
+        plot_missing_values(df, full_df)
+
+@st.fragment
+def visualizations_tab(df, full_df=None):
+    st.subheader("Visualizations")
+    st.write("Select visualizations to display:")
+    visualization_options = st.multiselect(
+        "Choose visualizations",
+        ['Histograms', 'Box Plots', 'Correlation Matrix', 'Scatter Plots', 'Pair Plot', 'Categorical vs Numerical'],
+        help="Select the types of visualizations you'd like to explore."
+    )
+
+    if 'Histograms' in visualization_options:
+        plot_histograms(df, full_df)
+
+    if 'Box Plots' in visualization_options:
+        plot_box_plots(df, full_df)
+
+    if 'Correlation Matrix' in visualization_options:
+        plot_correlation_matrix(df, full_df)
+
+    if 'Scatter Plots' in visualization_options:
+        plot_scatter_plots(df, full_df)
+
+    if 'Pair Plot' in visualization_options:
+        plot_pair_plots(df, full_df)
+
+    if 'Categorical vs Numerical' in visualization_options:
+        categorical_vs_numerical(df, full_df)
+
 def run_eda(df):
     st.title("🔍 Exploratory Data Analysis (EDA)")
 
-    # Create progress spinner to indicate loading
-    with st.spinner("Loading Data Overview..."):
-        time.sleep(0.8)  # Simulate loading time
-        data_overview(df)
-    
+    # Each section runs as a fragment, so its widgets rerun only that section
+    data_overview(df)
+
     # Use tabs for a smoother navigation
     tab1, tab2, tab3, tab4 = st.tabs(["📊 Data Summary", "⏳ Data Filtering", "📈 Visualizations", "📊 Advanced EDA"])
 
@@ -254,42 +487,35 @@ def run_eda(df):
             st.write("### Filtered Data Preview")
             st.write(df_filtered.head(10))
 
+    # Fast preview: run EDA on a cached sample of large datasets
+    df_eda, df_full = df_filtered, None
+    if len(df_filtered) > EDA_SAMPLE_THRESHOLD_ROWS:
+        fast_preview = st.sidebar.checkbox(
+            "⚡ Fast Preview (sampled EDA)",
+            value=True,
+            help=f"Run EDA on a {EDA_SAMPLE_SIZE:,}-row sample. Each chart can still be switched to all rows."
+        )
+        if fast_preview:
+            strata_options = [None] + df_filtered.select_dtypes(include=['category', 'bool']).columns.tolist()
+            strata_col = st.sidebar.selectbox(
+                "Stratify Sample By",
+                strata_options,
+                index=strata_options.index(SOURCE_COLUMN) if SOURCE_COLUMN in strata_options else 0
+            )
+            df_eda = get_eda_sample(df_filtered, EDA_SAMPLE_SIZE, strata_col)
+            df_full = df_filtered
+            st.info(
+                f"⚡ Fast preview: statistics and charts are approximate, computed on a {len(df_eda):,}-row "
+                f"sample of {len(df_filtered):,} rows."
+            )
+
     # Statistical Summaries
     with tab1:
-        st.subheader("Statistical Summaries")
-        statistical_summaries(df_filtered)
-
-        # Missing Data Visualization
-        if st.checkbox("Show Missing Data Visualization"):
-            plot_missing_values(df_filtered)
+        data_summary_tab(df_eda, df_full)
 
     # Visualizations
     with tab3:
-        st.subheader("Visualizations")
-        st.write("Select visualizations to display:")
-        visualization_options = st.multiselect(
-            "Choose visualizations",
-            ['Histograms', 'Box Plots', 'Correlation Matrix', 'Scatter Plots', 'Pair Plot', 'Categorical vs Numerical'],
-            help="Select the types of visualizations you'd like to explore."
-        )
-
-        if 'Histograms' in visualization_options:
-            plot_histograms(df_filtered)
-
-        if 'Box Plots' in visualization_options:
-            plot_box_plots(df_filtered)
-
-        if 'Correlation Matrix' in visualization_options:
-            plot_correlation_matrix(df_filtered)
-
-        if 'Scatter Plots' in visualization_options:
-            plot_scatter_plots(df_filtered)
-
-        if 'Pair Plot' in visualization_options:
-            plot_pair_plots(df_filtered)
-
-        if 'Categorical vs Numerical' in visualization_options:
-            categorical_vs_numerical(df_filtered)
+        visualizations_tab(df_eda, df_full)
 
     # Advanced EDA (Optional enhancements)
     with tab4:
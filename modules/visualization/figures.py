@@ -0,0 +1,258 @@
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+def histogram_figure(histogram, column, title=None):
+    """
+    Draw a histogram from precomputed bin counts.
+
+    Parameters:
+    - histogram: Dictionary from compute_histogram
+    - column: Name of the binned column, used for the axis label
+    - title: Figure title
+
+    Returns:
+    - fig: Plotly Figure with one bar per bin
+    """
+    edges = histogram['edges']
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=histogram['counts'],
+        width=np.diff(edges),
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate='[%{customdata[0]:.4g}, %{customdata[1]:.4g}): %{y}<extra></extra>',
+    ))
+    fig.update_layout(title=title, xaxis_title=column, yaxis_title='count', bargap=0)
+    return fig
+
+def box_figure(statistics, column, title=None):
+    """
+    Draw a box plot from precomputed quartiles, whiskers and outliers.
+
+    Parameters:
+    - statistics: Dictionary from compute_box_statistics
+    - column: Name of the column, used as the box label
+    - title: Figure title
+
+    Returns:
+    - fig: Plotly Figure with the box and its outlier points
+    """
+    fig = go.Figure(go.Box(
+        x=[column],
+        q1=[statistics['q1']],
+        median=[statistics['median']],
+        q3=[statistics['q3']],
+        mean=[statistics['mean']],
+        lowerfence=[statistics['lower_fence']],
+        upperfence=[statistics['upper_fence']],
+        name=column,
+        boxpoints=False,
+    ))
+    if len(statistics['outliers']):
+        fig.add_trace(go.Scatter(
+            x=[column] * len(statistics['outliers']),
+            y=statistics['outliers'],
+            mode='markers',
+            marker={'size': 4},
+            name='outliers',
+        ))
+    fig.update_layout(title=title, yaxis_title=column, showlegend=False)
+    return fig
+
+def density_figure(grid, x, y, title=None):
+    """
+    Draw a scatter plot as a heatmap of point counts.
+
+    Parameters:
+    - grid: Dictionary from compute_density_grid
+    - x, y: Names of the axis columns
+    - title: Figure title
+
+    Returns:
+    - fig: Plotly Figure whose size depends on the grid, not the number of points
+    """
+    x_edges, y_edges = grid['x_edges'], grid['y_edges']
+    # Empty cells are left blank so the shape of the data stands out
+    counts = np.where(grid['counts'] > 0, grid['counts'], np.nan).T
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        # Rounded log counts keep the payload small while still spanning sparse and dense cells
+        z=np.round(np.log10(counts), 2),
+        colorscale='Viridis',
+        colorbar={'title': 'log10(count)'},
+        hovertemplate=f'{x}: %{{x:.4g}}<br>{y}: %{{y:.4g}}<br>log10(points): %{{z}}<extra></extra>',
+    ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+def pair_plot_figure(columns, histograms, grids, title=None):
+    """
+    Draw a pair plot from precomputed panels.
+
+    Parameters:
+    - columns: Plotted columns, in display order
+    - histograms: Dictionary mapping each column to its compute_histogram result
+    - grids: Dictionary mapping each ordered (x, y) pair to its compute_density_grid result
+    - title: Figure title
+
+    Returns:
+    - fig: Plotly Figure with histograms on the diagonal and density heatmaps elsewhere
+    """
+    k = len(columns)
+    fig = make_subplots(rows=k, cols=k, horizontal_spacing=0.02, vertical_spacing=0.02)
+    for row, y in enumerate(columns, start=1):
+        for col, x in enumerate(columns, start=1):
+            if x == y:
+                edges = histograms[x]['edges']
+                fig.add_trace(go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=histograms[x]['counts'],
+                    width=np.diff(edges),
+                    marker={'color': '#440154'},
+                    hovertemplate=f'{x}: %{{x:.4g}}<br>count: %{{y}}<extra></extra>',
+                ), row=row, col=col)
+                continue
+            grid = grids[(x, y)]
+            x_edges, y_edges = grid['x_edges'], grid['y_edges']
+            counts = np.where(grid['counts'] > 0, grid['counts'], np.nan).T
+            fig.add_trace(go.Heatmap(
+                x=(x_edges[:-1] + x_edges[1:]) / 2,
+                y=(y_edges[:-1] + y_edges[1:]) / 2,
+                z=np.round(np.log10(counts), 2),
+                coloraxis='coloraxis',
+                hovertemplate=f'{x}: %{{x:.4g}}<br>{y}: %{{y:.4g}}<br>log10(points): %{{z}}<extra></extra>',
+            ), row=row, col=col)
+
+    # Label the outer axes only, like a scatter matrix
+    for i, name in enumerate(columns, start=1):
+        fig.update_xaxes(title_text=name, row=k, col=i)
+        fig.update_yaxes(title_text=name, row=i, col=1)
+    size = max(400, 160 * k)
+    fig.update_layout(
+        title=title,
+        width=size,
+        height=size,
+        bargap=0,
+        showlegend=False,
+        coloraxis={'colorscale': 'Viridis', 'colorbar': {'title': 'log10(count)'}},
+    )
+    return fig
+
+def missingness_figure(missingness, title=None):
+    """
+    Draw the fraction of missing values per column and row block.
+
+    Parameters:
+    - missingness: Dictionary from compute_missingness
+    - title: Figure title
+
+    Returns:
+    - fig: Plotly Figure with one row per block and one column per dataset column
+    """
+    fractions = missingness['fractions']
+    ends = fractions.index.to_numpy() + missingness['block_rows']
+    fig = go.Figure(go.Heatmap(
+        x=[str(col) for col in fractions.columns],
+        y=np.arange(len(fractions)),
+        z=np.round(fractions.to_numpy(), 3),
+        customdata=np.column_stack([fractions.index.to_numpy(), ends - 1]),
+        zmin=0,
+        zmax=1,
+        colorscale='Viridis',
+        colorbar={'title': 'missing'},
+        hovertemplate='%{x}<br>rows %{customdata[0]}-%{customdata[1]}<br>missing: %{z:.1%}<extra></extra>',
+    ))
+    fig.update_layout(title=title, xaxis_title='column', yaxis={'title': 'row block', 'autorange': 'reversed'})
+    return fig
+
+def co_missingness_figure(correlation, title=None):
+    """
+    Draw the nullity correlation between columns with missing values.
+    """
+    fig = go.Figure(go.Heatmap(
+        x=[str(col) for col in correlation.columns],
+        y=[str(col) for col in correlation.index],
+        z=np.round(correlation.to_numpy(), 3),
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu',
+        colorbar={'title': 'correlation'},
+        hovertemplate='%{x} / %{y}: %{z:.2f}<extra></extra>',
+    ))
+    fig.update_layout(title=title, yaxis={'autorange': 'reversed'})
+    return fig
+
+def grouped_box_figure(groups, category, value, title=None):
+    """
+    Draw one box per category from precomputed statistics.
+
+    Parameters:
+    - groups: DataFrame from compute_group_statistics
+    - category, value: Names of the categorical and numeric columns, used for the axis labels
+    - title: Figure title
+
+    Returns:
+    - fig: Plotly Figure with the boxes and their outlier points
+    """
+    labels = [str(label) for label in groups.index]
+    fig = go.Figure(go.Box(
+        x=labels,
+        q1=groups['q1'],
+        median=groups['median'],
+        q3=groups['q3'],
+        mean=groups['mean'],
+        lowerfence=groups['lower_fence'],
+        upperfence=groups['upper_fence'],
+        boxpoints=False,
+        name=value,
+    ))
+    outliers = [(label, point) for label, points in zip(labels, groups['outliers']) for point in points]
+    if outliers:
+        x, y = zip(*outliers)
+        fig.add_trace(go.Scatter(x=x, y=y, mode='markers', marker={'size': 4}, name='outliers'))
+    fig.update_layout(title=title, xaxis_title=category, yaxis_title=value, showlegend=False)
+    return fig
+
+def grouped_violin_figure(groups, grid, densities, category, value, title=None):
+    """
+    Draw one violin per category from density curves evaluated on a shared grid.
+
+    Parameters:
+    - groups: DataFrame from compute_group_statistics
+    - grid: Values at which the densities were evaluated
+    - densities: Array of shape (categories, grid points)
+    - category, value: Names of the categorical and numeric columns, used for the axis labels
+    - title: Figure title
+
+    Returns:
+    - fig: Plotly Figure with a filled outline per category and a marker at its median
+    """
+    labels = [str(label) for label in groups.index]
+    fig = go.Figure()
+    for i, (label, density) in enumerate(zip(labels, densities)):
+        # Each violin is scaled to its own peak and fills at most 80% of its slot
+        width = 0.4 * density / density.max() if density.max() > 0 else density
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([i - width, (i + width)[::-1]]),
+            y=np.concatenate([grid, grid[::-1]]),
+            fill='toself',
+            mode='lines',
+            line={'width': 1},
+            name=label,
+            hoverinfo='name',
+        ))
+    fig.add_trace(go.Scatter(
+        x=np.arange(len(labels)),
+        y=groups['median'],
+        mode='markers',
+        marker={'color': 'white', 'line': {'width': 1, 'color': 'black'}},
+        name='median',
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis={'title': category, 'tickmode': 'array', 'tickvals': list(range(len(labels))), 'ticktext': labels},
+        yaxis_title=value,
+        showlegend=False,
+    )
+    return fig
@@ -0,0 +1,201 @@
+import numpy as np
+from pandas import CategoricalDtype
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from modules.data_access.dataset_handle import filter_rows, take_rows
+from modules.utils.fingerprint import dataset_fingerprint
+from modules.utils.logger import get_logger
+from modules.visualization.column_index import get_column_index, index_lookup
+from configs.config import FILTER_INDEX_MIN_ROWS, FILTER_SAMPLE_ROWS
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+logger = get_logger(__name__)
+
+STRING_OPERATIONS = ['contains', 'startswith', 'endswith', 'equals', 'regex']
+
+def condition(column, op, value):
+    """
+    Describe one filter condition.
+
+    Parameters:
+    - column: Column name
+    - op: 'between' (value is a (low, high) pair), 'isin' (value is a list) or one of
+          STRING_OPERATIONS (value is the text to match)
+    - value: Operand of the condition
+
+    Returns:
+    - condition: Dictionary with 'column', 'op' and 'value'
+    """
+    return {'column': column, 'op': op, 'value': value}
+
+def _is_numeric_range(cond, dtype):
+    return cond['op'] == 'between' and is_numeric_dtype(dtype) and not is_bool_dtype(dtype)
+
+def evaluate_condition(cond, series):
+    """
+    Evaluate a condition on a column with vectorized operations.
+
+    Parameters:
+    - cond: Condition from condition()
+    - series: Values of the condition's column
+
+    Returns:
+    - mask: Boolean NumPy array; missing values never match
+    """
+    op, value = cond['op'], cond['value']
+    if op == 'between':
+        low, high = value
+        if _is_numeric_range(cond, series.dtype):
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+            return (values >= low) & (values <= high)
+        return np.asarray(series.between(low, high), dtype=bool)
+    if op == 'isin':
+        if isinstance(series.dtype, CategoricalDtype):
+            # Compare integer codes instead of values
+            codes = series.cat.categories.get_indexer(list(value))
+            return np.isin(series.cat.codes.to_numpy(), codes[codes >= 0])
+        return np.asarray(series.isin(value), dtype=bool)
+    if op == 'contains':
+        matches = series.str.contains(value, na=False, case=False)
+    elif op == 'startswith':
+        matches = series.str.startswith(value, na=False)
+    elif op == 'endswith':
+        matches = series.str.endswith(value, na=False)
+    elif op == 'equals':
+        matches = series == value
+    elif op == 'regex':
+        matches = series.str.match(value, na=False)
+    else:
+        raise ValueError(f"Unsupported filter operation: {op}")
+    return np.asarray(matches.fillna(False), dtype=bool)
+
+def _fused_numeric_mask(columns, conditions):
+    """
+    Evaluate numeric range conditions in one numexpr pass over all rows.
+    """
+    arrays = {}
+    terms = []
+    for i, cond in enumerate(conditions):
+        name = f"c{i}"
+        arrays[name] = columns[cond['column']].to_numpy(dtype='float64', na_value=np.nan)
+        low, high = cond['value']
+        arrays[f"{name}_low"], arrays[f"{name}_high"] = float(low), float(high)
+        terms.append(f"({name} >= {name}_low) & ({name} <= {name}_high)")
+    return numexpr.evaluate(' & '.join(terms), local_dict=arrays)
+
+def compile_filter(df, conditions, sample_rows=FILTER_SAMPLE_ROWS):
+    """
+    Plan the evaluation of filter conditions.
+
+    With numexpr installed, numeric range conditions are fused into one expression that
+    runs first. The remaining conditions are ordered by their selectivity on an evenly
+    spaced sample of rows, so the most selective ones run first and later ones only see
+    the rows that are still left.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - conditions: List of conditions from condition()
+    - sample_rows: Number of rows used to estimate selectivity
+
+    Returns:
+    - fused: Conditions evaluated together with numexpr
+    - ordered: Remaining conditions, most selective first
+    """
+    dtypes = df.dtypes
+    fused = []
+    if numexpr is not None:
+        fused = [cond for cond in conditions if _is_numeric_range(cond, dtypes[cond['column']])]
+    remaining = [cond for cond in conditions if cond not in fused]
+
+    if len(remaining) > 1 and len(df) > sample_rows:
+        positions = np.unique(np.linspace(0, len(df) - 1, num=sample_rows).astype(np.int64))
+        sample = take_rows(df, positions, list(dict.fromkeys(cond['column'] for cond in remaining)))
+        selectivity = [evaluate_condition(cond, sample[cond['column']]).mean() for cond in remaining]
+        order = np.argsort(selectivity, kind='stable')
+        remaining = [remaining[i] for i in order]
+    return fused, remaining
+
+def _sorted_membership(positions, found):
+    """
+    Which of the sorted positions also appear in the sorted array found.
+    """
+    slots = np.searchsorted(found, positions)
+    return found[np.minimum(slots, len(found) - 1)] == positions if len(found) else np.zeros(len(positions), dtype=bool)
+
+def get_filter_index(df, column):
+    """
+    Get the index of a column for filtering, or None for datasets small enough to scan.
+    """
+    if len(df) < FILTER_INDEX_MIN_ROWS:
+        return None
+    return get_column_index(df, dataset_fingerprint(df), column)
+
+def filter_positions(df, conditions, use_indexes=True):
+    """
+    Find the rows that satisfy all conditions.
+
+    Conditions a column index can answer are looked up and their row sets intersected.
+    Each remaining column is read once: after the fused numexpr pass, every further
+    condition is evaluated only on the rows that passed the previous ones, and evaluation
+    stops as soon as no row is left.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - conditions: List of conditions from condition()
+    - use_indexes: Whether to use column indexes on datasets of FILTER_INDEX_MIN_ROWS rows or more
+
+    Returns:
+    - positions: Sorted array of matching row positions
+    """
+    matches, masks, scanned = [], [], []
+    for cond in conditions:
+        index = get_filter_index(df, cond['column']) if use_indexes else None
+        found = index_lookup(index, cond) if index is not None else None
+        if found is None:
+            scanned.append(cond)
+        elif found.dtype == bool:
+            masks.append(found)
+        else:
+            matches.append(found)
+
+    fused, ordered = compile_filter(df, scanned)
+    columns = {col: df[col] for col in dict.fromkeys(cond['column'] for cond in scanned)}
+    if fused:
+        masks.append(_fused_numeric_mask(columns, fused))
+
+    positions = None
+    # Starting from the smallest row set keeps every membership test small
+    for found in sorted(matches, key=len):
+        positions = found if positions is None else positions[_sorted_membership(positions, found)]
+    mask = np.logical_and.reduce(masks) if masks else None
+    if positions is None:
+        positions = np.arange(len(df)) if mask is None else np.flatnonzero(mask)
+    elif mask is not None:
+        positions = positions[mask[positions]]
+
+    for cond in ordered:
+        if not len(positions):
+            break
+        series = columns[cond['column']]
+        # Only the rows still in play are evaluated
+        values = series if len(positions) == len(series) else series.iloc[positions]
+        positions = positions[evaluate_condition(cond, values)]
+    logger.info(
+        f"Filtered {len(df)} rows to {len(positions)} with {len(conditions)} conditions "
+        f"({len(conditions) - len(scanned)} from indexes, {len(fused)} fused with numexpr)."
+    )
+    return positions
+
+def apply_filter(df, conditions):
+    """
+    Filter a dataset by all conditions.
+
+    Returns:
+    - filtered: A row view for DatasetHandles, or a DataFrame built with a single take
+    """
+    if not conditions:
+        return df
+    return filter_rows(df, filter_positions(df, conditions))
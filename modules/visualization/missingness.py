@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from modules.data_access.dataset_handle import as_frame, null_counts
+from modules.utils.logger import get_logger
+from modules.visualization.aggregates import cached_aggregate
+from configs.config import MISSINGNESS_BLOCKS
+
+logger = get_logger(__name__)
+
+def _cluster_order(corr):
+    """
+    Order columns so that columns that tend to be missing together sit next to each other.
+    """
+    if len(corr) < 3:
+        return list(corr.index)
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+    distance = 1 - np.nan_to_num(corr.to_numpy(), nan=0.0)
+    np.fill_diagonal(distance, 0.0)
+    condensed = squareform(np.clip((distance + distance.T) / 2, 0.0, 2.0), checks=False)
+    return list(corr.index[leaves_list(linkage(condensed, method='average'))])
+
+def compute_missingness(df, blocks=MISSINGNESS_BLOCKS):
+    """
+    Summarize where values are missing, at a cost that does not depend on the row count.
+
+    Rows are split into consecutive blocks. In a single pass over the columns that have
+    missing values, each block contributes its fraction of missing values per column and
+    the counts of rows where each pair of columns is missing together. The pair counts
+    give the nullity correlation between columns, which orders the columns by
+    hierarchical clustering.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - blocks: Maximum number of row blocks
+
+    Returns:
+    - missingness: Dictionary with 'fractions' (DataFrame of blocks x columns, indexed by the
+                   first row of each block, columns in display order), 'block_rows' (rows per
+                   block) and 'correlation' (nullity correlation of the partly missing columns)
+    """
+    rows = len(df)
+    counts = null_counts(df)
+    partial = [col for col in df.columns if 0 < counts[col] < rows]
+    starts = np.unique(np.linspace(0, rows, num=min(blocks, rows) + 1).astype(np.int64)[:-1]) if rows else np.array([0])
+    block_rows = np.diff(np.append(starts, rows))
+
+    fractions = pd.DataFrame(0.0, index=starts, columns=df.columns)
+    fractions.loc[:, counts[counts == rows].index] = 1.0
+    both_missing = np.zeros((len(partial), len(partial)))
+    if partial:
+        data = as_frame(df, partial)
+        for start, size in zip(starts, block_rows):
+            block = data.iloc[start:start + size].isnull().to_numpy(dtype='float32')
+            fractions.loc[start, partial] = block.mean(axis=0)
+            both_missing += block.T @ block
+        del data
+
+    missing = counts[partial].to_numpy(dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = (rows * both_missing - np.outer(missing, missing)) / np.sqrt(
+            np.outer(missing * (rows - missing), missing * (rows - missing))
+        )
+    correlation = pd.DataFrame(np.clip(correlation, -1.0, 1.0), index=partial, columns=partial)
+
+    order = _cluster_order(correlation)
+    # Clustered partly missing columns first, then fully missing and complete ones
+    order += [col for col in df.columns if counts[col] == rows] + [col for col in df.columns if counts[col] == 0]
+    logger.info(f"Computed missingness over {len(starts)} row blocks for {len(partial)} partly missing columns.")
+    return {
+        'fractions': fractions[order],
+        'block_rows': block_rows,
+        'correlation': correlation.loc[order[:len(partial)], order[:len(partial)]],
+    }
+
+def get_missingness(df, blocks=MISSINGNESS_BLOCKS):
+    """
+    Get the missingness summary of a dataset, cached per dataset fingerprint.
+    """
+    return cached_aggregate(df, 'missingness', (blocks,), lambda data: compute_missingness(data, blocks))
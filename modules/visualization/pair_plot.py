@@ -0,0 +1,101 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+import numpy as np
+from modules.data_access.dataset_handle import as_frame
+from modules.utils.fingerprint import dataset_fingerprint
+from modules.utils.logger import get_logger
+from modules.visualization.aggregates import (
+    compute_density_grid,
+    compute_histogram,
+    float_values,
+    lookup_aggregate,
+    store_aggregate,
+)
+from configs.config import PAIR_PLOT_MAX_WORKERS, PAIR_PLOT_PARALLEL_MIN_ROWS
+
+logger = get_logger(__name__)
+
+# Column values of the dataset being plotted, sent once to each worker process
+_worker_values = {}
+
+def _init_worker(values):
+    _worker_values.clear()
+    _worker_values.update(values)
+
+def _density_panel(values, task):
+    x, y, x_edges, y_edges = task
+    return compute_density_grid(values[x], values[y], (x_edges, y_edges))
+
+def _density_panel_in_worker(task):
+    return _density_panel(_worker_values, task)
+
+def _transposed(grid):
+    return {
+        'counts': grid['counts'].T,
+        'x_edges': grid['y_edges'],
+        'y_edges': grid['x_edges'],
+        'count': grid['count'],
+    }
+
+def get_pair_panels(df, columns, bins, max_workers=PAIR_PLOT_MAX_WORKERS):
+    """
+    Compute the panels of a pair plot, reusing every panel that is already cached.
+
+    Diagonal panels are 1D histograms, shared with the histogram charts. Off-diagonal
+    panels are 2D histograms on the same bin edges, computed once per unordered column
+    pair and mirrored. Missing panels of large datasets are computed in a process pool.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - columns: Numeric columns to plot
+    - bins: Number of bins per axis
+    - max_workers: Maximum number of worker processes
+
+    Returns:
+    - histograms: Dictionary mapping each column to its compute_histogram result
+    - grids: Dictionary mapping each ordered (x, y) pair to its compute_density_grid result
+    """
+    fingerprint = dataset_fingerprint(df)
+    positions = {col: i for i, col in enumerate(df.columns)}
+    # Pairs are cached in dataset column order, so reordering the selection reuses them
+    pairs = [tuple(sorted(pair, key=positions.get)) for pair in combinations(columns, 2)]
+
+    histograms = {col: lookup_aggregate(fingerprint, 'histogram', (col, bins)) for col in columns}
+    grids = {pair: lookup_aggregate(fingerprint, 'pair_panel', (*pair, bins)) for pair in pairs}
+    missing_histograms = [col for col, histogram in histograms.items() if histogram is None]
+    missing_pairs = [pair for pair, grid in grids.items() if grid is None]
+
+    needed = list(dict.fromkeys(missing_histograms + [col for pair in missing_pairs for col in pair]))
+    if needed:
+        data = as_frame(df, needed)
+        values = {col: float_values(data[col]) for col in needed}
+        del data
+
+        for col in missing_histograms:
+            column = values[col]
+            histograms[col] = compute_histogram(column[np.isfinite(column)], bins)
+            store_aggregate(fingerprint, 'histogram', (col, bins), histograms[col])
+
+        tasks = [(x, y, histograms[x]['edges'], histograms[y]['edges']) for x, y in missing_pairs]
+        workers = max(1, min(len(tasks), max_workers or 1))
+        if workers > 1 and len(df) >= PAIR_PLOT_PARALLEL_MIN_ROWS:
+            pair_values = {col: values[col] for pair in missing_pairs for col in pair}
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pair_values,)) as executor:
+                results = list(executor.map(_density_panel_in_worker, tasks))
+        else:
+            workers = 1
+            results = [_density_panel(values, task) for task in tasks]
+
+        for pair, grid in zip(missing_pairs, results):
+            grids[pair] = grid
+            store_aggregate(fingerprint, 'pair_panel', (*pair, bins), grid)
+        logger.info(
+            f"Computed {len(missing_histograms)} histograms and {len(missing_pairs)} pair panels "
+            f"with {workers} workers; {len(pairs) - len(missing_pairs)} panels were cached."
+        )
+
+    ordered = {}
+    for (x, y), grid in grids.items():
+        ordered[(x, y)] = grid
+        ordered[(y, x)] = _transposed(grid)
+    return histograms, ordered
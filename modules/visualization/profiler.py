@@ -0,0 +1,179 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from pandas import CategoricalDtype
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_string_dtype
+from modules.utils.fingerprint import dataset_fingerprint
+from modules.utils.logger import get_logger
+from modules.utils.row_hashes import duplicate_mask
+from modules.utils.sketches import sketch_dataset
+from configs.config import PROFILE_MAX_WORKERS, PROFILE_CACHE_SIZE, PROFILE_TOP_VALUES
+
+logger = get_logger(__name__)
+
+QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+NUMERIC_STATS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+# Profiles of recently seen datasets, keyed by fingerprint and shared by all sessions
+_profile_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def profile_column(series):
+    """
+    Compute the statistics of one column in a single pass over its values.
+
+    Parameters:
+    - series: Pandas Series
+
+    Returns:
+    - profile: Dictionary with 'dtype', 'count' and 'missing', plus the describe() statistics
+               for numeric columns or 'unique' and top 'value_counts' for categorical columns
+    """
+    profile = {'dtype': str(series.dtype), 'rows': len(series)}
+    dtype = series.dtype
+
+    if is_numeric_dtype(dtype) and not is_bool_dtype(dtype):
+        values = series.to_numpy(dtype='float64', na_value=np.nan)
+        valid = values[~np.isnan(values)]
+        count = len(valid)
+        profile.update({'kind': 'numeric', 'count': count, 'missing': len(values) - count})
+        if count:
+            quantiles = np.quantile(valid, QUANTILES)
+            profile.update({
+                'mean': valid.mean(),
+                'std': valid.std(ddof=1) if count > 1 else np.nan,
+                'min': quantiles[0], '25%': quantiles[1], '50%': quantiles[2], '75%': quantiles[3], 'max': quantiles[4],
+            })
+        return profile
+
+    if isinstance(dtype, CategoricalDtype) or is_string_dtype(dtype) or is_bool_dtype(dtype):
+        try:
+            # One hashing pass gives counts, distinct values and, by difference, missing values
+            value_counts = series.value_counts()
+        except TypeError:
+            # Unhashable cells such as dicts from JSON
+            value_counts = None
+        if value_counts is not None:
+            value_counts = value_counts[value_counts > 0]
+            count = int(value_counts.sum())
+            profile.update({
+                'kind': 'categorical',
+                'count': count,
+                'missing': len(series) - count,
+                'unique': len(value_counts),
+                'value_counts': value_counts.head(PROFILE_TOP_VALUES),
+            })
+            return profile
+
+    missing = int(series.isnull().sum())
+    profile.update({'kind': 'other', 'count': len(series) - missing, 'missing': missing})
+    return profile
+
+def _cached_entry(fingerprint):
+    with _cache_lock:
+        entry = _profile_cache.get(fingerprint)
+        if entry is None:
+            entry = {'columns': {}, 'sketches': {}, 'duplicates': {}}
+            _profile_cache[fingerprint] = entry
+        _profile_cache.move_to_end(fingerprint)
+        while len(_profile_cache) > PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+        return entry
+
+def get_profile(df, columns=None):
+    """
+    Get the profile of a dataset's columns, computing only those not cached yet.
+
+    Columns are profiled in parallel threads; with a DatasetHandle each thread reads
+    only its own column.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - columns: Columns to profile; all columns if None
+
+    Returns:
+    - profiles: Dictionary mapping column names to profile_column results
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    entry = _cached_entry(dataset_fingerprint(df))
+    missing = [col for col in columns if col not in entry['columns']]
+
+    if missing:
+        workers = max(1, min(len(missing), PROFILE_MAX_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda col: profile_column(df[col]), missing)
+            for col, profile in zip(missing, results):
+                entry['columns'][col] = profile
+        logger.info(f"Profiled {len(missing)} columns with {workers} workers.")
+
+    return {col: entry['columns'][col] for col in columns}
+
+def get_column_sketches(df, columns=None):
+    """
+    Get mergeable sketches of a dataset's columns, computing only those not cached yet.
+
+    Each column is sketched chunk by chunk, so memory stays bounded by one column and
+    its sketch, and the statistics come with known error bounds (see modules.utils.sketches).
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - columns: Columns to sketch; all columns if None
+
+    Returns:
+    - sketches: Dictionary mapping column names to ColumnSketch objects
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    entry = _cached_entry(dataset_fingerprint(df))
+    missing = [col for col in columns if col not in entry['sketches']]
+
+    if missing:
+        workers = max(1, min(len(missing), PROFILE_MAX_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda col: sketch_dataset(df, [col])[col], missing)
+            for col, sketch in zip(missing, results):
+                entry['sketches'][col] = sketch
+        logger.info(f"Sketched {len(missing)} columns with {workers} workers.")
+
+    return {col: entry['sketches'][col] for col in columns}
+
+def duplicate_row_count(df, subset=None):
+    """
+    Count duplicate rows of a dataset from its row hash index, cached alongside its column profiles.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - subset: Columns to compare; all columns if None
+    """
+    fingerprint = dataset_fingerprint(df)
+    entry = _cached_entry(fingerprint)
+    key = tuple(df.columns if subset is None else subset)
+    if key not in entry['duplicates']:
+        entry['duplicates'][key] = int(duplicate_mask(df, subset, version=fingerprint).sum())
+    return entry['duplicates'][key]
+
+def missing_counts(profiles):
+    """
+    Missing value counts per column from column profiles.
+    """
+    return pd.Series({col: profile['missing'] for col, profile in profiles.items()}, dtype='int64')
+
+def numeric_summary(profiles):
+    """
+    Build a describe().T style table from the profiles of numeric columns.
+    """
+    rows = {
+        col: {stat: profile.get(stat, np.nan) for stat in NUMERIC_STATS}
+        for col, profile in profiles.items() if profile['kind'] == 'numeric'
+    }
+    return pd.DataFrame.from_dict(rows, orient='index', columns=NUMERIC_STATS)
+
+def sketch_summary(sketches):
+    """
+    Build a describe().T style table from the sketches of numeric columns, with
+    approximate quartiles and distinct counts.
+    """
+    columns = NUMERIC_STATS + ['unique (approx.)']
+    rows = {col: sketch.describe() for col, sketch in sketches.items() if sketch.numeric}
+    return pd.DataFrame.from_dict(rows, orient='index').reindex(columns=columns)
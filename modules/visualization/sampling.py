@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from modules.data_access.dataset_handle import as_frame
+from modules.utils.fingerprint import dataset_fingerprint, register_fingerprint, step_version
+from modules.utils.logger import get_logger
+from configs.config import DEFAULT_RANDOM_STATE
+
+logger = get_logger(__name__)
+
+Z_95 = 1.96
+
+def stratified_sample(df, n, strata_col=None, random_state=DEFAULT_RANDOM_STATE):
+    """
+    Draw a uniform random sample of rows, optionally stratified by a column.
+
+    With a strata column, each stratum contributes rows in proportion to its size and
+    at least one row, so rare groups still appear in the sample.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - n: Target number of rows
+    - strata_col: Optional column to stratify by
+    - random_state: Seed for the random number generator
+
+    Returns:
+    - sample: DataFrame with the sampled rows, keeping their original index
+    """
+    total = len(df)
+    if n >= total:
+        return as_frame(df)
+
+    rng = np.random.default_rng(random_state)
+    if strata_col is None:
+        positions = rng.choice(total, size=n, replace=False)
+    else:
+        # Missing values form their own stratum
+        codes = pd.factorize(df[strata_col], use_na_sentinel=False)[0]
+        counts = np.bincount(codes)
+        allocation = np.minimum(counts, np.maximum(1, np.floor(counts * n / total))).astype(np.int64)
+        order = np.argsort(codes, kind='stable')
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        positions = np.concatenate([
+            rng.choice(order[start:start + count], size=size, replace=False)
+            for start, count, size in zip(starts, counts, allocation)
+        ])
+
+    mask = np.zeros(total, dtype=bool)
+    mask[positions] = True
+    return as_frame(df[mask])
+
+def get_eda_sample(df, n, strata_col=None):
+    """
+    Get a stratified sample of a dataset, reusing the last sample drawn for the same data.
+
+    Parameters:
+    - df: Pandas DataFrame or DatasetHandle
+    - n: Target number of rows
+    - strata_col: Optional column to stratify by
+
+    Returns:
+    - sample: DataFrame with the sampled rows
+    """
+    fingerprint = dataset_fingerprint(df)
+    key = (fingerprint, n, strata_col)
+    cached = st.session_state.get('eda_sample')
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    sample = stratified_sample(df, n, strata_col=strata_col)
+    if sample is not df:
+        # The sample is seeded, so it is identified by its parent and parameters without hashing it
+        register_fingerprint(sample, step_version(fingerprint, 'sample', (n, strata_col)))
+    st.session_state['eda_sample'] = (key, sample)
+    logger.info(f"Drew a {len(sample)}-row EDA sample from {len(df)} rows (strata: {strata_col}).")
+    return sample
+
+def exact_toggle(df, full_df, key):
+    """
+    Let the user switch one chart or summary from the sample to all rows.
+
+    Parameters:
+    - df: Sampled DataFrame the chart uses by default
+    - full_df: Full dataset, or None when EDA is not running on a sample
+    - key: Unique widget key for the chart
+
+    Returns:
+    - df: The frame the chart should use
+    """
+    if full_df is None:
+        return df
+    if st.checkbox(f"Exact: use all {len(full_df):,} rows", key=f"exact_{key}"):
+        return full_df
+    st.caption(f"⚡ Approximate: based on a {len(df):,}-row sample of {len(full_df):,} rows.")
+    return df
+
+def _finite_population_correction(n, population_size):
+    return np.sqrt(np.maximum(population_size - n, 0) / max(population_size - 1, 1))
+
+def approximate_describe(sample, population_size):
+    """
+    Describe numeric columns of a sample with 95% confidence intervals for the population mean.
+
+    Parameters:
+    - sample: DataFrame of numeric columns drawn from the dataset
+    - population_size: Number of rows in the full dataset
+
+    Returns:
+    - summary: describe() table with estimated counts and a 'mean ± (95% CI)' column
+    """
+    summary = sample.describe().T
+    n = summary['count']
+    summary['mean ± (95% CI)'] = (
+        Z_95 * summary['std'] / np.sqrt(n) * _finite_population_correction(n, population_size)
+    )
+    summary['count'] = (n * population_size / len(sample)).round()
+    return summary.rename(columns={'count': 'estimated count'})
+
+def approximate_value_counts(series, population_size):
+    """
+    Estimate value counts in the full dataset from a sample, with 95% confidence intervals.
+
+    Parameters:
+    - series: Sampled column
+    - population_size: Number of rows in the full dataset
+
+    Returns:
+    - counts: DataFrame with 'Estimated Count' and '± (95% CI)' per value
+    """
+    n = len(series)
+    proportions = series.value_counts() / n
+    margin = Z_95 * np.sqrt(proportions * (1 - proportions) / n) * _finite_population_correction(n, population_size)
+    return pd.DataFrame({
+        'Estimated Count': (proportions * population_size).round().astype(np.int64),
+        '± (95% CI)': (margin * population_size).round().astype(np.int64),
+    })
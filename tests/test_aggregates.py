@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+from modules.visualization.aggregates import compute_group_statistics
+
+def test_group_statistics_constant_column():
+    groups, grid, densities, merged = compute_group_statistics(pd.Series(['a', 'b', 'a', 'b']), pd.Series([1.0] * 4), 10)
+    assert list(groups.index) == ['a', 'b']
+    assert groups['count'].tolist() == [2, 2]
+    assert groups['median'].tolist() == [1.0, 1.0]
+    assert np.all(grid == 1.0)
+    assert np.isfinite(densities).all()
+    assert densities[:, 0].tolist() == [1.0, 1.0]
+    assert merged == 0
+
+def test_group_statistics_constant_group():
+    groups, grid, densities, _ = compute_group_statistics(
+        pd.Series(['a', 'a', 'b', 'b', 'b']), pd.Series([2.0, 2.0, 0.0, 1.0, 4.0]), 10, grid_points=5
+    )
+    assert grid.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    # Group 'b' is ordered first as the larger one; 'a' is a spike at 2.0
+    assert list(groups.index) == ['b', 'a']
+    assert densities[1].tolist() == [0.0, 0.0, 1.0, 0.0, 0.0]
+    assert np.isclose(densities[0].sum() * (grid[1] - grid[0]), 1.0)
+
+def test_group_statistics_single_value_group():
+    groups, _, densities, _ = compute_group_statistics(pd.Series(['a', 'b', 'b']), pd.Series([3.0, 1.0, 2.0]), 10)
+    assert groups.loc['a', 'count'] == 1
+    assert np.isfinite(densities).all()
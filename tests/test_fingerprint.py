@@ -0,0 +1,30 @@
+import gc
+import numpy as np
+import pandas as pd
+from modules.utils import fingerprint
+from modules.utils.fingerprint import dataset_fingerprint, register_fingerprint, step_version
+
+def test_subsets_dropping_different_rows_differ():
+    df = pd.DataFrame({'x': np.arange(10_000, dtype='float64'), 'c': pd.Categorical(['a', 'b'] * 5000)})
+    assert dataset_fingerprint(df.drop(index=[3])) != dataset_fingerprint(df.drop(index=[4]))
+    changed = df.copy()
+    changed.iloc[5, 0] = -1.0
+    assert dataset_fingerprint(changed) != dataset_fingerprint(df)
+    assert dataset_fingerprint(df.copy()) == dataset_fingerprint(df)
+
+def test_registered_fingerprint_skips_hashing(monkeypatch):
+    df = pd.DataFrame({'x': [1.0, 2.0]})
+    register_fingerprint(df, 'loaded')
+    monkeypatch.setattr(fingerprint, '_hash_values', None)
+    assert dataset_fingerprint(df) == 'loaded'
+    # Derived frames only carry a fingerprint once registered
+    sample = register_fingerprint(df.head(1), step_version('loaded', 'sample', (1, None)))
+    assert dataset_fingerprint(sample) == step_version('loaded', 'sample', (1, None))
+
+def test_registration_ends_with_the_frame():
+    df = pd.DataFrame({'x': [1.0]})
+    register_fingerprint(df, 'gone')
+    key = id(df)
+    del df
+    gc.collect()
+    assert key not in fingerprint._registered
@@ -0,0 +1,14 @@
+import io
+import json
+from modules.data_access.json_reader import read_json_lines_chunked
+
+def test_fields_after_the_sample_are_kept():
+    records = [{'a': i, 'b': 'x'} for i in range(3000)] + [{'a': i, 'n': {'z': i}, 'late': 'y'} for i in range(3000)]
+    source = io.BytesIO('\n'.join(json.dumps(record) for record in records).encode())
+    df, stats = read_json_lines_chunked(source, chunk_bytes=10_000, sample_rows=100)
+    assert stats['chunks'] > 1
+    assert df.columns.tolist() == ['a', 'b', 'late', 'n.z']
+    assert len(df) == 6000
+    assert df['late'].isna().tolist() == [True] * 3000 + [False] * 3000
+    assert df['n.z'].iloc[3000:].tolist() == list(range(3000))
+    assert df['b'].notna().sum() == 3000
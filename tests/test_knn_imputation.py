@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from sklearn.impute import KNNImputer
+import pandas as pd
+from modules.preprocessing import pipeline
+from modules.preprocessing.knn_imputation import ScalableKNNImputer
+from modules.preprocessing.pipeline import ImputeStep
+
+@pytest.fixture
+def complete_donors():
+    # Only the first column has missing values, so KNNImputer's donors are the complete rows too
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 4))
+    X[rng.random(2000) < 0.1, 0] = np.nan
+    return X
+
+def test_matches_knn_imputer_with_complete_donors(complete_donors):
+    expected = KNNImputer(n_neighbors=5).fit_transform(complete_donors)
+    imputer = ScalableKNNImputer(n_neighbors=5, max_workers=1)
+    np.testing.assert_allclose(imputer.fit_transform(complete_donors), expected)
+    missing = int(np.isnan(complete_donors).any(axis=1).sum())
+    assert imputer.stats_['imputed_rows'] == missing
+    assert imputer.stats_['donors'] == 2000 - missing
+    assert imputer.stats_['patterns'] == 1
+
+def test_process_pool_matches_in_process(complete_donors, monkeypatch):
+    monkeypatch.setattr('modules.preprocessing.knn_imputation.KNN_PARALLEL_MIN_ROWS', 1)
+    serial = ScalableKNNImputer(chunk_rows=50, max_workers=1).fit_transform(complete_donors)
+    imputer = ScalableKNNImputer(chunk_rows=50, max_workers=2)
+    np.testing.assert_array_equal(imputer.fit_transform(complete_donors), serial)
+    assert imputer.stats_['workers'] == 2
+
+def test_rows_missing_every_column_get_the_means():
+    X = np.array([[1.0, 2.0], [3.0, 6.0], [np.nan, np.nan], [5.0, np.nan]])
+    imputed = ScalableKNNImputer(n_neighbors=1, max_workers=1).fit_transform(X)
+    np.testing.assert_array_equal(imputed, [[1.0, 2.0], [3.0, 6.0], [3.0, 4.0], [5.0, 6.0]])
+
+def test_donor_sample_limits_the_donors(complete_donors):
+    imputer = ScalableKNNImputer(donor_sample=100, max_workers=1).fit(complete_donors)
+    assert imputer.donors_.shape == (100, 4)
+    assert not np.isnan(imputer.transform(complete_donors)).any()
+
+def test_impute_step_uses_knn_imputer_up_to_the_threshold(monkeypatch):
+    df = pd.DataFrame({'x': [1.0, np.nan, 3.0, 4.0, 5.0, 6.0, 7.0], 'y': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]})
+    assert isinstance(ImputeStep(['x', 'y'], 'knn').fit(df).imputer, KNNImputer)
+    monkeypatch.setattr(pipeline, 'KNN_EXACT_MAX_ROWS', 5)
+    step = ImputeStep(['x', 'y'], 'knn').fit(df)
+    assert isinstance(step.imputer, ScalableKNNImputer)
+    # The neighbors of y=2 are the rows with y=1, 3, 4, 5 and 6
+    assert step.transform(df.copy())['x'].tolist() == [1.0, 3.8, 3.0, 4.0, 5.0, 6.0, 7.0]
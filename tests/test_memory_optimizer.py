@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+from modules.data_access.memory_optimizer import optimize_memory
+
+def test_text_booleans_are_converted():
+    df = pd.DataFrame({
+        'text': pd.Series([' True', 'false', 'FALSE', None], dtype=object),
+        'flags': pd.Series([True, False, np.bool_(True), False], dtype=object),
+    })
+    optimized, _ = optimize_memory(df)
+    assert str(optimized['text'].dtype) == 'boolean'
+    assert optimized['text'].tolist()[:3] == [True, False, False]
+    assert optimized['flags'].dtype == bool
+
+def test_object_columns_of_zeros_and_ones_stay_numbers():
+    # 1 == True and 0 == False, but these are counts, not flags
+    df = pd.DataFrame({'ints': pd.Series([0, 1, 1, 0], dtype=object), 'mixed': pd.Series([1, 'true', 0, 'false'], dtype=object)})
+    optimized, _ = optimize_memory(df)
+    assert not pd.api.types.is_bool_dtype(optimized['ints'])
+    assert optimized['ints'].tolist() == [0, 1, 1, 0]
+    assert not pd.api.types.is_bool_dtype(optimized['mixed'])
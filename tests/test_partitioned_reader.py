@@ -0,0 +1,37 @@
+import io
+import zipfile
+import numpy as np
+import pandas as pd
+from modules.data_access import partitioned_reader
+from modules.data_access.partitioned_reader import _picklable, list_partitions, read_partitions
+from configs.config import SOURCE_COLUMN
+
+def test_zip_members_are_sent_to_workers_on_their_own():
+    df = pd.DataFrame({'a': np.arange(1000), 'b': np.arange(1000) / 7})
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('one.csv', df.to_csv(index=False))
+        archive.writestr('two.jsonl', df.to_json(orient='records', lines=True))
+    buffer.seek(0)
+    partitions = list_partitions('upload.zip', buffer)
+
+    picklable, shared = _picklable(partitions)
+    assert [(kind, member) for _, kind, _, member in picklable] == [('csv', None), ('json', None)]
+    assert picklable[0][2] == df.to_csv(index=False).encode()
+    assert shared == {}
+
+    combined, stats = read_partitions(partitions, max_workers=2)
+    assert stats['partitions'] == 2
+    assert combined[SOURCE_COLUMN].value_counts().to_dict() == {'upload.zip:one.csv': 1000, 'upload.zip:two.jsonl': 1000}
+    assert combined['a'].sum() == 2 * df['a'].sum()
+
+def test_workbook_bytes_are_shared_by_its_sheets():
+    workbook = io.BytesIO(b'workbook' * 1000)
+    partitions = [(f"book.xlsx:{sheet}", 'excel', workbook, sheet) for sheet in ['a', 'b', 'c']]
+    picklable, shared = _picklable(partitions)
+    assert list(shared.values()) == [workbook.getvalue()]
+
+    # Each task only references the bytes a worker received once
+    partitioned_reader._init_worker(shared)
+    for _, _, source, _ in picklable:
+        assert partitioned_reader._as_buffer(source).getvalue() == workbook.getvalue()
@@ -0,0 +1,88 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from modules.preprocessing.pipeline import (
+    DeduplicateStep,
+    EncodeStep,
+    ImputeStep,
+    OutlierStep,
+    PreprocessingPipeline,
+    ScaleStep,
+    _SeenHashes,
+)
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'x': [1.0, 2.0, np.nan, 4.0, 100.0, 2.0],
+        'y': [10.0, 20.0, 30.0, np.nan, 50.0, 20.0],
+        'c': ['a', 'b', 'a', None, 'b', 'b'],
+    })
+
+def fit_pipeline(df):
+    pipeline = PreprocessingPipeline(input_dtypes=df.dtypes.to_dict())
+    for step in [
+        ImputeStep(['x', 'y'], 'mean'),
+        ImputeStep(['c'], 'most_frequent'),
+        DeduplicateStep(['x', 'y', 'c']),
+        OutlierStep(['x', 'y'], 'iqr', 1.5),
+        ScaleStep(['x', 'y'], 'minmax'),
+        EncodeStep(['c'], 'label'),
+    ]:
+        df = step.fit_transform(df)
+        pipeline.add(step)
+    return pipeline, df
+
+def test_pipeline_replays_fitted_steps(frame):
+    pipeline, fitted = fit_pipeline(frame.copy())
+    # Mean imputation fills x with 21.8 and y with 26; row 5 repeats row 1 and x=100 is an outlier
+    assert fitted.index.tolist() == [0, 1, 2, 3]
+    assert fitted['x'].tolist() == pytest.approx([0.0, 1 / 20.8, 1.0, 3 / 20.8])
+    assert fitted['y'].tolist() == pytest.approx([0.0, 0.5, 1.0, 0.8])
+    assert fitted['c'].tolist() == [0, 1, 0, 1]
+    pd.testing.assert_frame_equal(pipeline.transform(frame), fitted)
+
+def test_pipeline_round_trips_through_bytes(frame):
+    pipeline, fitted = fit_pipeline(frame.copy())
+    loaded = PreprocessingPipeline.from_bytes(pipeline.to_bytes())
+    assert loaded.describe().equals(pipeline.describe())
+    pd.testing.assert_frame_equal(loaded.transform(frame), fitted)
+
+def test_transform_chunks_deduplicates_across_chunks():
+    df = pd.DataFrame({'a': [1, 2, 1, 3, 2, 4, 1, 5]})
+    pipeline = PreprocessingPipeline([DeduplicateStep(['a'])])
+    chunks = (df.iloc[start:start + 3] for start in range(0, len(df), 3))
+    out = pd.concat(pipeline.transform_chunks(chunks, max_workers=1))
+    assert out['a'].tolist() == [1, 2, 3, 4, 5]
+
+def test_transform_csv_parses_chunks_with_fitted_dtypes(tmp_path):
+    # Inferred per chunk, 'a' would be int64 in the first chunk and float64 in the second
+    source = io.BytesIO(b'a,b\n1,x\n2,x\n,\n1,x\n2,x\n3,y\n')
+    pipeline = PreprocessingPipeline([DeduplicateStep(['a', 'b'])], input_dtypes={'a': np.dtype('int64'), 'b': object})
+    stats = pipeline.transform_csv(source, tmp_path / 'out.csv', chunk_rows=3, max_workers=1)
+    assert (stats['rows_in'], stats['rows_out'], stats['chunks']) == (6, 4, 2)
+    assert pd.read_csv(tmp_path / 'out.csv')['a'].tolist()[::3] == [1.0, 3.0]
+
+def test_transform_csv_keeps_values_outside_the_fitted_range(tmp_path):
+    source = io.BytesIO(b'a,b,c\n1,2,0.5\n2,3,1.5\n300,-5,1e40\n4,5,2.5\n')
+    input_dtypes = {'a': np.dtype('uint8'), 'b': np.dtype('uint8'), 'c': np.dtype('float32')}
+    pipeline = PreprocessingPipeline([DeduplicateStep(['a'])], input_dtypes=input_dtypes)
+    pipeline.transform_csv(source, tmp_path / 'out.csv', chunk_rows=2, max_workers=1)
+    # Read as UInt8 and float32, the second chunk would hold 44, 251 and inf
+    out = pd.read_csv(tmp_path / 'out.csv')
+    assert out['a'].tolist() == [1, 2, 300, 4]
+    assert out['b'].tolist() == [2, 3, -5, 5]
+    assert out['c'].tolist() == [0.5, 1.5, 1e40, 2.5]
+
+def test_seen_hashes_matches_a_set():
+    rng = np.random.default_rng(0)
+    seen, expected = _SeenHashes(), set()
+    for _ in range(20):
+        hashes = np.unique(rng.integers(0, 5000, 300).astype(np.uint64))
+        found = seen.contains(hashes)
+        assert found.tolist() == [value in expected for value in hashes.tolist()]
+        seen.add(hashes[~found])
+        expected.update(hashes[~found].tolist())
+    assert sum(len(run) for run in seen.runs) == len(expected)
+    assert len(seen.runs) <= int(np.log2(len(expected))) + 1
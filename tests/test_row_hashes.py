@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from modules.utils import row_hashes
+from modules.utils.fingerprint import dataset_fingerprint
+from modules.utils.row_hashes import (
+    RowHashIndex,
+    duplicate_mask,
+    get_row_hash_index,
+    near_duplicate_groups,
+    update_row_hash_index,
+)
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 5000
+    return pd.DataFrame({
+        'i': rng.integers(0, 4, n),
+        'f': rng.choice([0.5, 1.5, np.nan], n),
+        's': rng.choice(['a', 'b', None], n),
+        'c': pd.Categorical(rng.choice(['x', 'y'], n)),
+    })
+
+@pytest.mark.parametrize('keep', ['first', 'last', False])
+@pytest.mark.parametrize('subset', [None, ['i'], ['f', 's'], ['c', 'i', 'f']])
+def test_duplicate_mask_matches_pandas(frame, keep, subset):
+    expected = frame.duplicated(subset=subset, keep=keep).to_numpy()
+    np.testing.assert_array_equal(duplicate_mask(frame, subset, keep), expected)
+
+def test_duplicate_mask_on_small_frame():
+    df = pd.DataFrame({'a': [1, 2, 1, 1, None, None], 'b': ['x', 'y', 'x', 'z', None, None]})
+    assert duplicate_mask(df).tolist() == [False, False, True, False, False, True]
+    assert duplicate_mask(df, keep='last').tolist() == [True, False, False, False, True, False]
+    assert duplicate_mask(df, ['a'], keep=False).tolist() == [True, False, True, True, True, True]
+
+def test_hash_collisions_fall_back_to_exact_check(frame, monkeypatch):
+    # Every value hashes alike, so all rows collide
+    monkeypatch.setattr(row_hashes, '_hash_values', lambda series: np.zeros(len(series), dtype=np.uint64))
+    monkeypatch.setattr(row_hashes, '_index_cache', type(row_hashes._index_cache)())
+    for keep in ['first', 'last', False]:
+        np.testing.assert_array_equal(duplicate_mask(frame, keep=keep), frame.duplicated(keep=keep).to_numpy())
+
+def test_updated_index_matches_rebuilt_index(frame):
+    get_row_hash_index(frame)
+    changed = frame.copy()
+    changed['f'] = changed['f'].fillna(9.0)
+    update_row_hash_index(dataset_fingerprint(frame), changed, ['f'])
+    np.testing.assert_array_equal(get_row_hash_index(changed).hashes, RowHashIndex.build(changed).hashes)
+
+def test_subset_hashes_do_not_depend_on_column_order(frame):
+    index = RowHashIndex.build(frame)
+    np.testing.assert_array_equal(index.row_hashes(['i', 'f']), index.row_hashes(['f', 'i']))
+
+def test_near_duplicate_groups():
+    df = pd.DataFrame({'x': [1.001, 1.004, 2.0, 1.0, 3.0], 's': [' Foo', 'foo ', 'bar', 'FOO', 'baz']})
+    assert near_duplicate_groups(df, decimals=2, chunk_rows=2).tolist() == [0, 0, -1, 0, -1]
+    assert near_duplicate_groups(df, decimals=3).tolist() == [-1] * 5
+
+def test_versions_from_the_caller_skip_fingerprinting(frame, monkeypatch):
+    def fail(df):
+        raise AssertionError("fingerprinted a frame")
+
+    monkeypatch.setattr(row_hashes, 'dataset_fingerprint', fail)
+    expected = frame.duplicated(subset=['i', 'f']).to_numpy()
+    np.testing.assert_array_equal(duplicate_mask(frame, ['i', 'f'], version='v1'), expected)
+    changed = frame.copy()
+    changed['i'] = changed['i'] % 2
+    update_row_hash_index('v1', changed, ['i'], version='v2')
+    np.testing.assert_array_equal(get_row_hash_index(changed, 'v2').hashes, RowHashIndex.build(changed).hashes)
+    np.testing.assert_array_equal(duplicate_mask(changed, version='v2'), changed.duplicated().to_numpy())
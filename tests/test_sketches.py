@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from modules.utils.sketches import (
+    ColumnSketch,
+    DistinctCountSketch,
+    FrequentItemsSketch,
+    QuantileSketch,
+    sketch_dataset,
+)
+
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+def rank_errors(values, sketch):
+    ordered = np.sort(values)
+    estimates = sketch.quantile(QUANTILES)
+    ranks = np.searchsorted(ordered, estimates, side='right') / len(ordered)
+    return np.abs(ranks - np.array(QUANTILES))
+
+def test_quantile_sketch_rank_error():
+    values = np.random.default_rng(0).lognormal(size=200_000)
+    sketch = QuantileSketch(k=200)
+    for start in range(0, len(values), 10_000):
+        sketch.update(values[start:start + 10_000])
+    assert sketch.count == len(values)
+    assert rank_errors(values, sketch).max() < 0.017
+    # The sketch keeps O(k) items, not the values
+    assert sum(len(level) for level in sketch.levels) < 2000
+
+def test_quantile_sketch_merge():
+    values = np.random.default_rng(1).normal(size=100_000)
+    parts = [QuantileSketch().update(values[start:start + 25_000]) for start in range(0, len(values), 25_000)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.count == len(values)
+    assert rank_errors(values, merged).max() < 0.017
+
+def test_quantile_sketch_ignores_missing_and_empty():
+    sketch = QuantileSketch().update([1.0, np.nan, np.inf, 3.0, 2.0])
+    assert sketch.count == 3
+    assert sketch.quantile(0.5) == 2.0
+    assert np.isnan(QuantileSketch().quantile(0.5))
+
+def test_distinct_count_sketch():
+    values = np.arange(100_000)
+    sketch = DistinctCountSketch(precision=14).update(values)
+    assert abs(sketch.estimate() - 100_000) / 100_000 < 0.03
+    # Small cardinalities use linear counting
+    assert DistinctCountSketch().update(['a', 'b', 'a', None, 'c']).estimate() == 3
+
+def test_distinct_count_merge_equals_union():
+    left = DistinctCountSketch().update(np.arange(0, 60_000))
+    right = DistinctCountSketch().update(np.arange(40_000, 100_000))
+    union = DistinctCountSketch().update(np.arange(0, 100_000))
+    np.testing.assert_array_equal(left.merge(right).registers, union.registers)
+
+def test_frequent_items_exact_within_capacity():
+    sketch = FrequentItemsSketch(capacity=10).update(['a'] * 5 + ['b'] * 3 + [None, 'c'])
+    assert sketch.max_error == 0
+    assert sketch.most_common().to_dict() == {'a': 5, 'b': 3, 'c': 1}
+
+def test_frequent_items_error_bound():
+    rng = np.random.default_rng(2)
+    values = np.concatenate([np.full(5000, -1), np.full(3000, -2), rng.integers(0, 10_000, 20_000)])
+    rng.shuffle(values)
+    sketch = FrequentItemsSketch(capacity=50)
+    for start in range(0, len(values), 4000):
+        sketch.update(values[start:start + 4000])
+    exact = pd.Series(values).value_counts()
+    estimates = sketch.most_common()
+    assert sketch.max_error <= len(values) / 51
+    assert list(estimates.index[:2]) == [-1, -2]
+    for value, count in estimates.items():
+        assert exact[value] - sketch.max_error <= count <= exact[value]
+
+def test_column_sketch_merge_matches_pandas():
+    rng = np.random.default_rng(3)
+    series = pd.Series(rng.normal(10, 2, 50_000))
+    series[rng.random(50_000) < 0.1] = np.nan
+    merged = ColumnSketch(numeric=True).update(series.iloc[:20_000]).merge(ColumnSketch(numeric=True).update(series.iloc[20_000:]))
+    summary = merged.describe()
+    assert summary['count'] == series.count()
+    assert summary['missing'] == series.isna().sum()
+    assert summary['mean'] == pytest.approx(series.mean())
+    assert summary['std'] == pytest.approx(series.std())
+    assert (summary['min'], summary['max']) == (series.min(), series.max())
+
+def test_sketch_dataset_in_chunks_matches_one_pass():
+    df = pd.DataFrame({'x': np.arange(10_000, dtype='float64'), 'c': pd.Categorical(['a', 'b'] * 5000)})
+    chunked = sketch_dataset(df, chunk_rows=1000)
+    whole = sketch_dataset(df, chunk_rows=10_000)
+    assert chunked['x'].describe()['mean'] == pytest.approx(whole['x'].describe()['mean'])
+    assert chunked['c'].describe() == whole['c'].describe() == {'count': 10_000, 'missing': 0, 'unique (approx.)': 2}
+    assert chunked['c'].frequent.most_common().to_dict() == {'a': 5000, 'b': 5000}
@@ -0,0 +1,50 @@
+import os
+import pandas as pd
+from modules.preprocessing import step_cache
+from modules.preprocessing.step_cache import StepCache, run_step
+from modules.utils.fingerprint import dataset_fingerprint, step_version
+
+def frame(value, rows=1000):
+    return pd.DataFrame({'x': [value] * rows})
+
+def test_spills_to_disk_and_loads_back(tmp_path):
+    cache = StepCache(directory=str(tmp_path), memory_bytes=10_000, disk_bytes=10 ** 9)
+    cache.put('a', (frame(1.0), 'step a'))
+    cache.put('b', (frame(2.0), 'step b'))
+    # Each output takes 8 KB, so the least recently used one is spilled
+    assert os.listdir(tmp_path) == ['a.joblib']
+    output, step = cache.get('a')
+    assert step == 'step a'
+    pd.testing.assert_frame_equal(output, frame(1.0))
+    assert cache.get('missing') is None
+
+def test_disk_is_bounded(tmp_path):
+    cache = StepCache(directory=str(tmp_path), memory_bytes=0, disk_bytes=20_000)
+    for i in range(4):
+        cache.put(str(i), (frame(float(i)), None))
+    # The newest output stays in memory; of the three spilled, the oldest is evicted
+    assert sorted(os.listdir(tmp_path)) == ['1.joblib', '2.joblib']
+
+def test_run_step_computes_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(step_cache, '_step_cache', StepCache(directory=str(tmp_path)))
+    calls = []
+
+    def compute(parent):
+        calls.append(1)
+        return parent + 1, 'fitted'
+
+    first = run_step('root', frame(1.0), 'add', (1,), compute)
+    second = run_step('root', frame(1.0), 'add', (1,), compute)
+    assert len(calls) == 1
+    assert first[2] == second[2] == step_version('root', 'add', (1,))
+    pd.testing.assert_frame_equal(second[0], frame(2.0))
+    # A step that changes nothing keeps the parent's version and is not cached
+    unchanged = run_step('root', frame(1.0), 'noop', (), lambda parent: (parent, None))
+    assert unchanged[1:] == (None, 'root')
+
+def test_run_step_registers_output_versions(tmp_path, monkeypatch):
+    monkeypatch.setattr(step_cache, '_step_cache', StepCache(directory=str(tmp_path)))
+    computed, _, version = run_step('root', frame(1.0), 'add', (1,), lambda parent: (parent + 1, 'fitted'))
+    cached, _, _ = run_step('root', frame(1.0), 'add', (1,), lambda parent: (parent + 1, 'fitted'))
+    # Fingerprinting a step output returns its version instead of hashing it
+    assert dataset_fingerprint(computed) == dataset_fingerprint(cached) == version